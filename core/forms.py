@@ -1,3 +1,4 @@
+import requests
 from crispy_forms.helper import FormHelper
 from crispy_forms.layout import Column, Div, Layout, Row, Submit
 from dal import autocomplete
@@ -18,6 +19,7 @@ from core.models.standings.qual import QUAL
 from core.models.standings.soty import SOTY
 from core.models.tournament import Tournament
 from core.models.video import Video
+from core.utils.import_management import get_dict, validate_tab_export
 
 
 class DebaterForm(forms.ModelForm):
@@ -141,6 +143,39 @@ class TournamentImportForm(forms.Form):
         validators=[URLValidator()],
     )
 
+    # A tab export already fetched and validated for this form's data
+    response = None
+
+    def get_response(self, url):
+        return requests.get(url + "/json", timeout=30).content
+
+    def clean(self):
+        cleaned_data = super().clean()
+
+        if "url" not in cleaned_data:
+            return cleaned_data
+
+        if self.response is not None:
+            cleaned_data["response"] = self.response
+            return cleaned_data
+
+        try:
+            response = self.get_response(cleaned_data["url"])
+        except requests.RequestException as e:
+            raise forms.ValidationError(f"Could not fetch the tournament: {e}")
+
+        try:
+            errors = validate_tab_export(get_dict(response))
+        except ValueError:
+            errors = ["The tournament did not return valid JSON"]
+
+        if errors:
+            raise forms.ValidationError(errors[:20])
+
+        cleaned_data["response"] = response
+
+        return cleaned_data
+
 
 class TournamentSelectionForm(forms.Form):
     tournament = forms.ModelChoiceField(
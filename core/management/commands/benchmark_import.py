@@ -0,0 +1,107 @@
+import time
+import tracemalloc
+from datetime import date
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from core.models import School, Tournament
+from core.utils.import_management import (
+    import_tournament,
+    reconcile_debaters,
+    reconcile_schools,
+)
+from core.utils.tab_export import generate_tab_export
+
+
+class Rollback(Exception):
+    pass
+
+
+def benchmark_import(response, update_standings=False):
+    result = {}
+
+    try:
+        with transaction.atomic():
+            host, _ = School.objects.get_or_create(name="Benchmark Host")
+            tournament = Tournament.objects.create(
+                name="Benchmark Tournament",
+                host=host,
+                date=date.today(),
+                season=settings.CURRENT_SEASON,
+            )
+
+            tracemalloc.start()
+            start = time.perf_counter()
+
+            with CaptureQueriesContext(connection) as queries:
+                schools = reconcile_schools(response)
+                debaters = reconcile_debaters(response, schools)
+                import_tournament(
+                    tournament,
+                    response,
+                    schools,
+                    debaters,
+                    update_standings=update_standings,
+                )
+
+            result["seconds"] = time.perf_counter() - start
+            result["peak_memory"] = tracemalloc.get_traced_memory()[1]
+            result["queries"] = len(queries)
+            tracemalloc.stop()
+
+            raise Rollback
+    except Rollback:
+        pass
+    finally:
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+    return result
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmarks importing synthetic tab exports. Each run is rolled back, "
+        "so it is safe to point at a development database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--teams",
+            type=int,
+            nargs="+",
+            default=[30, 100, 250],
+            help="Team counts to benchmark",
+        )
+        parser.add_argument("--rounds", type=int, default=5)
+        parser.add_argument("--schools", type=int, default=20)
+        parser.add_argument("--hybrid-ratio", type=float, default=0.1)
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument(
+            "--standings",
+            action="store_true",
+            help="Include standings recomputation in the measurement",
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write(
+            f"{'teams':>6} {'rounds':>6} {'seconds':>9} {'queries':>8} {'peak KiB':>9}"
+        )
+
+        for num_teams in options["teams"]:
+            response = generate_tab_export(
+                num_teams=num_teams,
+                num_rounds=options["rounds"],
+                num_schools=options["schools"],
+                hybrid_ratio=options["hybrid_ratio"],
+                seed=options["seed"],
+            )
+            result = benchmark_import(response, options["standings"])
+
+            self.stdout.write(
+                f"{num_teams:>6} {options['rounds']:>6} {result['seconds']:>9.3f} "
+                f"{result['queries']:>8} {result['peak_memory'] // 1024:>9}"
+            )
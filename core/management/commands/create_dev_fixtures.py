@@ -1,8 +1,16 @@
+import gzip
+import multiprocessing
+import os
 import random
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 from django.core.management.base import BaseCommand
 from django.core import serializers
 from django.contrib.auth.models import Permission, Group
 from django.contrib.contenttypes.models import ContentType
+from django.db import connections
 from taggit.models import Tag, TaggedItem
 from core.models import (
     User, Video, Debater, School, Team, Tournament, Round, RoundStats,
@@ -12,147 +20,238 @@ from core.models import (
 
 FAKE_PW = "pbkdf2_sha256$260000$fake$fakehashfordev"
 
+CHUNK_SIZE = 2000
+
+PUBLIC_MODELS = [
+    School, SchoolLookup, Debater, Team, Tournament, Round, RoundStats,
+    SpeakerResult, TeamResult, COTY, NOTY, QUAL, SOTY, TOTY, TOTYReaff,
+    OnlineQUAL, SiteSetting, QualPoints, Reaff
+]
+
+FRAMEWORK_MODELS = [ContentType, Permission, Group, Tag, TaggedItem]
+
+
+def simulated_users():
+    users = User.objects.order_by('pk')
+    total = users.count()
+    first_names = [
+        "Alex","Jordan","Taylor","Casey","Riley","Quinn","Avery","Cameron",
+        "Drew","Sage","River","Phoenix","Rowan","Skylar","Emery","Finley"
+    ]
+    for idx, user in enumerate(users.iterator(chunk_size=CHUNK_SIZE)):
+        simulated_user = User(
+            id=user.id,
+            username=f"user_{user.id}",
+            first_name=first_names[idx % len(first_names)],
+            last_name=first_names[(total - idx - 1) % len(first_names)],
+            email=f"user_{user.id}@example.com",
+            is_staff=user.is_staff,
+            is_active=user.is_active,
+            is_superuser=user.is_superuser,
+            date_joined=user.date_joined,
+            last_login=user.last_login,
+            can_view_private_videos=getattr(user, "can_view_private_videos", False),
+            password=FAKE_PW,
+        )
+        simulated_user._state.adding = False
+        yield simulated_user
+
+
+def simulated_videos():
+    videos = Video.objects.order_by('pk')
+
+    fake_youtube_ids = [
+        "dQw4w9WgXcQ","jNQXAC9IVRw","9bZkp7q19f0","fJ9rUzIMcZQ","kJQP7kiw5Fk",
+        "YQHsXMglC9A","pRpeEdMmmQ0","OPf0YbXqDm0","CevxZvSJLk8","hTWKbfoikeg",
+    ]
+    fake_cases = [
+        "<p>This house would implement universal basic income.</p>",
+        "<p>This house believes that artificial intelligence poses a greater threat than benefit to humanity.</p>",
+        "<p>This house would ban private schools.</p>",
+        "<p>This house supports the use of nuclear energy as a primary source of power.</p>",
+        "<p>This house would legalize all drugs.</p>",
+        "<p>This house believes that democratic governments should prioritize economic growth over environmental protection.</p>",
+        "<p>This house would abolish the death penalty worldwide.</p>",
+        "<p>This house supports mandatory military service.</p>",
+        "<p>This house would implement a four-day work week.</p>",
+        "<p>This house believes that social media companies should be regulated as public utilities.</p>",
+        "<p>This house would ban genetic modification of human embryos.</p>",
+        "<p>This house supports the decriminalization of prostitution.</p>",
+        "<p>This house would implement a wealth tax on billionaires.</p>",
+        "<p>This house believes that voting should be mandatory.</p>",
+        "<p>This house would ban the use of animals in scientific research.</p>",
+    ]
+    fake_descriptions = [
+        "<p>A comprehensive analysis of the motion with strong arguments on both sides.</p>",
+        "<p>Excellent clash between teams with well-developed cases.</p>",
+        "<p>Strategic debate with innovative approaches to the topic.</p>",
+        "<p>High-level debate featuring experienced debaters.</p>",
+        "<p>Educational round demonstrating various debate techniques.</p>",
+        "<p>Competitive round with strong research and preparation evident.</p>",
+        "<p>Well-argued positions with effective rebuttals.</p>",
+        "<p>Demonstration of advanced debate strategy and tactics.</p>",
+        "<p>Engaging debate with clear structure and reasoning.</p>",
+        "<p>Example of effective parliamentary debate style.</p>",
+    ]
+
+    for idx, v in enumerate(videos.iterator(chunk_size=CHUNK_SIZE)):
+        sv = Video(
+            id=v.id,
+            pm_id=v.pm_id,
+            lo_id=v.lo_id,
+            mg_id=v.mg_id,
+            mo_id=v.mo_id,
+            tournament_id=v.tournament_id,
+            round=v.round,
+            case=fake_cases[idx % len(fake_cases)],
+            description=fake_descriptions[idx % len(fake_descriptions)],
+            link=f"https://www.youtube.com/watch?v={fake_youtube_ids[idx % len(fake_youtube_ids)]}",
+            password="",
+            permissions=v.permissions,
+        )
+        sv._state.adding = False
+        yield sv
+
+
+def model_objects(model):
+    return model.objects.order_by('pk').iterator(chunk_size=CHUNK_SIZE)
+
+
+SOURCES = {
+    **{
+        model.__name__: partial(model_objects, model)
+        for model in PUBLIC_MODELS + FRAMEWORK_MODELS
+    },
+    'User': simulated_users,
+    'Video': simulated_videos,
+}
+
+
+def chunked(objects, size):
+    chunk = []
+    for obj in objects:
+        chunk.append(obj)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def serialize_source(label, stream, separator=''):
+    """
+    Write the objects of one source to stream a chunk at a time
+
+    Objects are written as the body of a JSON array, so the output of every
+    source can be joined into one fixture. separator is written before the
+    first object, if there is one. Returns the number of objects written.
+    """
+    count = 0
+    for chunk in chunked(SOURCES[label](), CHUNK_SIZE):
+        data = serializers.serialize(
+            'json',
+            chunk,
+            use_natural_foreign_keys=True,
+            use_natural_primary_keys=True,
+            indent=None,
+        )
+        stream.write(', ' if count else separator)
+        stream.write(data[1:-1])
+        count += len(chunk)
+    return count
+
+
+def serialize_source_to_file(label, path):
+    with open(path, 'w', encoding='utf-8') as f:
+        return serialize_source(label, f)
+
+
+def open_output(path):
+    if path.endswith('.gz'):
+        return gzip.open(path, 'wt', encoding='utf-8')
+    return open(path, 'w', encoding='utf-8')
+
+
 class Command(BaseCommand):
     help = "Preconfigured data dump to create development fixtures with private data sanitized."
 
     def add_arguments(self, parser):
         parser.add_argument('--output', type=str, default='dev_fixtures.json')
+        parser.add_argument(
+            '--gzip', action='store_true', help='Compress the fixture, adding .gz to the output name'
+        )
+        parser.add_argument(
+            '--workers', type=int, default=1, help='Serialize this many models in parallel'
+        )
 
     def handle(self, *args, **options):
         random.seed(1000)
         output_file = options['output']
 
-        public_models = [
-            School, SchoolLookup, Debater, Team, Tournament, Round, RoundStats,
-            SpeakerResult, TeamResult, COTY, NOTY, QUAL, SOTY, TOTY, TOTYReaff,
-            OnlineQUAL, SiteSetting, QualPoints, Reaff
-        ]
-
-        framework_models = [ContentType, Permission, Group, Tag, TaggedItem]
-
-        all_objects = []
-
-        for model in public_models:
-            try:
-                qs = model.objects.all()
-                self.stdout.write(f"Processing {model.__name__}: {qs.count()} objects")
-                for obj in qs.iterator(chunk_size=2000):
-                    all_objects.append(obj)
-            except Exception as e:
-                self.stdout.write(self.style.WARNING(f"Error processing {model.__name__}: {e}"))
-
-        for model in framework_models:
-            try:
-                qs = model.objects.all()
-                self.stdout.write(f"Processing {model.__name__}: {qs.count()} objects")
-                for obj in qs.iterator(chunk_size=2000):
-                    all_objects.append(obj)
-            except Exception as e:
-                self.stdout.write(self.style.WARNING(f"Error processing {model.__name__}: {e}"))
-
-        self._add_simulated_users(all_objects)
-        self._add_simulated_videos(all_objects)
-
-        try:
-            data = serializers.serialize(
-                'json',
-                all_objects,
-                use_natural_foreign_keys=True,
-                use_natural_primary_keys=True,
-                indent=None,
-            )
-        except Exception as e:
-            self.stdout.write(self.style.ERROR(f"Error serializing data: {e}"))
-            return
+        if options['gzip'] and not output_file.endswith('.gz'):
+            output_file = f"{output_file}.gz"
 
         try:
-            with open(output_file, 'w', encoding='utf-8') as f:
-                f.write(data)
-        except Exception as e:
+            with open_output(output_file) as f:
+                f.write('[')
+                if options['workers'] > 1:
+                    total = self._write_parallel(f, options['workers'])
+                else:
+                    total = self._write_sequential(f)
+                f.write(']')
+        except OSError as e:
             self.stdout.write(self.style.ERROR(f"Error writing to file {output_file}: {e}"))
             return
 
-        self.stdout.write(self.style.SUCCESS(f"Successfully created {output_file} with {len(all_objects)} objects"))
-
-    def _add_simulated_users(self, all_objects):
-        users = User.objects.all()
-        total = users.count()
-        self.stdout.write(f"Simulating {total} users")
-        first_names = [
-            "Alex","Jordan","Taylor","Casey","Riley","Quinn","Avery","Cameron",
-            "Drew","Sage","River","Phoenix","Rowan","Skylar","Emery","Finley"
-        ]
-        for idx, user in enumerate(users.iterator(chunk_size=2000)):
-            simulated_user = User(
-                id=user.id,
-                username=f"user_{user.id}",
-                first_name=first_names[idx % len(first_names)],
-                last_name=first_names[(total - idx - 1) % len(first_names)],
-                email=f"user_{user.id}@example.com",
-                is_staff=user.is_staff,
-                is_active=user.is_active,
-                is_superuser=user.is_superuser,
-                date_joined=user.date_joined,
-                last_login=user.last_login,
-                can_view_private_videos=getattr(user, "can_view_private_videos", False),
-                password=FAKE_PW,
-            )
-            simulated_user._state.adding = False
-            all_objects.append(simulated_user)
-
-    def _add_simulated_videos(self, all_objects):
-        videos = Video.objects.all()
-        total = videos.count()
-        self.stdout.write(f"Simulating {total} videos")
-
-        fake_youtube_ids = [
-            "dQw4w9WgXcQ","jNQXAC9IVRw","9bZkp7q19f0","fJ9rUzIMcZQ","kJQP7kiw5Fk",
-            "YQHsXMglC9A","pRpeEdMmmQ0","OPf0YbXqDm0","CevxZvSJLk8","hTWKbfoikeg",
-        ]
-        fake_cases = [
-            "<p>This house would implement universal basic income.</p>",
-            "<p>This house believes that artificial intelligence poses a greater threat than benefit to humanity.</p>",
-            "<p>This house would ban private schools.</p>",
-            "<p>This house supports the use of nuclear energy as a primary source of power.</p>",
-            "<p>This house would legalize all drugs.</p>",
-            "<p>This house believes that democratic governments should prioritize economic growth over environmental protection.</p>",
-            "<p>This house would abolish the death penalty worldwide.</p>",
-            "<p>This house supports mandatory military service.</p>",
-            "<p>This house would implement a four-day work week.</p>",
-            "<p>This house believes that social media companies should be regulated as public utilities.</p>",
-            "<p>This house would ban genetic modification of human embryos.</p>",
-            "<p>This house supports the decriminalization of prostitution.</p>",
-            "<p>This house would implement a wealth tax on billionaires.</p>",
-            "<p>This house believes that voting should be mandatory.</p>",
-            "<p>This house would ban the use of animals in scientific research.</p>",
-        ]
-        fake_descriptions = [
-            "<p>A comprehensive analysis of the motion with strong arguments on both sides.</p>",
-            "<p>Excellent clash between teams with well-developed cases.</p>",
-            "<p>Strategic debate with innovative approaches to the topic.</p>",
-            "<p>High-level debate featuring experienced debaters.</p>",
-            "<p>Educational round demonstrating various debate techniques.</p>",
-            "<p>Competitive round with strong research and preparation evident.</p>",
-            "<p>Well-argued positions with effective rebuttals.</p>",
-            "<p>Demonstration of advanced debate strategy and tactics.</p>",
-            "<p>Engaging debate with clear structure and reasoning.</p>",
-            "<p>Example of effective parliamentary debate style.</p>",
-        ]
-
-        for idx, v in enumerate(videos.iterator(chunk_size=2000)):
-            sv = Video(
-                id=v.id,
-                pm_id=v.pm_id,
-                lo_id=v.lo_id,
-                mg_id=v.mg_id,
-                mo_id=v.mo_id,
-                tournament_id=v.tournament_id,
-                round=v.round,
-                case=fake_cases[idx % len(fake_cases)],
-                description=fake_descriptions[idx % len(fake_descriptions)],
-                link=f"https://www.youtube.com/watch?v={fake_youtube_ids[idx % len(fake_youtube_ids)]}",
-                password="",
-                permissions=v.permissions,
-            )
-            sv._state.adding = False
-            all_objects.append(sv)
+        self.stdout.write(self.style.SUCCESS(f"Successfully created {output_file} with {total} objects"))
+
+    def _write_sequential(self, f):
+        total = 0
+        with tempfile.TemporaryDirectory() as directory:
+            for label in SOURCES:
+                self.stdout.write(f"Processing {label}")
+                path = os.path.join(directory, f"{label}.json")
+                try:
+                    count = serialize_source_to_file(label, path)
+                except Exception as e:
+                    self.stdout.write(self.style.WARNING(f"Error processing {label}: {e}"))
+                    continue
+
+                total = self._append_source(f, path, count, total)
+        return total
+
+    def _write_parallel(self, f, workers):
+        total = 0
+        with tempfile.TemporaryDirectory() as directory:
+            paths = {label: os.path.join(directory, f"{label}.json") for label in SOURCES}
+
+            # Forked workers must open their own database connections
+            connections.close_all()
+
+            with ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context('fork')) as pool:
+                futures = {
+                    label: pool.submit(serialize_source_to_file, label, path)
+                    for label, path in paths.items()
+                }
+
+                for label, future in futures.items():
+                    self.stdout.write(f"Processing {label}")
+                    try:
+                        count = future.result()
+                    except Exception as e:
+                        self.stdout.write(self.style.WARNING(f"Error processing {label}: {e}"))
+                        continue
+
+                    total = self._append_source(f, paths[label], count, total)
+        return total
+
+    def _append_source(self, f, path, count, total):
+        """Copy a source serialized to path into the fixture, once it is complete"""
+        if not count:
+            return total
+
+        if total:
+            f.write(', ')
+        with open(path, encoding='utf-8') as part:
+            shutil.copyfileobj(part, f)
+        return total + count
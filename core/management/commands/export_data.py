@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand
+
+from core.utils.export import CHUNK_SIZE, EXPORTS, FORMATS, stream_export
+
+
+class Command(BaseCommand):
+    help = (
+        "Streams results, rounds or standings as CSV or NDJSON. Rows are "
+        "written as they are read, so memory stays flat for any table size."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("name", choices=sorted(EXPORTS))
+        parser.add_argument("--format", choices=sorted(FORMATS), default="csv")
+        parser.add_argument("--season", help="Only export rows from this season")
+        parser.add_argument(
+            "--output", help="File to write to, defaults to standard output"
+        )
+        parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        rows = stream_export(
+            options["name"],
+            options["format"],
+            season=options["season"],
+            chunk_size=options["chunk_size"],
+        )
+
+        if not options["output"]:
+            for row in rows:
+                self.stdout.write(row, ending="")
+            return
+
+        with open(options["output"], "w", encoding="utf-8", newline="") as output:
+            output.writelines(rows)
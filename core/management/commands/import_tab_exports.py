@@ -0,0 +1,240 @@
+import json
+import os
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from core.models import Tournament
+from core.search_signals import flush_queued_updates
+from core.utils.import_management import (
+    create_entities,
+    get_num_novice_debaters,
+    get_num_teams,
+    import_results,
+    reconcile_debaters,
+    reconcile_schools,
+    validate_tab_export,
+)
+from core.utils.rankings import refresh_standings
+
+
+class Command(BaseCommand):
+    help = (
+        "Imports saved tab JSON exports from disk. Each file is imported in its "
+        "own transaction and standings are recomputed once at the end for "
+        "each season imported. With --workers, the schools, debaters and teams "
+        "of every export are created first, one export at a time, and then "
+        "results are imported concurrently. The optional mapping file is JSON "
+        "of the form "
+        '{"tournaments": {"<file name>": <tournament id>}, '
+        '"schools": {"<server school name>": <school id or null>}, '
+        '"debaters": {"<server school name>": {"<debater name>": <debater id or null>}}}. '
+        "Files not listed under tournaments must be named <tournament id>.json."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "paths", nargs="+", type=str, help="Export files or directories"
+        )
+        parser.add_argument(
+            "--mapping", type=str, help="Saved reconciliation mapping file"
+        )
+        parser.add_argument(
+            "--tournament",
+            type=int,
+            help="Tournament to import into (single file only)",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=1,
+            help="Number of files to import concurrently",
+        )
+
+    def handle(self, *args, **options):
+        mapping = {}
+
+        if options["mapping"]:
+            with open(options["mapping"], encoding="utf-8") as f:
+                mapping = json.load(f)
+
+        files = self.get_files(options["paths"])
+
+        if options["tournament"] and len(files) > 1:
+            raise CommandError("--tournament can only be used with a single file")
+
+        imports = [
+            (path, self.get_tournament_id(path, mapping, options["tournament"]))
+            for path in files
+        ]
+
+        teams_changed = defaultdict(set)
+        debaters_changed = defaultdict(set)
+        failures = 0
+
+        for path, result in self.run_imports(imports, mapping, options["workers"]):
+            if isinstance(result, Exception):
+                failures += 1
+                self.stdout.write(
+                    self.style.ERROR(f"Failed to import {path}: {result}")
+                )
+                continue
+
+            tournament, teams, debaters = result
+
+            teams_changed[tournament.season] |= teams
+            debaters_changed[tournament.season] |= debaters
+
+            self.stdout.write(
+                f"Imported {path} into {tournament} "
+                f"({len(teams)} teams, {len(debaters)} debaters changed)"
+            )
+
+        flush_queued_updates()
+
+        for season in sorted(set(teams_changed) | set(debaters_changed)):
+            self.stdout.write(f"Recomputing {season} standings")
+            refresh_standings(
+                team_ids=teams_changed[season],
+                debater_ids=debaters_changed[season],
+                online_quals=season in settings.ONLINE_SEASONS,
+                season=season,
+            )
+
+        if failures:
+            raise CommandError(f"{failures} of {len(imports)} imports failed")
+
+        self.stdout.write(self.style.SUCCESS(f"Imported {len(imports)} exports"))
+
+    def get_files(self, paths):
+        files = []
+
+        for path in paths:
+            if os.path.isdir(path):
+                files += sorted(
+                    os.path.join(path, name)
+                    for name in os.listdir(path)
+                    if name.endswith(".json")
+                )
+            elif os.path.isfile(path):
+                files += [path]
+            else:
+                raise CommandError(f"{path} does not exist")
+
+        return files
+
+    def get_tournament_id(self, path, mapping, tournament_id=None):
+        if tournament_id:
+            return tournament_id
+
+        name = os.path.basename(path)
+
+        if name in mapping.get("tournaments", {}):
+            return int(mapping["tournaments"][name])
+
+        stem = os.path.splitext(name)[0]
+
+        if stem.isdigit():
+            return int(stem)
+
+        raise CommandError(f"No tournament given for {path}")
+
+    def run_imports(self, imports, mapping, workers):
+        if workers <= 1:
+            for path, tournament_id in imports:
+                yield path, self.import_file(path, tournament_id, mapping)
+            return
+
+        # Transactions running side by side can't see each other's new rows,
+        # so the schools, debaters and teams every export shares are created
+        # one export at a time and only results are imported concurrently
+        prepared = []
+
+        for path, tournament_id in imports:
+            result = self.prepare_file(path, tournament_id, mapping)
+
+            if isinstance(result, Exception):
+                yield path, result
+            else:
+                prepared.append((path, tournament_id, result))
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(
+                    self.import_results_in_thread, tournament_id, *result
+                ): path
+                for path, tournament_id, result in prepared
+            }
+
+            for future in as_completed(futures):
+                yield futures[future], future.result()
+
+    def load_export(self, path):
+        with open(path, encoding="utf-8") as f:
+            response = json.load(f)
+
+        errors = validate_tab_export(response)
+
+        if errors:
+            raise CommandError("; ".join(errors[:20]))
+
+        return response
+
+    def create_shared_rows(self, response, mapping):
+        schools = reconcile_schools(response, mapping.get("schools"))
+        debaters = reconcile_debaters(response, schools, mapping.get("debaters"))
+
+        return create_entities(response, schools, debaters)
+
+    def save_results(self, tournament_id, response, debater_actions, team_actions):
+        tournament = Tournament.objects.get(id=tournament_id)
+
+        num_rounds = int(response["num_rounds"])
+        tournament.num_teams = get_num_teams(response["teams"], num_rounds)
+        tournament.num_novice_debaters = get_num_novice_debaters(
+            response["teams"], num_rounds
+        )
+        tournament.save()
+
+        teams_changed, debaters_changed = import_results(
+            tournament, response, debater_actions, team_actions, update_standings=False
+        )
+
+        return tournament, teams_changed, debaters_changed
+
+    def import_file(self, path, tournament_id, mapping):
+        try:
+            response = self.load_export(path)
+
+            with transaction.atomic():
+                actions = self.create_shared_rows(response, mapping)
+                return self.save_results(tournament_id, response, *actions)
+        except Exception as e:  # pylint: disable=broad-except
+            return e
+
+    def prepare_file(self, path, tournament_id, mapping):
+        try:
+            response = self.load_export(path)
+
+            if not Tournament.objects.filter(id=tournament_id).exists():
+                raise CommandError(f"Tournament {tournament_id} does not exist")
+
+            with transaction.atomic():
+                return (response, *self.create_shared_rows(response, mapping))
+        except Exception as e:  # pylint: disable=broad-except
+            return e
+
+    def import_results_in_thread(self, tournament_id, *result):
+        try:
+            with transaction.atomic():
+                return self.save_results(tournament_id, *result)
+        except Exception as e:  # pylint: disable=broad-except
+            return e
+        finally:
+            # Index updates are queued per thread, so send this thread's
+            # before it goes back to the pool
+            flush_queued_updates()
+            connection.close()
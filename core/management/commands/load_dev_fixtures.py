@@ -0,0 +1,177 @@
+import gzip
+import json
+from collections import defaultdict
+
+from django.apps import apps
+from django.core import serializers
+from django.core.serializers.python import Deserializer as PythonDeserializer
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+
+from core.utils.versions import bump_versions, model_scope
+
+BATCH_SIZE = 5000
+
+
+def read_fixture(path):
+    """
+    Deserialize the objects of a fixture file
+
+    The file is parsed straight into Python objects rather than read into a
+    string first. Django's JSON deserializer would keep that string alive
+    until the last object is loaded.
+    """
+    opener = gzip.open if path.endswith(".gz") else open
+
+    with opener(path, "rt", encoding="utf-8") as fixture:
+        data = json.load(fixture)
+
+    return PythonDeserializer(data, handle_forward_references=True)
+
+
+def sort_models(models):
+    app_list = defaultdict(list)
+
+    for model in models:
+        app_list[apps.get_app_config(model._meta.app_label)].append(model)
+
+    ordered = serializers.sort_dependencies(app_list.items())
+    return ordered + [model for model in models if model not in ordered]
+
+
+def load_many_to_many(model, objects, batch_size):
+    """Replace the rows of auto-created many-to-many tables for objects"""
+    pks = [obj.object.pk for obj in objects]
+
+    for field in model._meta.many_to_many:
+        through = field.remote_field.through
+
+        if not through._meta.auto_created:
+            continue
+
+        source = field.m2m_field_name()
+        target = field.m2m_reverse_field_name()
+
+        through._base_manager.filter(**{f"{source}__in": pks}).delete()
+        through._base_manager.bulk_create(
+            [
+                through(**{f"{source}_id": obj.object.pk, f"{target}_id": pk})
+                for obj in objects
+                for pk in obj.m2m_data.get(field.name, [])
+            ],
+            batch_size=batch_size,
+        )
+
+
+def load_model(model, objects, batch_size):
+    """
+    Insert objects in batches, updating rows that already exist
+
+    Rows created by migrations, like content types and permissions, are
+    already in a fresh database, so those are updated rather than inserted.
+    """
+    # Rows keyed only by a natural key that isn't in the database yet have no
+    # primary key to bulk insert under
+    unkeyed = [obj for obj in objects if obj.object.pk is None]
+    for obj in unkeyed:
+        obj.save()
+
+    objects = [obj for obj in objects if obj not in unkeyed]
+    instances = [obj.object for obj in objects]
+    pks = [instance.pk for instance in instances]
+
+    existing = set()
+    for start in range(0, len(pks), batch_size):
+        existing.update(
+            model._base_manager.filter(
+                pk__in=pks[start : start + batch_size]
+            ).values_list("pk", flat=True)
+        )
+
+    created = [instance for instance in instances if instance.pk not in existing]
+    updated = [instance for instance in instances if instance.pk in existing]
+
+    model._base_manager.bulk_create(created, batch_size=batch_size)
+
+    fields = [
+        field.name for field in model._meta.concrete_fields if not field.primary_key
+    ]
+    if updated and fields:
+        model._base_manager.bulk_update(updated, fields, batch_size=batch_size)
+
+    load_many_to_many(model, objects, batch_size)
+
+    return len(created) + len(unkeyed), len(updated)
+
+
+class Command(BaseCommand):
+    help = (
+        "Loads a fixture from create_dev_fixtures with bulk inserts. Signal "
+        "handlers are skipped and the search index is rebuilt once at the end."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("fixture", help="Fixture file, optionally gzipped")
+        parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+        parser.add_argument(
+            "--skip-index",
+            action="store_true",
+            help="Don't rebuild the search index after loading",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            objects = read_fixture(options["fixture"])
+        except (OSError, ValueError) as e:
+            raise CommandError(f"Could not read {options['fixture']}: {e}")
+
+        signal_processor = apps.get_app_config("haystack").signal_processor
+        signal_processor.teardown()
+
+        try:
+            models = self.load(objects, options["batch_size"])
+        finally:
+            signal_processor.setup()
+
+        # Signals were skipped, so nothing bumped the scopes of these rows, and
+        # the debater autocomplete index only rebuilds once those change
+        bump_versions([model_scope(model) for model in models])
+
+        if not options["skip_index"]:
+            self.stdout.write("Rebuilding search index")
+            call_command("rebuild_index", interactive=False, verbosity=0)
+
+    def load(self, objects, batch_size):
+        connection = connections[DEFAULT_DB_ALIAS]
+        by_model = defaultdict(list)
+
+        for obj in objects:
+            by_model[type(obj.object)].append(obj)
+
+        models = sort_models(list(by_model))
+
+        with transaction.atomic():
+            with connection.constraint_checks_disabled():
+                for model in models:
+                    created, updated = load_model(model, by_model[model], batch_size)
+                    self.stdout.write(
+                        f"Loaded {model.__name__}: {created} created, "
+                        f"{updated} updated"
+                    )
+
+                for obj in [obj for model in models for obj in by_model[model]]:
+                    if obj.deferred_fields:
+                        obj.save_deferred_fields()
+
+            connection.check_constraints(
+                table_names=[model._meta.db_table for model in models]
+            )
+
+            statements = connection.ops.sequence_reset_sql(no_style(), models)
+            with connection.cursor() as cursor:
+                for statement in statements:
+                    cursor.execute(statement)
+
+        return models
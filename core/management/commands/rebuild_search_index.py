@@ -0,0 +1,171 @@
+import multiprocessing
+import os
+from datetime import datetime, time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections as db_connections
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from haystack import connections
+from haystack.constants import DEFAULT_ALIAS
+from haystack.exceptions import SkipDocument
+
+CHUNK_SIZE = 500
+
+BATCH_SIZE = 5000
+
+
+class PreparedIndex:
+    """Index whose documents were already rendered by full_prepare"""
+
+    def __init__(self, index):
+        self.index = index
+
+    def __getattr__(self, name):
+        return getattr(self.index, name)
+
+    def full_prepare(self, document):
+        return document
+
+
+def render_documents(using, objects):
+    index = connections[using].get_unified_index().get_index(type(objects[0]))
+    documents = []
+
+    for obj in objects:
+        try:
+            documents.append(index.full_prepare(obj))
+        except SkipDocument:
+            pass
+
+    return documents
+
+
+def read_chunks(queryset, chunk_size):
+    """Yield lists of rows in primary key order without using OFFSET"""
+    last_pk = None
+
+    while True:
+        chunk = queryset.order_by("pk")
+        if last_pk is not None:
+            chunk = chunk.filter(pk__gt=last_pk)
+
+        chunk = list(chunk[:chunk_size])
+        if not chunk:
+            return
+
+        yield chunk
+        last_pk = chunk[-1].pk
+
+
+def parse_since(value):
+    since = parse_datetime(value)
+
+    if since is None and parse_date(value) is not None:
+        since = datetime.combine(parse_date(value), time.min)
+
+    if since is None:
+        raise CommandError(f"Could not parse --since {value!r}")
+
+    if settings.USE_TZ and timezone.is_naive(since):
+        since = timezone.make_aware(since)
+    elif not settings.USE_TZ and timezone.is_aware(since):
+        since = timezone.make_naive(since)
+
+    return since
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuilds the search index. Rows are read in chunks, rendered in a "
+        "pool of worker processes and committed in large batches. With "
+        "--since, only rows updated since then are reindexed. Models without "
+        "an updated field are reindexed in full, and rows deleted since then "
+        "stay in the index until a full rebuild."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--since",
+            help="Only reindex rows updated since this date or datetime",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=os.cpu_count() or 1,
+            help="Processes rendering documents",
+        )
+        parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+        parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+        parser.add_argument("--using", default=DEFAULT_ALIAS)
+
+    def handle(self, *args, **options):
+        since = parse_since(options["since"]) if options["since"] else None
+        using = options["using"]
+
+        backend = connections[using].get_backend()
+        unified_index = connections[using].get_unified_index()
+        models = unified_index.get_indexed_models()
+
+        if since is None:
+            backend.clear(models=models)
+
+        pool = None
+        if options["workers"] > 1:
+            # Workers only render documents, they never touch the database
+            db_connections.close_all()
+            pool = multiprocessing.get_context("fork").Pool(options["workers"])
+
+        try:
+            for model in models:
+                index = unified_index.get_index(model)
+                count = self.index_model(backend, index, using, since, pool, options)
+                self.stdout.write(f"Indexed {count} {model._meta.verbose_name_plural}")
+        finally:
+            if pool is not None:
+                pool.close()
+                pool.join()
+
+    def index_model(self, backend, index, using, since, pool, options):
+        queryset = index.index_queryset(using=using)
+        updated_field = index.get_updated_field()
+
+        if since is not None and updated_field:
+            queryset = queryset.filter(**{f"{updated_field}__gte": since})
+        elif since is not None:
+            self.stdout.write(
+                f"{index.get_model()._meta.verbose_name_plural.capitalize()} have "
+                "no updated field, reindexing all of them"
+            )
+
+        workers = options["workers"]
+        pending = []
+        count = 0
+
+        chunks = read_chunks(queryset, options["chunk_size"])
+        while True:
+            window = [chunk for _, chunk in zip(range(workers), chunks)]
+            if not window:
+                break
+
+            if pool is None:
+                rendered = [render_documents(using, chunk) for chunk in window]
+            else:
+                rendered = pool.starmap(
+                    render_documents, [(using, chunk) for chunk in window]
+                )
+
+            for documents in rendered:
+                pending.extend(documents)
+
+            if len(pending) >= options["batch_size"]:
+                backend.update(PreparedIndex(index), pending)
+                count += len(pending)
+                pending = []
+
+        if pending:
+            backend.update(PreparedIndex(index), pending)
+            count += len(pending)
+
+        return count
@@ -0,0 +1,71 @@
+import os
+
+from django.core.management.base import BaseCommand
+
+from core.utils.snapshot import (
+    CHUNK_SIZE,
+    get_season_columns,
+    get_season_state,
+    get_snapshot_seasons,
+    read_manifest,
+    remove_season,
+    write_manifest,
+    write_season,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Writes tournaments, results, rounds and round stats to Parquet files "
+        "partitioned by season. Seasons whose data is unchanged since the last "
+        "snapshot are detected without reading their rows and left alone."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("output", help="Directory holding the snapshot")
+        parser.add_argument(
+            "--season",
+            action="append",
+            dest="seasons",
+            help="Only snapshot these seasons",
+        )
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Rewrite seasons even if they are unchanged",
+        )
+        parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        directory = options["output"]
+        os.makedirs(directory, exist_ok=True)
+
+        manifest = read_manifest(directory)
+        seasons = get_snapshot_seasons()
+
+        if not options["seasons"]:
+            for season in set(manifest["seasons"]) - set(seasons):
+                remove_season(directory, season)
+                del manifest["seasons"][season]
+                self.stdout.write(f"Removed {season}")
+        else:
+            seasons = [season for season in seasons if season in options["seasons"]]
+
+        for season in seasons:
+            # Taken before reading rows, so a write made meanwhile shows up
+            # as a change on the next run
+            state = get_season_state(season)
+
+            if not options["force"] and manifest["seasons"].get(season) == state:
+                self.stdout.write(f"Unchanged {season}")
+                continue
+
+            write_season(
+                directory, season, get_season_columns(season, options["chunk_size"])
+            )
+
+            manifest["seasons"][season] = state
+            write_manifest(directory, manifest)
+            self.stdout.write(f"Wrote {season}")
+
+        write_manifest(directory, manifest)
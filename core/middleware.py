@@ -0,0 +1,50 @@
+from django.core.cache import cache
+from django.utils.cache import get_conditional_response
+
+from core.utils.page_cache import (
+    PAGE_CACHE_TIMEOUT,
+    get_cached_last_modified,
+    get_page_cache_key,
+)
+
+
+class AnonymousPageCacheMiddleware:
+    """Serve public pages to anonymous visitors from the cache"""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+
+        key = getattr(request, "page_cache_key", None)
+
+        if (
+            key
+            and response.status_code == 200
+            and not response.streaming
+            and not response.cookies
+            and not request.META.get("CSRF_COOKIE_USED")
+        ):
+            cache.set(key, response, PAGE_CACHE_TIMEOUT)
+
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        key = get_page_cache_key(request, view_func, view_kwargs)
+
+        if key is None:
+            return None
+
+        response = cache.get(key)
+
+        if response is None:
+            request.page_cache_key = key
+            return None
+
+        return get_conditional_response(
+            request,
+            etag=response.get("ETag"),
+            last_modified=get_cached_last_modified(response),
+            response=response,
+        )
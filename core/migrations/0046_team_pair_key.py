@@ -0,0 +1,45 @@
+# Generated by Django 3.2 on 2026-10-19 16:17
+
+from django.db import migrations, models
+
+
+def populate_pair_keys(apps, schema_editor):
+    Team = apps.get_model("core", "Team")
+
+    seen = set()
+    to_update = []
+
+    for team in Team.objects.prefetch_related("debaters").order_by("id"):
+        debater_ids = sorted(debater.id for debater in team.debaters.all())
+
+        if len(debater_ids) != 2:
+            continue
+
+        pair_key = "-".join(str(i) for i in debater_ids)
+
+        if pair_key in seen:
+            continue
+
+        seen.add(pair_key)
+        team.pair_key = pair_key
+        to_update.append(team)
+
+    Team.objects.bulk_update(to_update, ["pair_key"], batch_size=2000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0045_auto_20250830_1836"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="team",
+            name="pair_key",
+            field=models.CharField(
+                blank=True, editable=False, max_length=32, null=True, unique=True
+            ),
+        ),
+        migrations.RunPython(populate_pair_keys, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 3.2 on 2026-10-19 18:02
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0046_team_pair_key"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="debater",
+            name="updated_at",
+            field=models.DateTimeField(
+                auto_now=True, db_index=True, default=django.utils.timezone.now
+            ),
+            preserve_default=False,
+        ),
+    ]
@@ -25,6 +25,8 @@ class Debater(models.Model):
     STATUS = ((VARSITY, "Varsity"), (NOVICE, "Novice"))
     status = models.IntegerField(choices=STATUS, default=VARSITY)
 
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
     def save(self, *args, **kwargs):
         super().save(*args, **kwargs)
 
@@ -57,6 +59,8 @@ class QualPoints(models.Model):
 
     @property
     def qualled(self):
+        if "quals" in getattr(self.debater, "_prefetched_objects_cache", {}):
+            return any(qual.season == self.season for qual in self.debater.quals.all())
         return self.debater.quals.filter(season=self.season).exists()
 
     def __save__(self, *args, **kwargs):
@@ -10,6 +10,27 @@ class Team(models.Model):
 
     debaters = models.ManyToManyField(Debater, related_name="teams")
 
+    pair_key = models.CharField(
+        max_length=32, unique=True, null=True, blank=True, editable=False
+    )
+
+    @staticmethod
+    def make_pair_key(debater_one_id, debater_two_id):
+        return "-".join([str(i) for i in sorted([debater_one_id, debater_two_id])])
+
+    def update_pair_key(self):
+        debater_ids = [debater.id for debater in self.debaters.all()]
+
+        pair_key = None
+
+        if len(debater_ids) == 2:
+            pair_key = Team.make_pair_key(*debater_ids)
+
+            if Team.objects.filter(pair_key=pair_key).exclude(id=self.id).exists():
+                pair_key = None
+
+        self.pair_key = pair_key
+
     def update_name(self):
         school_name = ""
 
@@ -1,13 +1,78 @@
 from haystack import indexes
 
 from core.models.debater import Debater
+from core.models.school import School
+from core.models.team import Team
+from core.models.tournament import Tournament
 
 
-class DebaterIndex(indexes.SearchIndex, indexes.Indexable):
+# get_model is left to each concrete index
+class AutocompleteIndex(indexes.SearchIndex):  # pylint: disable=abstract-method
+    """
+    Index with an edge n-gram field for autocompletes
+
+    The label and url shown for each result are stored alongside it, so
+    autocompletes can be answered from the index alone.
+    """
+
     text = indexes.CharField(document=True, use_template=True)
     name = indexes.CharField(model_attr="name")
 
-    name_auto = indexes.EdgeNgramField(model_attr="name")
+    name_auto = indexes.EdgeNgramField()
+
+    label = indexes.CharField(indexed=False, stored=True)
+    url = indexes.CharField(indexed=False, stored=True)
+
+    def prepare_name_auto(self, obj):
+        return obj.name
+
+    def prepare_label(self, obj):
+        return obj.name
+
+    def prepare_url(self, obj):
+        return obj.get_absolute_url()
 
+
+class DebaterIndex(AutocompleteIndex, indexes.Indexable):
     def get_model(self):
         return Debater
+
+    def index_queryset(self, using=None):
+        return self.get_model().objects.select_related("school")
+
+    def get_updated_field(self):
+        return "updated_at"
+
+    def prepare_label(self, obj):
+        return f"{obj.name} ({obj.school.name})" if obj.school else obj.name
+
+
+class TeamIndex(AutocompleteIndex, indexes.Indexable):
+    def get_model(self):
+        return Team
+
+    def index_queryset(self, using=None):
+        return self.get_model().objects.prefetch_related("debaters")
+
+    def prepare_name_auto(self, obj):
+        return " ".join([obj.name, *[debater.name for debater in obj.debaters.all()]])
+
+    def prepare_label(self, obj):
+        return (
+            f"{obj.name} ({', '.join(debater.name for debater in obj.debaters.all())})"
+        )
+
+
+class SchoolIndex(AutocompleteIndex, indexes.Indexable):
+    def get_model(self):
+        return School
+
+
+class TournamentIndex(AutocompleteIndex, indexes.Indexable):
+    season = indexes.CharField(model_attr="season")
+
+    def get_model(self):
+        return Tournament
+
+    def prepare_label(self, obj):
+        return f"{obj.name} ({obj.get_season_display()})"
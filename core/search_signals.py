@@ -0,0 +1,128 @@
+import atexit
+import threading
+
+from django.apps import apps
+from django.core.signals import request_finished
+from django.db.models import signals
+from haystack.exceptions import NotHandled
+from haystack.signals import BaseSignalProcessor
+from haystack.utils import get_identifier
+
+
+class QueuedSignalProcessor(BaseSignalProcessor):
+    """
+    Queue search index changes until the end of the request or process
+
+    The realtime processor commits the index on every save, so an import
+    that creates hundreds of debaters commits it hundreds of times. Here
+    saves and deletes only record what changed, and flush() sends one
+    batched update per model.
+
+    Each thread queues its own changes, since another thread's rows may
+    still be in an uncommitted transaction. Threads outside a request
+    should call flush() once their work is committed; anything left over
+    is flushed for every thread at exit.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self.queue = threading.local()
+        self.lock = threading.Lock()
+        # Each thread's pending changes, for the flush at exit
+        self.queues = {}
+        super().__init__(*args, **kwargs)
+
+    def setup(self):
+        signals.post_save.connect(self.handle_save)
+        signals.post_delete.connect(self.handle_delete)
+        request_finished.connect(self.handle_flush)
+        # Management commands and import jobs don't finish a request
+        atexit.register(self.flush_all)
+
+    def teardown(self):
+        signals.post_save.disconnect(self.handle_save)
+        signals.post_delete.disconnect(self.handle_delete)
+        request_finished.disconnect(self.handle_flush)
+        atexit.unregister(self.flush_all)
+
+    def get_pending(self):
+        if not hasattr(self.queue, "pending"):
+            self.queue.pending = {}
+
+            with self.lock:
+                # A finished thread with nothing left to send never queues again
+                self.queues = {
+                    thread: pending
+                    for thread, pending in self.queues.items()
+                    if thread.is_alive() or pending
+                }
+                self.queues[threading.current_thread()] = self.queue.pending
+
+        return self.queue.pending
+
+    def get_changes(self, sender, instance):
+        """Yield the pending updates and removals of each index for sender"""
+        for using in self.connection_router.for_write(instance=instance):
+            try:
+                self.connections[using].get_unified_index().get_index(sender)
+            except NotHandled:
+                continue
+
+            yield self.get_pending().setdefault((using, sender), (set(), set()))
+
+    def handle_save(self, sender, instance, **kwargs):
+        for updates, removals in self.get_changes(sender, instance):
+            updates.add(instance.pk)
+            removals.discard(get_identifier(instance))
+
+    def handle_delete(self, sender, instance, **kwargs):
+        for updates, removals in self.get_changes(sender, instance):
+            updates.discard(instance.pk)
+            removals.add(get_identifier(instance))
+
+    def handle_flush(self, **kwargs):
+        self.flush()
+
+    def flush(self):
+        """Apply this thread's queued changes with one update per model and index"""
+        self.send(self.get_pending())
+
+    def flush_all(self):
+        with self.lock:
+            queues = list(self.queues.values())
+
+        for pending in queues:
+            self.send(pending)
+
+    def send(self, pending):
+        changes = dict(pending)
+        pending.clear()
+
+        for (using, model), (updates, removals) in changes.items():
+            backend = self.connections[using].get_backend()
+            index = self.connections[using].get_unified_index().get_index(model)
+
+            if updates:
+                # Rows rolled back since they were queued simply drop out
+                backend.update(
+                    index, index.index_queryset(using=using).filter(pk__in=updates)
+                )
+
+            for identifier in removals:
+                backend.remove(identifier)
+
+
+def queue_index_updates(model, instances):
+    """Queue index updates for rows written without post_save, e.g. bulk_create"""
+    signal_processor = apps.get_app_config("haystack").signal_processor
+
+    if isinstance(signal_processor, QueuedSignalProcessor):
+        for instance in instances:
+            signal_processor.handle_save(model, instance)
+
+
+def flush_queued_updates():
+    """Send the current thread's queued index changes, if they are queued"""
+    signal_processor = apps.get_app_config("haystack").signal_processor
+
+    if isinstance(signal_processor, QueuedSignalProcessor):
+        signal_processor.flush()
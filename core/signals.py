@@ -0,0 +1,37 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from core.models.team import Team
+from core.utils.versions import (
+    bump_versions,
+    get_changed_scopes,
+    get_dependent_scopes,
+)
+
+
+@receiver(m2m_changed, sender=Team.debaters.through)
+def sync_team_pair_key(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+
+    teams = [instance]
+
+    if reverse:
+        teams = Team.objects.filter(id__in=pk_set or [])
+
+    for team in teams:
+        pair_key = team.pair_key
+        team.update_pair_key()
+
+        if team.pair_key != pair_key:
+            Team.objects.filter(id=team.id).update(pair_key=team.pair_key)
+
+
+@receiver(post_save)
+@receiver(post_delete)
+def bump_changed_versions(sender, instance, **kwargs):
+    if sender._meta.app_label == "core":
+        bump_versions(
+            get_changed_scopes(instance)
+            | get_dependent_scopes(instance, created=kwargs.get("created", False))
+        )
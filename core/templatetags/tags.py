@@ -2,27 +2,36 @@ from decimal import Decimal
 
 from django import template
 
+from core.models.round import Round
 from core.utils.rankings import get_relevant_debaters
+from core.utils.rounds import GOV_WINS, OPP_WINS
 
 register = template.Library()
 
 
+def is_prefetched(obj, name):
+    cache = getattr(obj, "_prefetched_objects_cache", None)
+
+    return isinstance(cache, dict) and name in cache
+
+
+def on_side(round, side, team):
+    return getattr(round, f"{side}_id") == team.id
+
+
 @register.filter
 def wl(round, team):
-    gov_wins = [1, 3, 6]
-    opp_wins = [2, 4, 6]
-
-    if round.gov == team and round.victor in gov_wins:
-        if round.victor == 3:
+    if on_side(round, "gov", team) and round.victor in GOV_WINS:
+        if round.victor == Round.GOV_VIA_FORFEIT:
             return "WF"
-        if round.victor == 6:
+        if round.victor == Round.ALL_WIN:
             return "AW"
         return "W"
 
-    if round.opp == team and round.victor in opp_wins:
-        if round.victor == 4:
+    if on_side(round, "opp", team) and round.victor in OPP_WINS:
+        if round.victor == Round.OPP_VIA_FORFEIT:
             return "WF"
-        if round.victor == 6:
+        if round.victor == Round.ALL_WIN:
             return "AW"
         return "W"
 
@@ -35,7 +44,7 @@ def wl(round, team):
 
 @register.filter
 def opponent(round, team):
-    if round.gov == team:
+    if on_side(round, "gov", team):
         return round.opp
     return round.gov
 
@@ -47,7 +56,7 @@ def opponent_url(round, team):
 
 @register.filter
 def opponent_side(round, team):
-    if round.gov == team:
+    if on_side(round, "gov", team):
         return "OPP"
     return "GOV"
 
@@ -65,12 +74,13 @@ def range_filter(start, end):
 
 @register.filter
 def qual_display(debater, season):
+    if is_prefetched(debater, "quals"):
+        quals = [qual for qual in debater.quals.all() if qual.season == season]
+    else:
+        quals = debater.quals.filter(season=season).all()
+
     return ", ".join(
-        [
-            qual.get_qual_type_display()
-            for qual in debater.quals.filter(season=season).all()
-            if qual.qual_type > 0
-        ]
+        [qual.get_qual_type_display() for qual in quals if qual.qual_type > 0]
     )
 
 
@@ -89,9 +99,20 @@ def relevant_debaters(school, season):
     return get_relevant_debaters(school, season)
 
 
+def get_partner(team, debater):
+    if not is_prefetched(team, "debaters"):
+        return team.debaters.exclude(id=debater.id).first()
+
+    partners = [partner for partner in team.debaters.all() if partner.id != debater.id]
+
+    if not partners:
+        return None
+    return min(partners, key=lambda partner: partner.id)
+
+
 @register.filter
 def partner_display(team, debater):
-    partner = team.debaters.exclude(id=debater.id).first()
+    partner = get_partner(team, debater)
 
     if not partner:
         return "NO PARTNER"
@@ -100,7 +121,7 @@ def partner_display(team, debater):
 
 @register.filter
 def partner_name(team, debater):
-    partner = team.debaters.exclude(id=debater.id).first()
+    partner = get_partner(team, debater)
 
     if not partner:
         return "NO PARTNER"
@@ -109,4 +130,9 @@ def partner_name(team, debater):
 
 @register.filter
 def school(team):
-    return f'<a href="{team.debaters.first().school.get_absolute_url()}">{team.debaters.first().school.name}</a>'
+    if is_prefetched(team, "debaters"):
+        debater = min(team.debaters.all(), key=lambda debater: debater.id)
+    else:
+        debater = team.debaters.first()
+
+    return f'<a href="{debater.school.get_absolute_url()}">{debater.school.name}</a>'
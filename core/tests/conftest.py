@@ -88,6 +88,10 @@ def pytest_configure():
             for year in range(2025, 2003, -1)  # LATEST to OLDEST-1
         ),
         CURRENT_SEASON="2024",
+        ONLINE_SEASONS=("2020", "2021"),
+        LAST_NOTY_SEASON=2020,
+        QUAL_BAR=10.5,
+        ONLINE_QUAL_BAR=10,
         ENV="test",
         HAYSTACK_CONNECTIONS={
             "default": {
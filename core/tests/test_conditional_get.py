@@ -0,0 +1,108 @@
+"""
+Tests for conditional GETs on standings and detail pages
+"""
+
+
+from datetime import date
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, modify_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from core.models import SOTY, TOTY, Debater, School, TeamResult
+from core.models.tournament import Tournament
+from core.utils.team import get_or_create_team_for_debaters
+
+
+class ConditionalGetTest(TestCase):
+    """Test unchanged pages are answered with 304 Not Modified"""
+
+    def setUp(self):
+        cache.clear()
+        self.school = School.objects.create(name="Test School")
+        self.debaters = [
+            Debater.objects.create(
+                first_name=f"Debater{i}", last_name="Last", school=self.school
+            )
+            for i in range(2)
+        ]
+        self.team = get_or_create_team_for_debaters(*self.debaters)
+
+    def test_index_not_modified(self):
+        """Test a matching ETag skips rendering the index"""
+        url = reverse("core:index") + "?season=2024"
+        response = self.client.get(url)
+
+        self.assertIn("ETag", response)
+        self.assertIn("Last-Modified", response)
+
+        with CaptureQueriesContext(connection) as queries:
+            cached = self.client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+
+        self.assertEqual(cached.status_code, 304)
+        self.assertEqual(cached.content, b"")
+        self.assertEqual(len(queries), 0)
+
+        cached = self.client.get(
+            url, HTTP_IF_MODIFIED_SINCE=response["Last-Modified"]
+        )
+        self.assertEqual(cached.status_code, 304)
+
+    def test_standings_change(self):
+        """Test a standings change only invalidates its own season"""
+        urls = [reverse("core:toty") + f"?season={season}" for season in (2024, 2023)]
+        etags = [self.client.get(url)["ETag"] for url in urls]
+
+        TOTY.objects.create(season="2024", team=self.team, points=12, place=1)
+
+        responses = [
+            self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+            for url, etag in zip(urls, etags)
+        ]
+
+        self.assertEqual(responses[0].status_code, 200)
+        self.assertNotEqual(responses[0]["ETag"], etags[0])
+        self.assertEqual(responses[1].status_code, 304)
+
+    def test_pages_have_distinct_etags(self):
+        """Test two pages of the same season do not share an ETag"""
+        SOTY.objects.create(season="2024", debater=self.debaters[0], place=1)
+
+        self.assertNotEqual(
+            self.client.get(reverse("core:soty") + "?season=2024")["ETag"],
+            self.client.get(reverse("core:coty") + "?season=2024")["ETag"],
+        )
+
+    def test_detail_page(self):
+        """Test a team page changes once the team gets a result"""
+        url = reverse("core:team_detail", kwargs={"pk": self.team.pk})
+        etag = self.client.get(url)["ETag"]
+
+        self.assertEqual(
+            self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304
+        )
+
+        tournament = Tournament.objects.create(
+            name="Test Tournament",
+            host=self.school,
+            date=date(2024, 1, 1),
+            season="2024",
+        )
+        TeamResult.objects.create(tournament=tournament, team=self.team, place=1)
+
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    @modify_settings(
+        MIDDLEWARE={"prepend": "core.middleware.AnonymousPageCacheMiddleware"}
+    )
+    def test_cached_pages(self):
+        """Test pages served from the page cache still answer with 304"""
+        url = reverse("core:toty") + "?season=2024"
+        etag = self.client.get(url)["ETag"]
+
+        self.assertEqual(self.client.get(url).status_code, 200)
+        self.assertEqual(
+            self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304
+        )
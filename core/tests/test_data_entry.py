@@ -0,0 +1,141 @@
+"""
+Tests for committing manually entered tournament results
+"""
+
+
+from datetime import date
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from django.conf import settings
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from core.models import Debater, School, SpeakerResult, Team, TeamResult
+from core.models.tournament import Tournament
+from core.utils.team import get_or_create_team_for_debaters
+from core.views.tournament_views import TournamentDataEntryWizardView
+
+
+class DataEntryDoneTest(TestCase):
+    """Test the data entry wizard replaces results in bulk"""
+
+    def setUp(self):
+        self.school = School.objects.create(name="Test School")
+        self.tournament = Tournament.objects.create(
+            name="Test Tournament",
+            host=self.school,
+            date=date(2024, 1, 1),
+            season=settings.CURRENT_SEASON,
+        )
+        self.debaters = [
+            Debater.objects.create(
+                first_name=f"Debater{i}", last_name=f"Last{i}", school=self.school
+            )
+            for i in range(8)
+        ]
+
+    def get_form_dict(self, varsity_teams=(), speakers=(), unplaced=()):
+        def form(cleaned_data):
+            return SimpleNamespace(cleaned_data=list(cleaned_data))
+
+        return {
+            "0": SimpleNamespace(cleaned_data={"tournament": self.tournament}),
+            "1": SimpleNamespace(cleaned_data={"num_teams": 20, "num_novices": 4}),
+            "2": form(
+                {"debater_one": a, "debater_two": b, "ghost_points": ghost}
+                for a, b, ghost in varsity_teams
+            ),
+            "3": form({"speaker": speaker, "tie": False} for speaker in speakers),
+            "4": form([{}]),
+            "5": form([]),
+            "6": form(
+                {"debater_one": a, "debater_two": b, "ghost_points": False}
+                for a, b in unplaced
+            ),
+        }
+
+    def done(self, form_dict):
+        with patch("core.views.tournament_views.refresh_standings") as refresh:
+            TournamentDataEntryWizardView().done([], form_dict)
+
+        return refresh
+
+    def test_results_are_replaced(self):
+        """Test old results are removed and new rows inserted"""
+        old_team = get_or_create_team_for_debaters(self.debaters[6], self.debaters[7])
+        TeamResult.objects.create(tournament=self.tournament, team=old_team, place=1)
+        SpeakerResult.objects.create(
+            tournament=self.tournament, debater=self.debaters[7], place=1
+        )
+
+        d = self.debaters
+        refresh = self.done(
+            self.get_form_dict(
+                varsity_teams=[
+                    (d[0], d[1], True),
+                    (None, None, False),
+                    (d[2], d[3], False),
+                ],
+                speakers=[d[0], None, d[2]],
+                unplaced=[(d[4], d[5])],
+            )
+        )
+
+        results = TeamResult.objects.filter(tournament=self.tournament)
+        self.assertEqual(
+            sorted(results.values_list("place", "ghost_points")),
+            [(-1, False), (1, True), (3, False)],
+        )
+        self.assertFalse(results.filter(team=old_team).exists())
+        self.assertEqual(
+            sorted(
+                SpeakerResult.objects.filter(tournament=self.tournament).values_list(
+                    "debater_id", "place"
+                )
+            ),
+            [(d[0].id, 1), (d[2].id, 3)],
+        )
+
+        self.tournament.refresh_from_db()
+        self.assertEqual(self.tournament.num_teams, 20)
+
+        kwargs = refresh.call_args.kwargs
+        self.assertIn(old_team.id, kwargs["team_ids"])
+        self.assertEqual(len(kwargs["team_ids"]), 4)
+        self.assertEqual(kwargs["debater_ids"], {d[0].id, d[2].id, d[7].id})
+        self.assertTrue(kwargs["online_quals"])
+
+    def test_query_count_does_not_scale(self):
+        """Test teams are resolved and results written in batches"""
+        d = self.debaters
+
+        with CaptureQueriesContext(connection) as small:
+            self.done(self.get_form_dict(varsity_teams=[(d[0], d[1], False)]))
+
+        with CaptureQueriesContext(connection) as large:
+            self.done(
+                self.get_form_dict(
+                    varsity_teams=[
+                        (d[0], d[1], False),
+                        (d[2], d[3], False),
+                        (d[4], d[5], False),
+                        (d[6], d[7], False),
+                    ],
+                    speakers=d,
+                )
+            )
+
+        self.assertEqual(Team.objects.count(), 4)
+        self.assertLessEqual(len(large), len(small) + 2)
+
+    def test_past_season_skips_standings(self):
+        """Test results for old seasons do not recompute standings"""
+        self.tournament.season = "2000"
+        self.tournament.save()
+
+        refresh = self.done(self.get_form_dict(speakers=[self.debaters[0]]))
+
+        refresh.assert_not_called()
+        self.assertEqual(SpeakerResult.objects.count(), 1)
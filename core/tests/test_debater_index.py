@@ -0,0 +1,127 @@
+"""
+Tests for the in-memory debater autocomplete index
+"""
+
+
+import json
+from unittest import mock
+
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from core.models import Debater, School
+from core.utils.debater_index import DebaterPrefixIndex
+from core.utils.versions import bump_versions, model_scope
+
+
+@mock.patch("core.utils.debater_index.CHECK_INTERVAL", 0)
+class DebaterPrefixIndexTest(TestCase):
+    """Test debaters are found by name and school prefixes"""
+
+    def setUp(self):
+        self.school = School.objects.create(name="Zebra College")
+        self.other_school = School.objects.create(name="Okapi University")
+        self.ada = Debater.objects.create(
+            first_name="Ada", last_name="Lovelace", school=self.school
+        )
+        self.alan = Debater.objects.create(
+            first_name="Alan", last_name="Turing", school=self.other_school
+        )
+        self.grace = Debater.objects.create(
+            first_name="Grace", last_name="Hopper", school=self.school
+        )
+        self.index = DebaterPrefixIndex()
+
+    def get_ids(self, q, school=None):
+        return [pk for pk, _ in self.index.search(q, school=school)]
+
+    def test_search(self):
+        """Test every word of the query must prefix a name or school word"""
+        self.assertEqual(self.get_ids("a"), [self.alan.id, self.ada.id])
+        self.assertEqual(self.get_ids("AD LOVE"), [self.ada.id])
+        self.assertEqual(self.get_ids("zebra"), [self.grace.id, self.ada.id])
+        self.assertEqual(self.get_ids("ada turing"), [])
+        self.assertEqual(self.get_ids(""), [self.grace.id, self.alan.id, self.ada.id])
+        self.assertEqual(
+            self.index.search("grace"),
+            [(self.grace.id, f"<{self.grace.id}> Grace Hopper (Zebra College)")],
+        )
+
+    def test_school_scope(self):
+        """Test lookups can be limited to one school"""
+        self.assertEqual(self.get_ids("a", school=self.school.id), [self.ada.id])
+        self.assertEqual(
+            self.get_ids("", school=str(self.other_school.id)), [self.alan.id]
+        )
+
+    def test_refresh(self):
+        """Test the index only queries again once debaters or schools change"""
+        self.get_ids("a")
+
+        with CaptureQueriesContext(connection) as queries:
+            self.get_ids("a")
+        self.assertEqual(len(queries), 0)
+
+        debater = Debater.objects.create(
+            first_name="Edsger", last_name="Dijkstra", school=self.school
+        )
+        self.assertEqual(self.get_ids("edsger"), [debater.id])
+
+        self.school.name = "Quagga College"
+        self.school.save()
+        self.assertEqual(
+            self.get_ids("quagga"), [debater.id, self.grace.id, self.ada.id]
+        )
+
+    @override_settings(
+        CACHES={"default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}}
+    )
+    def test_dummy_cache(self):
+        """Test the index is rebuilt on every check when tokens aren't kept"""
+        self.get_ids("a")
+
+        with CaptureQueriesContext(connection) as queries:
+            self.get_ids("a")
+        self.assertEqual(len(queries), 1)
+
+    def test_bulk_writes(self):
+        """Test bulk-created debaters are found once their scope is bumped"""
+        self.get_ids("a")
+        Debater.objects.bulk_create(
+            [Debater(first_name="Edsger", last_name="Dijkstra", school=self.school)]
+        )
+        self.assertEqual(self.get_ids("edsger"), [])
+
+        bump_versions([model_scope(Debater)])
+        self.assertEqual(
+            self.get_ids("edsger"), [Debater.objects.get(first_name="Edsger").id]
+        )
+
+    def test_autocomplete_view(self):
+        """Test the autocomplete pages results in Select2 format"""
+        url = reverse("core:debater_autocomplete")
+        forward = json.dumps({"school": str(self.school.id)})
+
+        response = self.client.get(url, {"q": "a", "forward": forward}).json()
+
+        self.assertEqual(
+            response["results"],
+            [
+                {
+                    "id": str(self.ada.id),
+                    "text": f"<{self.ada.id}> Ada Lovelace (Zebra College)",
+                    "selected_text": f"<{self.ada.id}> Ada Lovelace (Zebra College)",
+                }
+            ],
+        )
+        self.assertFalse(response["pagination"]["more"])
+
+        with mock.patch("core.views.debater_views.DebaterAutocomplete.paginate_by", 2):
+            response = self.client.get(url).json()
+            self.assertTrue(response["pagination"]["more"])
+            response = self.client.get(url, {"page": 2}).json()
+            self.assertEqual(
+                [result["id"] for result in response["results"]], [str(self.ada.id)]
+            )
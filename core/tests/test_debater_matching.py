@@ -0,0 +1,79 @@
+"""
+Tests for the batched debater reconciliation matcher
+"""
+
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from core.models import Debater, School
+from core.utils.debater_matching import DebaterMatcher, get_trigrams, normalize_name
+
+
+class DebaterMatcherTest(TestCase):
+    """Test in-memory debater matching"""
+
+    def setUp(self):
+        self.school = School.objects.create(name="Test School")
+        self.other_school = School.objects.create(name="Other School")
+        self.john = Debater.objects.create(
+            first_name="John", last_name="Doe", school=self.school
+        )
+        self.jon = Debater.objects.create(
+            first_name="Jon", last_name="Dough", school=self.school
+        )
+        self.other_john = Debater.objects.create(
+            first_name="John", last_name="Doe", school=self.other_school
+        )
+
+    def test_normalize_name(self):
+        """Test names are lowercased and stripped of punctuation"""
+        self.assertEqual(normalize_name("  O'Brien,  Mary "), "o brien mary")
+        self.assertIn(" jo", get_trigrams("John"))
+
+    def test_exact_match_ranked_first(self):
+        """Test an exact name match wins with full confidence"""
+        matcher = DebaterMatcher([self.school.id])
+
+        candidates = matcher.match("john doe", [self.school.id])
+
+        self.assertEqual(candidates[0][0], self.john)
+        self.assertEqual(candidates[0][1], 1.0)
+        self.assertIn(self.jon, [candidate[0] for candidate in candidates])
+        self.assertLess(candidates[1][1], 1.0)
+
+    def test_match_restricted_to_schools(self):
+        """Test candidates only come from the requested schools"""
+        matcher = DebaterMatcher([self.school.id, self.other_school.id])
+
+        candidates = matcher.match("John Doe", [self.other_school.id])
+
+        self.assertEqual([candidate[0] for candidate in candidates], [self.other_john])
+        self.assertEqual(matcher.match("John Doe", [-1]), [])
+
+    def test_best_match_threshold(self):
+        """Test weak matches are not returned as the best match"""
+        matcher = DebaterMatcher([self.school.id])
+
+        self.assertEqual(matcher.best_match("Jon Dough", [self.school.id]), self.jon)
+        self.assertIsNone(matcher.best_match("Zed Quux", [self.school.id]))
+
+    def test_match_all_uses_single_query(self):
+        """Test matching many names only queries once when building"""
+        with CaptureQueriesContext(connection) as queries:
+            matcher = DebaterMatcher([self.school.id, self.other_school.id])
+            results = matcher.match_all(
+                [
+                    (1, "John Doe", [self.school.id]),
+                    (2, "Jon Dough", [self.school.id]),
+                    (3, "John Doe", [self.other_school.id, -1]),
+                ]
+            )
+            labels = [candidates[0][0].school.name for candidates in results.values()]
+
+        self.assertEqual(len(queries), 1)
+        self.assertEqual(results[1][0][0], self.john)
+        self.assertEqual(results[2][0][0], self.jon)
+        self.assertEqual(results[3][0][0], self.other_john)
+        self.assertEqual(labels, ["Test School", "Test School", "Other School"])
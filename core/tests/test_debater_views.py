@@ -5,11 +5,23 @@ Tests for debater views
 
 
 from datetime import date
+from django.contrib.auth import get_user_model
+from django.db import connection
 from django.test import TestCase, Client
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 
-from core.models import School, Tournament, Debater
+from core.models import (
+    Debater,
+    Round,
+    RoundStats,
+    School,
+    TeamResult,
+    Tournament,
+    Video,
+)
 from core.models.results.speaker import SpeakerResult
+from core.utils.team import get_or_create_team_for_debaters
 
 
 class DebaterViewsTest(TestCase):
@@ -114,3 +126,105 @@ class DebaterViewsTest(TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertContains(response, "John")
         self.assertContains(response, "Doe")
+
+
+class DebaterDetailQueryTest(TestCase):
+    """Test the debater page runs a fixed number of queries"""
+
+    def setUp(self):
+        self.school = School.objects.create(name="Test School")
+        self.debater = Debater.objects.create(
+            first_name="John", last_name="Doe", school=self.school
+        )
+        partners = [
+            Debater.objects.create(
+                first_name=f"Partner{i}", last_name=f"Last{i}", school=self.school
+            )
+            for i in range(4)
+        ]
+        opponents = [
+            get_or_create_team_for_debaters(
+                Debater.objects.create(
+                    first_name=f"Gov{i}", last_name="One", school=self.school
+                ),
+                Debater.objects.create(
+                    first_name=f"Opp{i}", last_name="Two", school=self.school
+                ),
+            )
+            for i in range(2)
+        ]
+
+        for year, partner in zip(range(2021, 2025), partners):
+            team = get_or_create_team_for_debaters(self.debater, partner)
+
+            for month in range(1, 9):
+                tournament = Tournament.objects.create(
+                    name=f"Tournament {year} {month}",
+                    host=self.school,
+                    date=date(year, month, 1),
+                    season=str(year),
+                )
+                TeamResult.objects.create(
+                    tournament=tournament, team=team, place=month
+                )
+                SpeakerResult.objects.create(
+                    tournament=tournament, debater=self.debater, place=month
+                )
+                Video.objects.create(
+                    pm=self.debater,
+                    mg=partner,
+                    lo=opponents[0].debaters.first(),
+                    mo=opponents[0].debaters.last(),
+                    tournament=tournament,
+                    permissions=Video.ALL,
+                )
+
+                for round_number in range(1, 6):
+                    round_obj = Round.objects.create(
+                        tournament=tournament,
+                        round_number=round_number,
+                        gov=team,
+                        opp=opponents[round_number % 2],
+                        victor=Round.GOV,
+                    )
+                    for debater, role in ((self.debater, "pm"), (partner, "mg")):
+                        RoundStats.objects.create(
+                            round=round_obj,
+                            debater=debater,
+                            debater_role=role,
+                            speaks=27,
+                            ranks=1,
+                        )
+
+        self.user = get_user_model().objects.create_superuser(
+            username="tester", email="tester@example.com", password="password"
+        )
+
+    def test_query_count(self):
+        """Test a four season career renders in under 15 queries"""
+        self.client.force_login(self.user)
+        url = reverse("core:debater_detail", kwargs={"pk": self.debater.pk})
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, {"season": "2024", "all": 1})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.context["results"]), 8)
+        self.assertEqual(len(response.context["results"][0]["tab_card"]), 5)
+        self.assertEqual(len(response.context["videos"]), 32)
+        self.assertContains(response, "Partner3")
+        self.assertLess(len(queries), 15)
+
+    def test_not_modified(self):
+        """Test a conditional GET only looks up the debater's teams"""
+        url = reverse("core:debater_detail", kwargs={"pk": self.debater.pk})
+        etag = self.client.get(url, {"season": "2024"})["ETag"]
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(
+                url, {"season": "2024"}, HTTP_IF_NONE_MATCH=etag
+            )
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(len(queries), 1)
+        self.assertNotIn("COUNT", queries[0]["sql"])
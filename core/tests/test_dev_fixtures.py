@@ -0,0 +1,92 @@
+"""
+Tests for creating development fixtures
+"""
+
+
+import gzip
+import json
+import os
+import tempfile
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from core.management.commands.create_dev_fixtures import SOURCES, serialize_source
+from core.models import Debater, School, User
+
+
+class CreateDevFixturesTest(TestCase):
+    """Test fixtures are streamed to disk and sanitized"""
+
+    def setUp(self):
+        self.school = School.objects.create(name="Test School")
+        for i in range(3):
+            Debater.objects.create(
+                first_name=f"Debater{i}", last_name="Last", school=self.school
+            )
+        User.objects.create_user("private", "private@example.com", "secret")
+
+    def create_fixture(self, *args):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        output = os.path.join(directory.name, "fixture.json")
+
+        out = StringIO()
+        call_command("create_dev_fixtures", "--output", output, *args, stdout=out)
+        return out.getvalue(), directory.name
+
+    def load(self, path):
+        opener = gzip.open if path.endswith(".gz") else open
+        with opener(path, "rt", encoding="utf-8") as f:
+            return json.load(f)
+
+    def test_streamed_fixture(self):
+        """Test the fixture is valid JSON with sanitized users"""
+        out, directory = self.create_fixture()
+        objects = self.load(os.path.join(directory, "fixture.json"))
+
+        debaters = [obj for obj in objects if obj["model"] == "core.debater"]
+        users = [obj for obj in objects if obj["model"] == "core.user"]
+
+        self.assertEqual(len(debaters), 3)
+        self.assertTrue(users[0]["fields"]["username"].startswith("user_"))
+        self.assertNotIn("private@example.com", json.dumps(objects))
+        self.assertIn(f"with {len(objects)} objects", out)
+
+    def test_gzip_and_workers(self):
+        """Test compressed and parallel fixtures hold the same objects"""
+        _, plain = self.create_fixture()
+        _, compressed = self.create_fixture("--gzip", "--workers", "2")
+
+        self.assertEqual(
+            self.load(os.path.join(plain, "fixture.json")),
+            self.load(os.path.join(compressed, "fixture.json.gz")),
+        )
+
+    def test_failed_sources_are_left_out(self):
+        """Test a source failing part way through leaves the fixture valid"""
+
+        def failing_debaters():
+            yield from Debater.objects.all()
+            raise RuntimeError("lost connection")
+
+        with mock.patch("core.management.commands.create_dev_fixtures.CHUNK_SIZE", 1):
+            with mock.patch.dict(SOURCES, {"Debater": failing_debaters}):
+                out, directory = self.create_fixture()
+
+        objects = self.load(os.path.join(directory, "fixture.json"))
+
+        self.assertIn("Error processing Debater: lost connection", out)
+        self.assertFalse([obj for obj in objects if obj["model"] == "core.debater"])
+        self.assertTrue([obj for obj in objects if obj["model"] == "core.school"])
+
+    def test_serialize_source(self):
+        """Test a source is written in chunks as the body of an array"""
+        stream = StringIO()
+        count = serialize_source("Debater", stream, ", ")
+
+        self.assertEqual(count, 3)
+        self.assertTrue(stream.getvalue().startswith(", {"))
+        self.assertEqual(len(json.loads(f"[{stream.getvalue()[2:]}]")), 3)
@@ -0,0 +1,114 @@
+"""
+Tests for streaming CSV and NDJSON exports
+"""
+
+
+import csv
+import json
+import os
+import tempfile
+from datetime import date
+from decimal import Decimal
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+
+from core.models import Debater, Round, RoundStats, School, TeamResult
+from core.models.tournament import Tournament
+from core.utils.export import get_export_rows, stream_csv, stream_ndjson
+from core.utils.team import get_or_create_team_for_debaters
+
+
+class ExportTest(TestCase):
+    """Test exporting results and standings row by row"""
+
+    def setUp(self):
+        self.school = School.objects.create(name="Test School")
+        self.debaters = [
+            Debater.objects.create(
+                first_name=f"Debater{i}", last_name="Last", school=self.school
+            )
+            for i in range(4)
+        ]
+        self.gov = get_or_create_team_for_debaters(*self.debaters[:2])
+        self.opp = get_or_create_team_for_debaters(*self.debaters[2:])
+
+        self.tournaments = [
+            Tournament.objects.create(
+                name=f"Tournament {season}",
+                host=self.school,
+                date=date(int(season), 1, 1),
+                season=season,
+            )
+            for season in ("2023", "2024")
+        ]
+
+        for tournament in self.tournaments:
+            TeamResult.objects.create(tournament=tournament, team=self.gov, place=1)
+            tournament_round = Round.objects.create(
+                tournament=tournament, gov=self.gov, opp=self.opp, round_number=1
+            )
+            RoundStats.objects.create(
+                debater=self.debaters[0],
+                round=tournament_round,
+                speaks=Decimal("26.5"),
+                ranks=Decimal("1"),
+            )
+
+    def test_season_filter(self):
+        """Test a season filter follows each model's path to the tournament"""
+        self.assertEqual(len(list(get_export_rows("team_results"))), 2)
+        self.assertEqual(len(list(get_export_rows("team_results", "2024"))), 1)
+        self.assertEqual(len(list(get_export_rows("round_stats", "2023"))), 1)
+        self.assertEqual(len(list(get_export_rows("toty", "2024"))), 0)
+
+    def test_csv(self):
+        """Test CSV exports have a header and one line per row"""
+        rows = list(csv.reader("".join(stream_csv("team_results")).splitlines()))
+
+        self.assertIn("tournament_id", rows[0])
+        self.assertEqual(len(rows), 3)
+
+    def test_ndjson(self):
+        """Test NDJSON exports one JSON object per line"""
+        lines = list(stream_ndjson("round_stats", "2024"))
+
+        self.assertEqual(len(lines), 1)
+        row = json.loads(lines[0])
+        self.assertEqual(row["debater_id"], self.debaters[0].id)
+        self.assertEqual(Decimal(row["speaks"]), Decimal("26.5"))
+
+    def test_command(self):
+        """Test the command writes to stdout or a file"""
+        out = StringIO()
+        call_command("export_data", "rounds", "--format", "ndjson", stdout=out)
+        self.assertEqual(len(out.getvalue().splitlines()), 2)
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "results.csv")
+            call_command(
+                "export_data", "team_results", "--season", "2024", "--output", path
+            )
+
+            with open(path, encoding="utf-8") as output:
+                self.assertEqual(len(output.readlines()), 2)
+
+    def test_view(self):
+        """Test the export view streams for admins only"""
+        url = reverse("core:export", kwargs={"name": "team_results", "fmt": "csv"})
+
+        self.assertEqual(self.client.get(url).status_code, 302)
+
+        self.client.force_login(get_user_model().objects.create_superuser("admin", "", "pass"))
+        response = self.client.get(url, {"season": "2024"})
+
+        self.assertTrue(response.streaming)
+        self.assertEqual(response["Content-Type"], "text/csv")
+        self.assertIn("team_results-2024.csv", response["Content-Disposition"])
+        self.assertEqual(len(b"".join(response.streaming_content).splitlines()), 2)
+
+        missing = reverse("core:export", kwargs={"name": "videos", "fmt": "csv"})
+        self.assertEqual(self.client.get(missing).status_code, 404)
@@ -0,0 +1,101 @@
+"""
+Tests for the synthetic tab export generator and import benchmark
+"""
+
+
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from core.management.commands.benchmark_import import benchmark_import
+from core.models import Round, Tournament
+from core.utils.tab_export import generate_tab_export
+
+# Query and wall time budgets per team count, with headroom over current runs
+IMPORT_BUDGETS = {30: (250, 5), 100: (700, 15)}
+
+
+class TabExportGeneratorTest(TestCase):
+    """Test generated exports are realistic and consistent"""
+
+    def test_export_shape(self):
+        """Test the generated export references only known ids"""
+        data = generate_tab_export(num_teams=20, num_rounds=4, num_schools=5)
+
+        team_ids = {team["id"] for team in data["teams"]}
+        debater_ids = {
+            debater["id"] for team in data["teams"] for debater in team["debaters"]
+        }
+        round_ids = {round_obj["id"] for round_obj in data["rounds"]}
+
+        self.assertEqual(len(data["teams"]), 20)
+        self.assertEqual(len(data["rounds"]), 40)
+        self.assertEqual(len(data["stats"]), 160)
+        self.assertEqual(len(debater_ids), 40)
+        self.assertTrue(
+            all(
+                r["gov"] in team_ids and r["opp"] in team_ids for r in data["rounds"]
+            )
+        )
+        self.assertTrue(
+            all(
+                s["round"] in round_ids and s["debater"] in debater_ids
+                for s in data["stats"]
+            )
+        )
+        self.assertEqual([r["place"] for r in data["team_results"]], list(range(1, 17)))
+
+    def test_export_is_deterministic(self):
+        """Test the same seed produces the same export"""
+        self.assertEqual(
+            generate_tab_export(num_teams=10, seed=3),
+            generate_tab_export(num_teams=10, seed=3),
+        )
+        self.assertNotEqual(
+            generate_tab_export(num_teams=10, seed=3),
+            generate_tab_export(num_teams=10, seed=4),
+        )
+
+    def test_hybrid_teams(self):
+        """Test hybrid teams use a different school"""
+        data = generate_tab_export(num_teams=50, hybrid_ratio=1)
+
+        self.assertTrue(
+            all(
+                team["hybrid_school_id"] not in (-1, team["school_id"])
+                for team in data["teams"]
+            )
+        )
+
+
+class ImportBenchmarkTest(TestCase):
+    """Test the import benchmark measures without keeping data"""
+
+    def test_benchmark_rolls_back(self):
+        """Test a benchmark run reports metrics and leaves no rows"""
+        result = benchmark_import(generate_tab_export(num_teams=10))
+
+        self.assertGreater(result["queries"], 0)
+        self.assertGreater(result["peak_memory"], 0)
+        self.assertGreaterEqual(result["seconds"], 0)
+        self.assertFalse(Tournament.objects.exists())
+        self.assertFalse(Round.objects.exists())
+
+    def test_budgets(self):
+        """Test imports stay within their query and time budgets"""
+        for num_teams, (queries, seconds) in IMPORT_BUDGETS.items():
+            with self.subTest(num_teams=num_teams):
+                result = benchmark_import(generate_tab_export(num_teams=num_teams))
+
+                self.assertLessEqual(result["queries"], queries)
+                self.assertLessEqual(result["seconds"], seconds)
+
+    def test_command(self):
+        """Test the command prints a row per team count"""
+        out = StringIO()
+        call_command("benchmark_import", teams=[6, 12], stdout=out)
+
+        lines = out.getvalue().strip().splitlines()
+        self.assertEqual(len(lines), 3)
+        self.assertTrue(lines[1].split()[0] == "6")
@@ -0,0 +1,188 @@
+"""
+Tests for importing saved tab exports from disk
+"""
+
+
+import json
+import os
+import tempfile
+from datetime import date
+from io import StringIO
+from unittest.mock import patch
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+
+from core.management.commands.import_tab_exports import Command
+from core.models import Debater, Round, School, SpeakerResult, Team, TeamResult
+from core.models.tournament import Tournament
+
+
+def make_export():
+    return {
+        "num_rounds": 5,
+        "schools": [{"id": 1, "name": "Test School"}, {"id": 2, "name": "New School"}],
+        "teams": [
+            {
+                "id": 1,
+                "school_id": 1,
+                "hybrid_school_id": -1,
+                "num_rounds": 5,
+                "debaters": [
+                    {"id": 1, "name": "John Doe", "status": 0},
+                    {"id": 2, "name": "Jane Smith", "status": 0},
+                ],
+            },
+            {
+                "id": 2,
+                "school_id": 2,
+                "hybrid_school_id": -1,
+                "num_rounds": 5,
+                "debaters": [
+                    {"id": 3, "name": "Bob Jones", "status": 1},
+                    {"id": 4, "name": "Amy Lee", "status": 0},
+                ],
+            },
+        ],
+        "rounds": [{"id": 1, "round_number": 1, "gov": 1, "opp": 2, "victor": 1}],
+        "stats": [
+            {"round": 1, "debater": 1, "speaks": 26, "ranks": 1, "role": "pm"},
+            {"round": 1, "debater": 3, "speaks": 25, "ranks": 2, "role": "lo"},
+        ],
+        "speaker_results": [{"debater": 1, "place": 1, "tie": False}],
+        "novice_speaker_results": [{"debater": 3, "place": 1, "tie": False}],
+        "team_results": [{"team": 1, "place": 1}, {"team": 2, "place": 2}],
+        "novice_team_results": [],
+    }
+
+
+class ImportTabExportsCommandTest(TestCase):
+    """Test the import_tab_exports management command"""
+
+    def setUp(self):
+        self.school = School.objects.create(name="Test School")
+        self.john = Debater.objects.create(
+            first_name="John", last_name="Doe", school=self.school
+        )
+        self.tournament = Tournament.objects.create(
+            name="Test Tournament",
+            host=self.school,
+            date=date(2024, 1, 1),
+            season="2024",
+        )
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write_export(self, name, data):
+        path = os.path.join(self.directory.name, name)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        return path
+
+    def test_import_directory(self):
+        """Test a directory of exports is imported and reconciled"""
+        self.write_export(f"{self.tournament.id}.json", make_export())
+
+        out = StringIO()
+        call_command("import_tab_exports", self.directory.name, stdout=out)
+
+        self.assertIn("Imported 1 exports", out.getvalue())
+        self.assertTrue(School.objects.filter(name="New School").exists())
+        self.assertEqual(Debater.objects.filter(first_name="John").count(), 1)
+        self.assertEqual(Debater.objects.get(first_name="Bob").status, Debater.NOVICE)
+        self.assertEqual(Round.objects.filter(tournament=self.tournament).count(), 1)
+        self.assertEqual(Team.objects.count(), 2)
+        self.assertEqual(
+            TeamResult.objects.get(tournament=self.tournament, place=1).team,
+            Team.objects.get(debaters=self.john),
+        )
+        self.assertEqual(
+            SpeakerResult.objects.filter(tournament=self.tournament).count(), 2
+        )
+
+        self.tournament.refresh_from_db()
+        self.assertEqual(self.tournament.num_teams, 2)
+        self.assertEqual(self.tournament.num_novice_debaters, 1)
+
+    def test_standings_follow_imported_seasons(self):
+        """Test each imported tournament's season has its standings recomputed"""
+        self.tournament.season = "2019"
+        self.tournament.save()
+        self.write_export(f"{self.tournament.id}.json", make_export())
+
+        with patch(
+            "core.management.commands.import_tab_exports.refresh_standings"
+        ) as refresh:
+            call_command("import_tab_exports", self.directory.name, stdout=StringIO())
+
+        refresh.assert_called_once()
+        self.assertEqual(refresh.call_args.kwargs["season"], "2019")
+        self.assertEqual(
+            refresh.call_args.kwargs["team_ids"],
+            set(Team.objects.values_list("id", flat=True)),
+        )
+
+    def test_import_with_mapping(self):
+        """Test the mapping file links schools and names explicitly"""
+        other = School.objects.create(name="Other School")
+        path = self.write_export("export.json", make_export())
+        mapping = self.write_export(
+            "mapping.txt",
+            {
+                "tournaments": {"export.json": self.tournament.id},
+                "schools": {"New School": other.id},
+            },
+        )
+
+        call_command("import_tab_exports", path, mapping=mapping, stdout=StringIO())
+
+        self.assertFalse(School.objects.filter(name="New School").exists())
+        self.assertTrue(Debater.objects.filter(first_name="Bob", school=other).exists())
+
+    def test_failed_import_is_rolled_back(self):
+        """Test a broken export leaves no partial writes"""
+        data = make_export()
+        data["stats"][0]["round"] = 99
+        self.write_export(f"{self.tournament.id}.json", data)
+
+        with self.assertRaises(CommandError):
+            call_command("import_tab_exports", self.directory.name, stdout=StringIO())
+
+        self.assertFalse(School.objects.filter(name="New School").exists())
+        self.assertFalse(Round.objects.exists())
+
+    def test_missing_tournament(self):
+        """Test files without a tournament are rejected"""
+        path = self.write_export("export.json", make_export())
+
+        with self.assertRaises(CommandError):
+            call_command("import_tab_exports", path, stdout=StringIO())
+
+    def test_shared_rows_are_created_once(self):
+        """Test exports sharing a new school and debaters link to the same rows"""
+        other = Tournament.objects.create(
+            name="Other Tournament",
+            host=self.school,
+            date=date(2024, 2, 1),
+            season="2024",
+        )
+        command = Command()
+
+        first = command.prepare_file(
+            self.write_export("first.json", make_export()), self.tournament.id, {}
+        )
+        second = command.prepare_file(
+            self.write_export("second.json", make_export()), other.id, {}
+        )
+
+        self.assertEqual(School.objects.filter(name="New School").count(), 1)
+        self.assertEqual(Debater.objects.filter(first_name="Bob").count(), 1)
+        self.assertEqual(Team.objects.count(), 2)
+        self.assertEqual(first[1:], second[1:])
+        self.assertFalse(Round.objects.exists())
+
+        _, teams, _ = command.save_results(other.id, *second)
+        self.assertEqual(teams, set(first[2].values()))
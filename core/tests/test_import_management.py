@@ -0,0 +1,143 @@
+"""
+Tests for diff-based tournament re-import
+"""
+
+
+from datetime import date
+from unittest.mock import patch
+
+from django.test import TestCase
+
+from core.models import Debater, Round, RoundStats, School, SpeakerResult, TeamResult
+from core.models.tournament import Tournament
+from core.utils.import_management import (
+    create_round_stats,
+    create_rounds,
+    create_speaker_awards,
+    create_team_awards,
+)
+from core.utils.team import get_or_create_team_for_debaters
+
+
+class ImportDiffTest(TestCase):
+    """Test re-importing rounds, stats and awards only applies changes"""
+
+    def setUp(self):
+        school = School.objects.create(name="Test School")
+        self.tournament = Tournament.objects.create(
+            name="Test Tournament",
+            host=school,
+            date=date(2024, 1, 1),
+            season="2024",
+        )
+        self.debaters = [
+            Debater.objects.create(
+                first_name=f"Debater{i}", last_name=f"Last{i}", school=school
+            )
+            for i in range(4)
+        ]
+        self.teams = [
+            get_or_create_team_for_debaters(self.debaters[0], self.debaters[1]),
+            get_or_create_team_for_debaters(self.debaters[2], self.debaters[3]),
+        ]
+
+        self.team_actions = {10: self.teams[0].id, 11: self.teams[1].id}
+        self.debater_actions = {20 + i: d.id for i, d in enumerate(self.debaters)}
+
+        self.rounds = [
+            {"id": 1, "round_number": 1, "gov": 10, "opp": 11, "victor": Round.GOV},
+            {"id": 2, "round_number": 2, "gov": 11, "opp": 10, "victor": Round.OPP},
+        ]
+        self.stats = [
+            {"round": 1, "debater": 20, "speaks": 26.5, "ranks": 1, "role": "pm"},
+            {"round": 1, "debater": 22, "speaks": 25, "ranks": 3, "role": "lo"},
+        ]
+
+    def import_rounds(self):
+        round_actions = create_rounds(self.team_actions, self.tournament, self.rounds)
+        create_round_stats(
+            self.debater_actions, round_actions, self.tournament, self.stats
+        )
+        return round_actions
+
+    def test_reimport_keeps_unchanged_rows(self):
+        """Test identical re-import leaves stored rows untouched"""
+        first = self.import_rounds()
+        stat_ids = set(RoundStats.objects.values_list("id", flat=True))
+
+        second = self.import_rounds()
+
+        self.assertEqual(first, second)
+        self.assertEqual(set(RoundStats.objects.values_list("id", flat=True)), stat_ids)
+        self.assertEqual(Round.objects.filter(tournament=self.tournament).count(), 2)
+
+    def test_reimport_applies_changes(self):
+        """Test changed, removed and added rows are applied"""
+        first = self.import_rounds()
+
+        self.rounds[0]["victor"] = Round.OPP
+        self.rounds = self.rounds[:1] + [
+            {"id": 3, "round_number": 3, "gov": 10, "opp": 11, "victor": Round.GOV}
+        ]
+        self.stats[0]["speaks"] = 27
+
+        second = self.import_rounds()
+
+        self.assertEqual(first[1], second[1])
+        self.assertEqual(Round.objects.get(id=second[1]).victor, Round.OPP)
+        self.assertFalse(Round.objects.filter(id=first[2]).exists())
+        self.assertTrue(Round.objects.filter(id=second[3], round_number=3).exists())
+        self.assertEqual(RoundStats.objects.get(debater=self.debaters[0]).speaks, 27)
+        self.assertEqual(RoundStats.objects.count(), 2)
+
+    @patch("core.utils.rankings.redo_rankings")
+    @patch("core.utils.rankings.update_noty")
+    @patch("core.utils.rankings.update_soty")
+    def test_speaker_awards_update_only_changed(self, update_soty, *_):
+        """Test standings are recomputed only for changed debaters"""
+        awards = [
+            {"debater": 20, "place": 1, "tie": False},
+            {"debater": 21, "place": 2, "tie": False},
+        ]
+        create_speaker_awards(
+            self.debater_actions, awards, Debater.VARSITY, self.tournament
+        )
+        self.assertEqual(update_soty.call_count, 2)
+
+        update_soty.reset_mock()
+        changed = create_speaker_awards(
+            self.debater_actions, awards, Debater.VARSITY, self.tournament
+        )
+        self.assertEqual(changed, set())
+        update_soty.assert_not_called()
+
+        awards[1]["debater"] = 22
+        changed = create_speaker_awards(
+            self.debater_actions, awards, Debater.VARSITY, self.tournament
+        )
+        self.assertEqual(changed, {self.debaters[1].id, self.debaters[2].id})
+        self.assertEqual(SpeakerResult.objects.get(place=2).debater, self.debaters[2])
+
+    @patch("core.utils.rankings.redo_rankings")
+    @patch("core.utils.rankings.update_online_quals")
+    @patch("core.utils.rankings.update_qual_points")
+    @patch("core.utils.rankings.update_toty")
+    def test_team_awards_update_only_changed(self, update_toty, *_):
+        """Test team awards diff by place and drop unplaced rows"""
+        TeamResult.objects.create(
+            tournament=self.tournament, team=self.teams[1], place=-1
+        )
+        awards = [{"team": 10, "place": 1}]
+
+        changed = create_team_awards(
+            self.team_actions, awards, Debater.VARSITY, self.tournament
+        )
+        self.assertEqual(changed, {team.id for team in self.teams})
+        self.assertFalse(TeamResult.objects.filter(place=-1).exists())
+
+        update_toty.reset_mock()
+        changed = create_team_awards(
+            self.team_actions, awards, Debater.VARSITY, self.tournament
+        )
+        self.assertEqual(changed, set())
+        update_toty.assert_not_called()
@@ -0,0 +1,183 @@
+"""
+Tests for validating tab exports before import
+"""
+
+
+import json
+from datetime import date
+from unittest.mock import patch
+
+from django.contrib.sessions.backends.db import SessionStore
+from django.test import RequestFactory, TestCase
+from django.utils.datastructures import MultiValueDict
+from formtools.wizard.storage import get_storage
+from formtools.wizard.views import StepsHelper
+
+from core.forms import TournamentImportForm
+from core.models import School, Tournament
+from core.tests.test_import_commands import make_export
+from core.utils.import_management import validate_tab_export
+from core.utils.tab_export import generate_tab_export
+from core.views.tournament_views import TournamentImportWizardView
+
+
+class ValidateTabExportTest(TestCase):
+    """Test the tab export validation pre-pass"""
+
+    def test_valid_exports(self):
+        """Test well formed exports pass"""
+        self.assertEqual(validate_tab_export(make_export()), [])
+        self.assertEqual(validate_tab_export(generate_tab_export(num_teams=40)), [])
+
+    def test_missing_key(self):
+        """Test missing top level keys are reported"""
+        data = make_export()
+        del data["stats"]
+
+        self.assertEqual(validate_tab_export(data), ["Missing key stats"])
+
+    def test_broken_references(self):
+        """Test rounds, stats and awards must reference known rows"""
+        data = make_export()
+        data["rounds"][0]["opp"] = 9
+        data["stats"][0]["round"] = 7
+        data["stats"][1]["debater"] = 8
+        data["team_results"][0]["team"] = 5
+        data["speaker_results"][0]["debater"] = 6
+
+        errors = validate_tab_export(data)
+
+        self.assertIn("Round 1 references unknown opp team 9", errors)
+        self.assertIn("Speaks reference unknown round 7", errors)
+        self.assertIn("Speaks in round 1 reference unknown debater 8", errors)
+        self.assertIn("team_results references unknown team 5", errors)
+        self.assertIn("speaker_results references unknown debater 6", errors)
+
+    def test_invalid_values(self):
+        """Test counts, places and stat values are checked"""
+        data = make_export()
+        data["teams"][0]["debaters"].pop()
+        data["teams"][1]["school_id"] = 3
+        data["rounds"][0]["victor"] = 9
+        data["stats"][1]["speaks"] = "fast"
+        data["team_results"][1]["place"] = 0
+
+        errors = validate_tab_export(data)
+
+        self.assertIn("Team 1 must have 2 debaters", errors)
+        self.assertIn("Team 2 references unknown school 3", errors)
+        self.assertIn("Round 1 has an invalid victor", errors)
+        self.assertIn("Debater 3 has invalid speaks in round 1", errors)
+        self.assertIn("team_results has an invalid place 0", errors)
+
+    def test_debater_not_in_round(self):
+        """Test stats must belong to a debater on either team"""
+        data = make_export()
+        data["teams"].append(
+            {
+                "id": 3,
+                "school_id": 1,
+                "hybrid_school_id": -1,
+                "num_rounds": 5,
+                "debaters": [
+                    {"id": 5, "name": "Sam Park", "status": 0},
+                    {"id": 6, "name": "Kim Ray", "status": 0},
+                ],
+            }
+        )
+        data["stats"][0]["debater"] = 5
+
+        self.assertEqual(
+            validate_tab_export(data), ["Debater 5 did not debate in round 1"]
+        )
+
+
+class TournamentImportFormTest(TestCase):
+    """Test the import form rejects bad payloads before any writes"""
+
+    def get_form(self, content):
+        form = TournamentImportForm(data={"url": "http://test.nu-tab.com"})
+
+        with patch.object(TournamentImportForm, "get_response", return_value=content):
+            form.is_valid()
+
+        return form
+
+    def test_valid_payload(self):
+        """Test a valid payload is kept on the form"""
+        content = json.dumps(make_export()).encode()
+        form = self.get_form(content)
+
+        self.assertTrue(form.is_valid())
+        self.assertEqual(form.cleaned_data["response"], content)
+
+    def test_invalid_payload(self):
+        """Test validation errors are shown on the form"""
+        data = make_export()
+        data["rounds"][0]["gov"] = 9
+        form = self.get_form(json.dumps(data).encode())
+
+        self.assertFalse(form.is_valid())
+        self.assertIn(
+            "Round 1 references unknown gov team 9", form.non_field_errors()
+        )
+
+    def test_invalid_json(self):
+        """Test non JSON responses are rejected"""
+        form = self.get_form(b"<html></html>")
+
+        self.assertFalse(form.is_valid())
+        self.assertIn(
+            "The tournament did not return valid JSON", form.non_field_errors()
+        )
+
+
+class TournamentImportWizardTest(TestCase):
+    """Test the wizard fetches the tab export only when the URL is submitted"""
+
+    def setUp(self):
+        self.content = json.dumps(make_export()).encode()
+
+        request = RequestFactory().post("/", {"1-url": "http://test.nu-tab.com"})
+        request.session = SessionStore()
+
+        self.view = TournamentImportWizardView(
+            **TournamentImportWizardView.get_initkwargs()
+        )
+        self.view.setup(request)
+        self.view.prefix = self.view.get_prefix(request)
+        self.view.storage = get_storage(
+            self.view.storage_name, self.view.prefix, request
+        )
+        self.view.steps = StepsHelper(self.view)
+
+        tournament = Tournament.objects.create(
+            name="Test Tournament",
+            host=School.objects.create(name="Test School"),
+            date=date(2024, 1, 1),
+            season="2024",
+        )
+        self.view.storage.set_step_data("0", {"0-tournament": [str(tournament.id)]})
+
+    def test_stored_export_is_reused(self):
+        """Test re-validating the stored step doesn't fetch the export again"""
+        data = MultiValueDict(
+            {"1-url": ["http://test.nu-tab.com"], "response": [self.content]}
+        )
+
+        with patch.object(TournamentImportForm, "get_response") as get_response:
+            form = self.view.get_form(step="1", data=data)
+            self.assertTrue(form.is_valid())
+
+        get_response.assert_not_called()
+        self.assertEqual(form.cleaned_data["response"], self.content)
+
+    def test_submitted_url_is_fetched(self):
+        """Test submitting the URL fetches and validates the export"""
+        with patch.object(
+            TournamentImportForm, "get_response", return_value=self.content
+        ) as get_response:
+            form = self.view.get_form(step="1", data=self.view.request.POST)
+            self.assertTrue(form.is_valid())
+
+        get_response.assert_called_once_with("http://test.nu-tab.com")
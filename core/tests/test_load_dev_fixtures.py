@@ -0,0 +1,95 @@
+"""
+Tests for bulk loading development fixtures
+"""
+
+
+import os
+import tempfile
+from io import StringIO
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from core.models import Debater, School, Team
+from core.utils.team import get_or_create_team_for_debaters
+
+
+class LoadDevFixturesTest(TestCase):
+    """Test fixtures are loaded with bulk inserts"""
+
+    def setUp(self):
+        self.school = School.objects.create(name="Test School")
+        self.debaters = [
+            Debater.objects.create(
+                first_name=f"Debater{i}", last_name="Last", school=self.school
+            )
+            for i in range(30)
+        ]
+        self.team = get_or_create_team_for_debaters(*self.debaters[:2])
+
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.fixture = os.path.join(directory.name, "fixture.json.gz")
+        call_command("create_dev_fixtures", "--output", self.fixture, stdout=StringIO())
+
+    def load(self, *args):
+        out = StringIO()
+        with CaptureQueriesContext(connection) as queries:
+            call_command("load_dev_fixtures", self.fixture, *args, stdout=out)
+        return out.getvalue(), queries
+
+    def test_load_into_empty_tables(self):
+        """Test deleted rows come back along with team memberships"""
+        Team.objects.all().delete()
+        Debater.objects.all().delete()
+        School.objects.all().delete()
+
+        out, queries = self.load("--skip-index")
+
+        self.assertIn("Loaded Debater: 30 created, 0 updated", out)
+        self.assertEqual(Debater.objects.count(), 30)
+        self.assertEqual(
+            set(Team.objects.get(pk=self.team.pk).debaters.all()),
+            set(self.debaters[:2]),
+        )
+        self.assertLess(
+            sum('INSERT INTO "core_debater"' in query["sql"] for query in queries),
+            30,
+        )
+
+        School.objects.create(name="New School")
+
+    def test_cache_is_kept(self):
+        """Test loading leaves unrelated cache entries alone"""
+        cache.set("unrelated", "value")
+
+        self.load("--skip-index")
+
+        self.assertEqual(cache.get("unrelated"), "value")
+
+    def test_versions_are_bumped(self):
+        """Test loaded models' scopes are bumped since no signals fired"""
+        with mock.patch(
+            "core.management.commands.load_dev_fixtures.bump_versions"
+        ) as bump_versions:
+            self.load("--skip-index")
+
+        scopes = bump_versions.call_args[0][0]
+        self.assertIn("core.debater", scopes)
+        self.assertIn("core.school", scopes)
+
+    def test_existing_rows_are_updated(self):
+        """Test rows already in the database are updated in place"""
+        Debater.objects.filter(pk=self.debaters[0].pk).update(first_name="Changed")
+
+        out, _ = self.load()
+
+        self.assertIn("Loaded Debater: 0 created, 30 updated", out)
+        self.assertIn("Rebuilding search index", out)
+        self.assertEqual(
+            Debater.objects.get(pk=self.debaters[0].pk).first_name, "Debater0"
+        )
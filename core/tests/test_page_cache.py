@@ -0,0 +1,250 @@
+"""
+Tests for the anonymous page cache and version tokens
+"""
+
+
+from datetime import date
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.db import connection
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, modify_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from core.middleware import AnonymousPageCacheMiddleware
+from core.models import TOTY, Debater, Round, RoundStats, School, Team, TeamResult
+from core.models.tournament import Tournament
+from core.utils.page_cache import get_page_cache_key
+from core.utils.team import get_or_create_team_for_debaters
+from core.views.debater_views import DebaterDetailView
+from core.utils.versions import (
+    bump_tournament_versions,
+    get_changed_scopes,
+    get_dependent_scopes,
+    get_versions,
+    object_scope,
+    season_scope,
+)
+
+
+@modify_settings(
+    MIDDLEWARE={"prepend": "core.middleware.AnonymousPageCacheMiddleware"}
+)
+class PageCacheTest(TestCase):
+    """Test public pages are cached for anonymous visitors"""
+
+    def setUp(self):
+        cache.clear()
+        self.school = School.objects.create(name="Test School")
+        self.tournament = Tournament.objects.create(
+            name="Test Tournament",
+            host=self.school,
+            date=date(2024, 1, 1),
+            season="2024",
+        )
+        self.debaters = [
+            Debater.objects.create(
+                first_name=f"Debater{i}", last_name="Last", school=self.school
+            )
+            for i in range(2)
+        ]
+        self.team = get_or_create_team_for_debaters(*self.debaters)
+
+    def get(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+
+        return response, len(queries)
+
+    def test_hits_skip_queries(self):
+        """Test a cached standings page runs no queries"""
+        url = reverse("core:toty") + "?season=2024"
+        first, num_queries = self.get(url)
+        second, cached_queries = self.get(url)
+
+        self.assertGreater(num_queries, 0)
+        self.assertEqual(cached_queries, 0)
+        self.assertEqual(first.content, second.content)
+
+    def test_standings_change_bumps_season(self):
+        """Test saving a standing serves a fresh standings page"""
+        url = reverse("core:toty") + "?season=2024"
+        self.get(url)
+        self.get(reverse("core:toty") + "?season=2023")
+
+        TOTY.objects.create(season="2024", team=self.team, points=12, place=1)
+
+        response, num_queries = self.get(url)
+        self.assertGreater(num_queries, 0)
+        self.assertContains(response, self.team.name)
+
+        _, num_queries = self.get(reverse("core:toty") + "?season=2023")
+        self.assertEqual(num_queries, 0)
+
+    def test_detail_pages_follow_results(self):
+        """Test team and debater pages refresh when the team gets a result"""
+        team_url = reverse("core:team_detail", kwargs={"pk": self.team.pk})
+        debater_url = reverse("core:debater_detail", kwargs={"pk": self.debaters[0].pk})
+
+        self.get(team_url)
+        self.get(debater_url)
+        _, num_queries = self.get(debater_url)
+        self.assertEqual(num_queries, 1)
+
+        TeamResult.objects.create(tournament=self.tournament, team=self.team, place=1)
+
+        response, num_queries = self.get(team_url)
+        self.assertGreater(num_queries, 1)
+        self.assertContains(response, self.tournament.name)
+
+        _, num_queries = self.get(debater_url)
+        self.assertGreater(num_queries, 1)
+
+    def test_bulk_writes_bump_versions(self):
+        """Test results written in bulk still invalidate cached pages"""
+        url = reverse("core:team_detail", kwargs={"pk": self.team.pk})
+        self.get(url)
+
+        TeamResult.objects.bulk_create(
+            [TeamResult(tournament=self.tournament, team=self.team, place=1)]
+        )
+        bump_tournament_versions(self.tournament, team_ids=[self.team.id])
+
+        response, _ = self.get(url)
+        self.assertContains(response, self.tournament.name)
+
+    def test_unrelated_saves_keep_lists(self):
+        """Test a list page is only invalidated by the models it shows"""
+        url = reverse("core:school_list")
+        self.get(url)
+
+        get_user_model().objects.create_user("visitor")
+        _, num_queries = self.get(url)
+        self.assertEqual(num_queries, 0)
+
+        School.objects.create(name="Other School")
+        response, num_queries = self.get(url)
+        self.assertGreater(num_queries, 0)
+        self.assertContains(response, "Other School")
+
+    def test_keys_stay_short(self):
+        """Test pages depending on many scopes still get a memcached-safe key"""
+        for i in range(20):
+            get_or_create_team_for_debaters(
+                self.debaters[0],
+                Debater.objects.create(
+                    first_name=f"Partner{i}", last_name="Last", school=self.school
+                ),
+            )
+        request = RequestFactory().get(
+            reverse("core:debater_detail", kwargs={"pk": self.debaters[0].pk})
+        )
+        request.user = AnonymousUser()
+
+        view = DebaterDetailView.as_view()
+        kwargs = {"pk": self.debaters[0].pk}
+        key = get_page_cache_key(request, view, kwargs)
+
+        self.assertLess(len(key), 250)
+
+        bump_tournament_versions(self.tournament, team_ids=[self.team.id])
+        del request.page_cache_scopes
+        self.assertNotEqual(get_page_cache_key(request, view, kwargs), key)
+
+    def test_csrf_pages_skip_cache(self):
+        """Test a page that handed out a CSRF token is not shared"""
+
+        def get_response(request):
+            request.META["CSRF_COOKIE_USED"] = True
+            return HttpResponse("form")
+
+        request = RequestFactory().get("/")
+        request.page_cache_key = "page:csrf"
+        AnonymousPageCacheMiddleware(get_response)(request)
+
+        self.assertIsNone(cache.get("page:csrf"))
+
+    def test_logged_in_users_skip_cache(self):
+        """Test authenticated visitors always get a rendered page"""
+        url = reverse("core:toty") + "?season=2024"
+        self.get(url)
+
+        self.client.force_login(get_user_model().objects.create_superuser("admin", "", "pass"))
+        _, num_queries = self.get(url)
+
+        self.assertGreater(num_queries, 0)
+
+
+class VersionScopesTest(TestCase):
+    """Test which scopes a write invalidates"""
+
+    def test_changed_scopes(self):
+        """Test a row bumps itself, its season and the rows it references"""
+        school = School.objects.create(name="Test School")
+        tournament = Tournament.objects.create(
+            name="Test Tournament", host=school, date=date(2024, 1, 1), season="2024"
+        )
+        team = Team.objects.create(name="Test Team")
+        result = TeamResult(id=5, tournament=tournament, team=team, place=1)
+
+        with CaptureQueriesContext(connection) as queries:
+            scopes = get_changed_scopes(result)
+
+        self.assertEqual(len(queries), 0)
+        self.assertIn(object_scope(TeamResult, 5), scopes)
+        self.assertIn(object_scope(Team, team.id), scopes)
+        self.assertIn(object_scope(Tournament, tournament.id), scopes)
+        self.assertIn(season_scope("2024"), get_changed_scopes(tournament))
+
+    def test_dependent_scopes(self):
+        """Test speaks and renames bump the pages that show them"""
+        school = School.objects.create(name="Test School")
+        tournament = Tournament.objects.create(
+            name="Test Tournament", host=school, date=date(2024, 1, 1), season="2024"
+        )
+        debaters = [
+            Debater.objects.create(
+                first_name=f"Debater{i}", last_name=f"Last{i}", school=school
+            )
+            for i in range(4)
+        ]
+        gov = get_or_create_team_for_debaters(*debaters[:2])
+        opp = get_or_create_team_for_debaters(*debaters[2:])
+        round_obj = Round.objects.create(
+            tournament=tournament, round_number=1, gov=gov, opp=opp, victor=Round.GOV
+        )
+        stats = RoundStats.objects.create(
+            round=round_obj, debater=debaters[0], debater_role="pm", speaks=26, ranks=1
+        )
+
+        self.assertEqual(
+            get_dependent_scopes(stats),
+            {
+                object_scope(Tournament, tournament.id),
+                object_scope(Team, gov.id),
+                object_scope(Team, opp.id),
+            },
+        )
+
+        (tournament_token,) = get_versions([object_scope(Tournament, tournament.id)])
+        debaters[0].last_name = "Renamed"
+        debaters[0].save()
+
+        self.assertNotEqual(
+            get_versions([object_scope(Tournament, tournament.id)]),
+            [tournament_token],
+        )
+
+    def test_tokens_are_stable_until_bumped(self):
+        """Test a scope keeps its token until something changes"""
+        cache.clear()
+        (token,) = get_versions(["season:1999"])
+
+        self.assertEqual(get_versions(["season:1999"]), [token])
+
+        School.objects.create(name="Other School")
+
+        self.assertEqual(get_versions(["season:1999"]), [token])
@@ -0,0 +1,140 @@
+"""
+Tests for keyset pagination and cached list counts
+"""
+
+
+from django.core.cache import cache
+from django.core.paginator import EmptyPage, PageNotAnInteger
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from core.models import Debater, School
+from core.utils.pagination import CachedCountPaginator, KeysetPage, encode_cursor
+
+
+class KeysetPageTest(TestCase):
+    """Test walking a queryset with cursors"""
+
+    def setUp(self):
+        school = School.objects.create(name="Test School")
+        self.debaters = [
+            Debater.objects.create(
+                first_name=f"Debater{i}", last_name="Last", school=school
+            )
+            for i in range(7)
+        ][::-1]
+
+    def test_walk_forward_and_back(self):
+        """Test next and previous cursors cover every row once"""
+        queryset = Debater.objects.all()
+
+        first = KeysetPage(queryset, 3, count=7)
+        second = KeysetPage(queryset, 3, cursor=first.next_cursor)
+        third = KeysetPage(queryset, 3, cursor=second.next_cursor)
+        back = KeysetPage(queryset, 3, cursor=third.previous_cursor)
+
+        self.assertEqual(first.object_list, self.debaters[:3])
+        self.assertEqual(second.object_list, self.debaters[3:6])
+        self.assertEqual(third.object_list, self.debaters[6:])
+        self.assertEqual(back.object_list, second.object_list)
+
+        self.assertEqual((first.number, second.number, third.number), (1, 2, 3))
+        self.assertEqual(first.num_pages, 3)
+        self.assertFalse(first.has_previous)
+        self.assertFalse(third.has_next)
+        self.assertIsNone(third.next_cursor)
+        self.assertTrue(back.has_previous and back.has_next)
+
+    def test_bad_cursors(self):
+        """Test tampered or stale cursors fall back to the first page"""
+        queryset = Debater.objects.all()
+
+        tampered = KeysetPage(queryset, 3, cursor="not-a-cursor")
+        stale = KeysetPage(
+            queryset, 3, cursor=encode_cursor(self.debaters[-1].pk, "next", 4)
+        )
+
+        self.assertEqual(tampered.object_list, self.debaters[:3])
+        self.assertEqual(stale.object_list, self.debaters[:3])
+        self.assertEqual(stale.number, 1)
+
+
+class ListPaginationTest(TestCase):
+    """Test list views page by cursor and reuse counts"""
+
+    def setUp(self):
+        cache.clear()
+        school = School.objects.create(name="Test School")
+        Debater.objects.bulk_create(
+            Debater(first_name=f"Debater{i}", last_name="Last", school=school)
+            for i in range(80)
+        )
+
+    def test_deep_pages_cost_the_same(self):
+        """Test a deep page runs the same queries as the first"""
+        url = reverse("core:debater_list")
+        self.client.get(url)
+
+        with CaptureQueriesContext(connection) as first:
+            response = self.client.get(url)
+
+        for _ in range(3):
+            cursor = response.context["table"].keyset_page.next_cursor
+            response = self.client.get(url, {"cursor": cursor})
+
+        with CaptureQueriesContext(connection) as deep:
+            self.client.get(url, {"cursor": cursor})
+
+        page = response.context["table"].keyset_page
+        self.assertEqual((page.number, page.num_pages), (4, 4))
+        self.assertEqual(len(page.object_list), 5)
+        self.assertEqual(len(deep), len(first))
+        self.assertFalse(
+            any("OFFSET" in query["sql"] for query in deep.captured_queries)
+        )
+
+    def test_counts_are_cached_per_filter(self):
+        """Test counts are reused until the filters or the data change"""
+        url = reverse("core:debater_list")
+
+        def count_queries(params):
+            with CaptureQueriesContext(connection) as queries:
+                self.client.get(url, params)
+            return sum("COUNT(" in query["sql"] for query in queries)
+
+        self.assertEqual(count_queries({"first_name__icontains": "1"}), 1)
+        self.assertEqual(count_queries({"first_name__icontains": "1"}), 0)
+        self.assertEqual(count_queries({"first_name__icontains": "2"}), 1)
+
+        Debater.objects.first().save()
+
+        self.assertEqual(count_queries({"first_name__icontains": "1"}), 1)
+
+    def test_sorted_lists_use_pages(self):
+        """Test sorting by a column falls back to numbered pages"""
+        response = self.client.get(
+            reverse("core:debater_list"), {"sort": "first_name", "page": 2}
+        )
+
+        table = response.context["table"]
+        self.assertIsNone(table.keyset_page)
+        self.assertEqual(table.page.number, 2)
+        self.assertEqual(table.paginator.num_pages, 4)
+
+    def test_stale_counts_do_not_hide_pages(self):
+        """Test pages past a stale cached count are still served"""
+        cache.set("count:stale", 5)
+        paginator = CachedCountPaginator(
+            Debater.objects.order_by("pk"), 25, count_key="count:stale"
+        )
+
+        self.assertEqual(paginator.num_pages, 1)
+        self.assertEqual(len(paginator.page(3).object_list), 25)
+        self.assertEqual(len(paginator.page(4).object_list), 5)
+
+        with self.assertRaises(EmptyPage):
+            paginator.page(5)
+        with self.assertRaises(PageNotAnInteger):
+            paginator.page("last")
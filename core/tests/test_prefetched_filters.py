@@ -0,0 +1,117 @@
+"""
+Tests for template filters reading prefetched relations
+"""
+
+
+from datetime import date
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from core.models import Debater, QualPoints, Round, School, Team
+from core.models.standings.qual import QUAL
+from core.models.tournament import Tournament
+from core.templatetags.tags import opponent, partner_name, qual_display, school, wl
+from core.utils.rankings import get_relevant_debaters
+from core.utils.team import get_or_create_team_for_debaters
+
+
+class PrefetchedFiltersTest(TestCase):
+    """Test filters avoid queries when relations are prefetched"""
+
+    def setUp(self):
+        self.school = School.objects.create(name="Test School")
+        self.tournament = Tournament.objects.create(
+            name="Test Tournament",
+            host=self.school,
+            date=date(2024, 1, 1),
+            season="2024",
+        )
+
+    def add_debater(self, index, qual_type=None):
+        debater = Debater.objects.create(
+            first_name=f"Debater{index}", last_name=f"Last{index}", school=self.school
+        )
+        QualPoints.objects.create(debater=debater, points=index + 1, season="2024")
+
+        if qual_type is not None:
+            QUAL.objects.create(
+                tournament=self.tournament,
+                debater=debater,
+                season="2024",
+                qual_type=qual_type,
+            )
+
+        return debater
+
+    def test_filters_use_prefetched_relations(self):
+        """Test filters read prefetched rows without querying"""
+        first = self.add_debater(0, QUAL.YALE)
+        second = self.add_debater(1)
+        team = get_or_create_team_for_debaters(first, second)
+        other = get_or_create_team_for_debaters(
+            self.add_debater(2), self.add_debater(3)
+        )
+        round_obj = Round.objects.create(
+            tournament=self.tournament,
+            round_number=1,
+            gov=team,
+            opp=other,
+            victor=Round.GOV,
+        )
+
+        debater = Debater.objects.prefetch_related("quals").get(id=first.id)
+        team = Team.objects.prefetch_related("debaters__school").get(id=team.id)
+        round_obj = Round.objects.select_related("gov", "opp").get(id=round_obj.id)
+
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(qual_display(debater, "2024"), "Yale IV")
+            self.assertEqual(qual_display(debater, "2023"), "")
+            self.assertIn(second.name, partner_name(team, first))
+            self.assertIn("Test School", school(team))
+            self.assertEqual(wl(round_obj, team), "W")
+            self.assertEqual(opponent(round_obj, team), other)
+
+        self.assertEqual(len(queries), 0)
+
+    def test_relevant_debaters_query_count(self):
+        """Test the school qual table does not query per debater"""
+        self.add_debater(0, QUAL.YALE)
+
+        with CaptureQueriesContext(connection) as small:
+            for qual_point in get_relevant_debaters(self.school, "2024"):
+                self.assertTrue(qual_point.qualled)
+                qual_display(qual_point.debater, "2024")
+
+        for index in range(1, 6):
+            self.add_debater(index, QUAL.BRANDEIS if index % 2 else None)
+
+        with CaptureQueriesContext(connection) as large:
+            qual_points = get_relevant_debaters(self.school, "2024")
+            qualled = [qual_point.qualled for qual_point in qual_points]
+            displays = [
+                qual_display(qual_point.debater, "2024") for qual_point in qual_points
+            ]
+
+        self.assertEqual(qualled, [True, False, True, False, True, True])
+        self.assertEqual(displays[-1], "Yale IV")
+        self.assertEqual(len(large), len(small))
+
+    def test_school_detail_view(self):
+        """Test the school page renders quals from prefetched rows"""
+        self.add_debater(0, QUAL.YALE)
+        url = reverse("core:school_detail", kwargs={"pk": self.school.pk})
+
+        with CaptureQueriesContext(connection) as small:
+            self.client.get(url + "?season=2024")
+
+        for index in range(1, 6):
+            self.add_debater(index, QUAL.BRANDEIS)
+
+        with CaptureQueriesContext(connection) as large:
+            response = self.client.get(url + "?season=2024")
+
+        self.assertContains(response, "Brandeis IV", count=5)
+        self.assertEqual(len(large), len(small))
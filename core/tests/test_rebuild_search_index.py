@@ -0,0 +1,93 @@
+"""
+Tests for the chunked search index rebuild
+"""
+
+
+from datetime import datetime
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+
+from core.models import Debater, School
+
+
+@mock.patch("haystack.backends.simple_backend.SimpleSearchBackend.clear")
+@mock.patch("haystack.backends.simple_backend.SimpleSearchBackend.update")
+class RebuildSearchIndexTest(TestCase):
+    """Test documents are rendered in chunks and committed in batches"""
+
+    def setUp(self):
+        school = School.objects.create(name="Test School")
+        self.debaters = [
+            Debater.objects.create(
+                first_name=f"Debater{i}", last_name="Last", school=school
+            )
+            for i in range(12)
+        ]
+
+    def rebuild(self, *args):
+        out = StringIO()
+        call_command(
+            "rebuild_search_index", "--chunk-size", "5", *args, stdout=out
+        )
+        return out.getvalue()
+
+    def get_debater_updates(self, update):
+        return [
+            call[0][1]
+            for call in update.call_args_list
+            if call[0][0].get_model() is Debater
+        ]
+
+    def get_documents(self, update):
+        return [
+            document
+            for documents in self.get_debater_updates(update)
+            for document in documents
+        ]
+
+    def test_full_rebuild(self, update, clear):
+        """Test every debater is rendered and committed in batches"""
+        out = self.rebuild("--workers", "1", "--batch-size", "10")
+
+        clear.assert_called_once()
+        self.assertEqual(len(self.get_debater_updates(update)), 2)
+        documents = self.get_documents(update)
+        self.assertEqual(
+            sorted(document["django_id"] for document in documents),
+            sorted(str(debater.id) for debater in self.debaters),
+        )
+        self.assertIn("Debater0 Last", documents[0]["text"])
+        self.assertIn("Test School", documents[0]["text"])
+        self.assertIn("Indexed 12 debaters", out)
+
+    def test_worker_pool(self, update, clear):
+        """Test documents rendered by workers match in-process rendering"""
+        self.rebuild("--workers", "1")
+        expected = self.get_documents(update)
+        update.reset_mock()
+
+        self.rebuild("--workers", "2")
+
+        self.assertEqual(self.get_documents(update), expected)
+
+    def test_since(self, update, clear):
+        """Test --since only reindexes recently updated debaters"""
+        Debater.objects.update(updated_at=datetime(2020, 1, 1))
+        self.debaters[3].save()
+
+        out = self.rebuild("--workers", "1", "--since", "2021-01-01")
+
+        clear.assert_not_called()
+        self.assertEqual(
+            [document["django_id"] for document in self.get_documents(update)],
+            [str(self.debaters[3].id)],
+        )
+        self.assertIn("Indexed 1 debaters", out)
+        self.assertIn("Schools have no updated field, reindexing all of them", out)
+
+        with self.assertRaises(CommandError):
+            self.rebuild("--since", "yesterday")
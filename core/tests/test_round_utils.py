@@ -0,0 +1,176 @@
+"""
+Tests for batched round utilities
+"""
+
+
+from datetime import date
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from core.models import Debater, Round, RoundStats, School
+from core.models.tournament import Tournament
+from core.utils.rounds import get_record, get_records, get_tab_cards
+from core.utils.team import get_or_create_team_for_debaters
+
+
+class RoundUtilsTestCase(TestCase):
+    def setUp(self):
+        self.school = School.objects.create(name="Test School")
+        self.tournament = Tournament.objects.create(
+            name="Test Tournament",
+            host=self.school,
+            date=date(2024, 1, 1),
+            season="2024",
+            num_rounds=3,
+        )
+        self.other_tournament = Tournament.objects.create(
+            name="Other Tournament",
+            host=self.school,
+            date=date(2024, 2, 1),
+            season="2024",
+        )
+        self.debaters = [
+            Debater.objects.create(
+                first_name=f"Debater{i}", last_name=f"Last{i}", school=self.school
+            )
+            for i in range(6)
+        ]
+        self.teams = [
+            get_or_create_team_for_debaters(self.debaters[i], self.debaters[i + 1])
+            for i in range(0, 6, 2)
+        ]
+
+    def add_round(self, round_number, gov, opp, victor, **kwargs):
+        round_obj = Round.objects.create(
+            **{"tournament": self.tournament, **kwargs},
+            round_number=round_number,
+            gov=gov,
+            opp=opp,
+            victor=victor,
+        )
+
+        for debater, role in zip(
+            list(gov.debaters.order_by("id")) + list(opp.debaters.order_by("id")),
+            ("pm", "mg", "lo", "mo"),
+        ):
+            RoundStats.objects.create(
+                round=round_obj,
+                debater=debater,
+                debater_role=role,
+                speaks=26,
+                ranks=2,
+            )
+
+        return round_obj
+
+
+class TabCardsTest(RoundUtilsTestCase):
+    """Test tab cards are built for a whole tournament at once"""
+
+    def test_tab_cards(self):
+        """Test each team gets its rounds and speaker stats in order"""
+        second = self.add_round(2, self.teams[1], self.teams[0], Round.OPP)
+        first = self.add_round(1, self.teams[0], self.teams[2], Round.GOV)
+        self.add_round(
+            1, self.teams[0], self.teams[1], Round.GOV, tournament=self.other_tournament
+        )
+
+        tab_cards = get_tab_cards(self.tournament)
+
+        self.assertEqual(set(tab_cards), {team.id for team in self.teams})
+        self.assertEqual(
+            [card["round"] for card in tab_cards[self.teams[0].id]], [first, second]
+        )
+        self.assertEqual(
+            [stat.debater for stat in tab_cards[self.teams[0].id][1]["stats"]],
+            self.debaters[:2],
+        )
+        self.assertEqual(tab_cards[self.teams[0].id][1]["stats"][0].debater_role, "lo")
+
+    def test_tab_cards_query_count(self):
+        """Test the number of queries does not grow with rounds"""
+        for round_number in range(1, 4):
+            self.add_round(round_number, self.teams[0], self.teams[1], Round.GOV)
+            self.add_round(round_number, self.teams[2], self.teams[1], Round.OPP)
+
+        with CaptureQueriesContext(connection) as queries:
+            names = [
+                (card["round"].gov.name, [stat.debater.name for stat in card["stats"]])
+                for tab_card in get_tab_cards(self.tournament).values()
+                for card in tab_card
+            ]
+
+        self.assertEqual(len(names), 12)
+        self.assertEqual(len(queries), 3)
+
+    def test_no_rounds(self):
+        """Test tournaments without rounds have no tab cards"""
+        self.assertEqual(get_tab_cards(self.tournament), {})
+
+    def test_detail_view(self):
+        """Test the tournament page renders every tab card"""
+        self.add_round(1, self.teams[0], self.teams[1], Round.GOV)
+        self.add_round(2, self.teams[2], self.teams[0], Round.OPP)
+
+        response = self.client.get(
+            reverse("core:tournament_detail", kwargs={"pk": self.tournament.pk})
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([team for team, _ in response.context["teams"]], self.teams)
+        self.assertTrue(response.context["tab_cards_available"])
+
+
+class RecordsTest(RoundUtilsTestCase):
+    """Test records are computed for every team in one pass"""
+
+    def setUp(self):
+        super().setUp()
+        self.add_round(1, self.teams[0], self.teams[1], Round.GOV)
+        self.add_round(2, self.teams[1], self.teams[0], Round.OPP_VIA_FORFEIT)
+        self.add_round(3, self.teams[2], self.teams[0], Round.ALL_WIN)
+        self.add_round(
+            1, self.teams[0], self.teams[2], Round.OPP, tournament=self.other_tournament
+        )
+
+    def test_tournament_records(self):
+        """Test every team's record at a tournament"""
+        with CaptureQueriesContext(connection) as queries:
+            records = get_records(self.tournament)
+
+        self.assertEqual(len(queries), 1)
+        self.assertEqual(
+            records,
+            {
+                self.teams[0].id: (3, 0),
+                self.teams[1].id: (0, 3),
+                self.teams[2].id: (1, 2),
+            },
+        )
+
+    def test_season_records(self):
+        """Test records are summed across a season's tournaments"""
+        records = get_records(season="2024")
+
+        self.assertEqual(records[self.teams[0].id], (3, 5))
+        self.assertEqual(records[self.teams[2].id], (2, 6))
+
+    def test_records_by_tournament(self):
+        """Test records can be kept separate per tournament"""
+        records = get_records(teams=[self.teams[2]], by_tournament=True)
+
+        self.assertEqual(
+            records,
+            {
+                (self.teams[2].id, self.tournament.id): (1, 2),
+                (self.teams[2].id, self.other_tournament.id): (1, 4),
+            },
+        )
+
+    def test_get_record(self):
+        """Test the single team record keeps its display format"""
+        self.assertEqual(get_record(self.tournament, self.teams[1]), "0 - 3")
+        self.assertEqual(get_record(self.other_tournament, self.teams[1]), "")
@@ -0,0 +1,247 @@
+"""
+Tests for the team, school and tournament search indexes and autocompletes
+"""
+
+
+import tempfile
+from datetime import date
+from unittest import mock
+
+import haystack
+from django.apps import apps
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from core.models import Debater, School, Team, TeamResult
+from core.models.tournament import Tournament
+from core.search_indexes import DebaterIndex, SchoolIndex, TeamIndex, TournamentIndex
+from core.search_signals import QueuedSignalProcessor
+from core.utils.team import get_or_create_team_for_debaters, get_or_create_teams
+
+
+class SearchAutocompleteTest(TestCase):
+    """Test autocompletes are answered from the search index"""
+
+    def setUp(self):
+        self.school = School.objects.create(name="Zebra College")
+        self.debaters = [
+            Debater.objects.create(
+                first_name=name, last_name="Quagga", school=self.school
+            )
+            for name in ("Ada", "Grace")
+        ]
+        self.team = get_or_create_team_for_debaters(*self.debaters)
+        self.tournaments = [
+            Tournament.objects.create(
+                name="Zebra Invitational",
+                host=self.school,
+                date=date(2024, 1, 1),
+                season="2024",
+            ),
+            Tournament.objects.create(
+                name="Zebra Round Robin",
+                host=self.school,
+                date=date(2024, 2, 1),
+                season="2024",
+            ),
+        ]
+
+    def test_index_fields(self):
+        """Test teams are found by their debaters and labelled for display"""
+        index = TeamIndex()
+
+        self.assertIn("Ada Quagga", index.prepare_name_auto(self.team))
+        self.assertEqual(
+            index.prepare_label(self.team),
+            f"{self.team.name} (Ada Quagga, Grace Quagga)",
+        )
+        self.assertEqual(
+            TournamentIndex().prepare_label(self.tournaments[0]),
+            f"{self.tournaments[0].name} (2024-25)",
+        )
+
+    def test_team_autocomplete(self):
+        """Test team labels don't query debaters per row"""
+        other = get_or_create_team_for_debaters(
+            *[
+                Debater.objects.create(
+                    first_name=name, last_name="Okapi", school=self.school
+                )
+                for name in ("Alan", "Edsger")
+            ]
+        )
+        url = reverse("core:team_autocomplete")
+
+        with CaptureQueriesContext(connection) as queries:
+            results = self.client.get(url, {"q": "Zebra"}).json()["results"]
+
+        self.assertEqual(
+            {int(result["id"]) for result in results}, {self.team.id, other.id}
+        )
+        self.assertLessEqual(len(queries), 4)
+
+    def test_tournament_autocomplete(self):
+        """Test tournaments with results are left out"""
+        TeamResult.objects.create(
+            tournament=self.tournaments[0], team=self.team, place=1
+        )
+
+        results = self.client.get(
+            reverse("core:tournament_autocomplete"), {"q": "Zebra"}
+        ).json()["results"]
+
+        self.assertEqual(
+            [int(result["id"]) for result in results], [self.tournaments[1].id]
+        )
+
+    def test_tournament_autocomplete_skips_imported(self):
+        """Test tournaments with results don't crowd out ones to import"""
+        Tournament.objects.bulk_create(
+            [
+                Tournament(
+                    name=f"Zebra Open {i}",
+                    host=self.school,
+                    date=date(2023, 1, 1),
+                    season="2023",
+                )
+                for i in range(30)
+            ]
+        )
+        TeamResult.objects.bulk_create(
+            [
+                TeamResult(tournament=tournament, team=self.team, place=1)
+                for tournament in Tournament.objects.exclude(
+                    id=self.tournaments[1].id
+                )
+            ]
+        )
+
+        response = self.client.get(
+            reverse("core:tournament_autocomplete"), {"q": "Zebra"}
+        ).json()
+
+        self.assertEqual(
+            [int(result["id"]) for result in response["results"]],
+            [self.tournaments[1].id],
+        )
+        self.assertFalse(response["pagination"]["more"])
+
+    @mock.patch("haystack.backends.simple_backend.SimpleSearchBackend.update")
+    def test_bulk_created_teams_are_indexed(self, update):
+        """Test teams made by get_or_create_teams are queued for the index"""
+        processor = QueuedSignalProcessor(
+            haystack.connections, haystack.connection_router
+        )
+        self.addCleanup(processor.teardown)
+        debaters = [
+            Debater.objects.create(
+                first_name=name, last_name="Okapi", school=self.school
+            )
+            for name in ("Alan", "Edsger")
+        ]
+        processor.flush()
+        update.reset_mock()
+
+        with mock.patch.object(
+            apps.get_app_config("haystack"), "signal_processor", processor
+        ):
+            team = next(iter(get_or_create_teams([debaters]).values()))
+        processor.flush()
+
+        indexed = [
+            obj
+            for call in update.call_args_list
+            if call[0][0].get_model() is Team
+            for obj in call[0][1]
+        ]
+        self.assertEqual(indexed, [team])
+
+        results = self.client.get(
+            reverse("core:team_autocomplete"), {"q": team.name}
+        ).json()["results"]
+        self.assertIn(team.id, [int(result["id"]) for result in results])
+
+    def test_autocomplete_pages(self):
+        """Test Select2 can page past the first batch of index hits"""
+        School.objects.bulk_create(
+            [School(name=f"Zebra School {i}") for i in range(60)]
+        )
+        url = reverse("core:school_autocomplete")
+
+        found = []
+        page = 1
+        while True:
+            response = self.client.get(url, {"q": "Zebra", "page": page}).json()
+            found += [int(result["id"]) for result in response["results"]]
+            if not response["pagination"]["more"]:
+                break
+            page += 1
+
+        self.assertEqual(
+            sorted(found),
+            sorted(
+                School.objects.filter(name__startswith="Zebra").values_list(
+                    "id", flat=True
+                )
+            ),
+        )
+
+
+class UnifiedAutocompleteTest(TestCase):
+    """Test the unified endpoint answers from fields stored in the index"""
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.addCleanup(haystack.connections.reload, "default")
+        patcher = mock.patch.dict(
+            haystack.connections.connections_info,
+            {
+                "default": {
+                    "ENGINE": "haystack.backends.whoosh_backend.WhooshEngine",
+                    "PATH": directory.name,
+                }
+            },
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        haystack.connections.reload("default")
+
+        self.school = School.objects.create(name="Zebra College")
+        debaters = [
+            Debater.objects.create(
+                first_name=name, last_name="Quagga", school=self.school
+            )
+            for name in ("Ada", "Grace")
+        ]
+        get_or_create_team_for_debaters(*debaters)
+        Tournament.objects.create(
+            name="Zebra Invitational",
+            host=self.school,
+            date=date(2024, 1, 1),
+            season="2024",
+        )
+
+        for index in (DebaterIndex(), SchoolIndex(), TeamIndex(), TournamentIndex()):
+            index.update()
+
+    def test_unified_autocomplete(self):
+        """Test one endpoint searches every indexed model without the database"""
+        url = reverse("core:search_autocomplete")
+
+        with self.assertNumQueries(0):
+            results = self.client.get(url, {"q": "Zebra"}).json()["results"]
+        types = {result["type"] for result in results}
+
+        self.assertEqual(types, {"school", "team", "tournament"})
+        school = next(result for result in results if result["type"] == "school")
+        self.assertEqual(school["id"], self.school.id)
+        self.assertEqual(school["text"], "Zebra College")
+        self.assertEqual(school["url"], self.school.get_absolute_url())
+
+        results = self.client.get(url, {"q": "Zebra", "types": "school"}).json()
+        self.assertEqual(len(results["results"]), 1)
+
+        self.assertEqual(self.client.get(url).json(), {"results": []})
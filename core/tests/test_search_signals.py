@@ -0,0 +1,144 @@
+"""
+Tests for the queued search index signal processor
+"""
+
+
+import threading
+from unittest import mock
+
+import haystack
+from django.core.signals import request_finished
+from django.test import TestCase
+
+from core.models import Debater, School, SiteSetting
+from core.search_signals import QueuedSignalProcessor
+
+
+@mock.patch("haystack.backends.simple_backend.SimpleSearchBackend.remove")
+@mock.patch("haystack.backends.simple_backend.SimpleSearchBackend.update")
+class QueuedSignalProcessorTest(TestCase):
+    """Test index changes are batched until a flush"""
+
+    def setUp(self):
+        self.processor = QueuedSignalProcessor(
+            haystack.connections, haystack.connection_router
+        )
+        self.addCleanup(self.processor.teardown)
+        self.school = School.objects.create(name="Test School")
+
+    def create_debaters(self, count):
+        return [
+            Debater.objects.create(
+                first_name=f"Debater{i}", last_name="Last", school=self.school
+            )
+            for i in range(count)
+        ]
+
+    def get_debater_updates(self, update):
+        return [
+            call[0][1]
+            for call in update.call_args_list
+            if call[0][0].get_model() is Debater
+        ]
+
+    def test_saves_are_batched(self, update, remove):
+        """Test many saves make a single index update"""
+        debaters = self.create_debaters(20)
+        debaters[0].save()
+
+        update.assert_not_called()
+
+        self.processor.flush()
+
+        updates = self.get_debater_updates(update)
+        self.assertEqual(len(updates), 1)
+        self.assertEqual(set(updates[0]), set(debaters))
+        remove.assert_not_called()
+
+        update.reset_mock()
+        self.processor.flush()
+        update.assert_not_called()
+
+    def test_deletes(self, update, remove):
+        """Test deleted objects are removed rather than updated"""
+        debater, other = self.create_debaters(2)
+        debater_id = debater.id
+        debater.delete()
+
+        self.processor.flush()
+
+        remove.assert_called_once_with(f"core.debater.{debater_id}")
+        _, queryset = update.call_args[0]
+        self.assertEqual(list(queryset), [other])
+
+    def test_unindexed_models_are_ignored(self, update, remove):
+        """Test saving a model without an index queues nothing"""
+        self.processor.flush()
+        update.reset_mock()
+
+        SiteSetting.objects.create(key="test", value="value")
+
+        self.processor.flush()
+
+        update.assert_not_called()
+
+    def test_flush_at_end_of_request(self, update, remove):
+        """Test finishing a request flushes the queue"""
+        self.create_debaters(2)
+
+        request_finished.send(sender=self.__class__)
+
+        self.assertEqual(len(self.get_debater_updates(update)), 1)
+
+    def test_other_threads_flush_at_exit(self, update, remove):
+        """Test changes queued by another thread are sent by the exit flush"""
+        debaters = self.create_debaters(2)
+        self.processor.flush()
+        update.reset_mock()
+
+        thread = threading.Thread(
+            target=lambda: [
+                self.processor.handle_save(Debater, debater) for debater in debaters
+            ]
+        )
+        thread.start()
+        thread.join()
+
+        self.processor.flush()
+        update.assert_not_called()
+
+        self.processor.flush_all()
+        updates = self.get_debater_updates(update)
+        self.assertEqual(len(updates), 1)
+        self.assertEqual(set(updates[0]), set(debaters))
+
+    def test_idle_threads_stay_registered(self, update, remove):
+        """Test a live thread's empty queue survives other threads registering"""
+        (debater,) = self.create_debaters(1)
+        self.processor.flush()
+        update.reset_mock()
+
+        registered = threading.Event()
+        resume = threading.Event()
+
+        def work():
+            self.processor.get_pending()
+            registered.set()
+            resume.wait()
+            self.processor.handle_save(Debater, debater)
+
+        thread = threading.Thread(target=work)
+        thread.start()
+        registered.wait()
+
+        other = threading.Thread(target=self.processor.get_pending)
+        other.start()
+        other.join()
+
+        resume.set()
+        thread.join()
+
+        self.processor.flush_all()
+        updates = self.get_debater_updates(update)
+        self.assertEqual(len(updates), 1)
+        self.assertEqual(list(updates[0]), [debater])
@@ -0,0 +1,114 @@
+"""
+Tests for the Parquet results snapshot
+"""
+
+
+import os
+import tempfile
+from datetime import date
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from core.models import Debater, School, TeamResult
+from core.models.tournament import Tournament
+from core.utils.snapshot import (
+    SNAPSHOT_TABLES,
+    get_season_columns,
+    get_season_state,
+    get_snapshot_seasons,
+)
+from core.utils.team import get_or_create_team_for_debaters
+
+
+class SnapshotTest(TestCase):
+    """Test snapshots only rewrite seasons that changed"""
+
+    def setUp(self):
+        self.school = School.objects.create(name="Test School")
+        debaters = [
+            Debater.objects.create(
+                first_name=f"Debater{i}", last_name="Last", school=self.school
+            )
+            for i in range(2)
+        ]
+        self.team = get_or_create_team_for_debaters(*debaters)
+        self.tournaments = {
+            season: Tournament.objects.create(
+                name=f"Tournament {season}",
+                host=self.school,
+                date=date(int(season), 1, 1),
+                season=season,
+            )
+            for season in ("2023", "2024")
+        }
+
+    def test_columns(self):
+        """Test a season's tables are denormalized into columns"""
+        TeamResult.objects.create(
+            tournament=self.tournaments["2024"], team=self.team, place=1
+        )
+
+        tables = get_season_columns("2024")
+
+        self.assertEqual(get_snapshot_seasons(), ["2023", "2024"])
+        self.assertEqual(tables["team_results"]["team"], [self.team.name])
+        self.assertEqual(
+            tables["team_results"]["tournament"], [self.tournaments["2024"].name]
+        )
+        self.assertEqual(tables["round_stats"]["id"], [])
+
+    def test_states_follow_changes(self):
+        """Test a result only changes the state of its own season"""
+        before = {season: get_season_state(season) for season in self.tournaments}
+
+        result = TeamResult.objects.create(
+            tournament=self.tournaments["2024"], team=self.team, place=1
+        )
+        after = {season: get_season_state(season) for season in self.tournaments}
+
+        self.assertEqual(before["2023"], after["2023"])
+        self.assertNotEqual(before["2024"], after["2024"])
+
+        result.place = 2
+        result.save()
+
+        self.assertNotEqual(get_season_state("2024"), after["2024"])
+
+    def test_state_skips_rows(self):
+        """Test computing a season's state only runs aggregate queries"""
+        with CaptureQueriesContext(connection) as queries:
+            get_season_state("2024")
+
+        self.assertEqual(len(queries), len(SNAPSHOT_TABLES) + 1)
+        self.assertTrue(
+            all(
+                "COUNT(" in query["sql"]
+                for query in queries.captured_queries[: len(SNAPSHOT_TABLES)]
+            )
+        )
+
+    def test_incremental_snapshot(self):
+        """Test a second run only rewrites the changed season"""
+        with tempfile.TemporaryDirectory() as directory:
+            call_command("snapshot_results", directory, stdout=StringIO())
+
+            TeamResult.objects.create(
+                tournament=self.tournaments["2024"], team=self.team, place=1
+            )
+
+            out = StringIO()
+            call_command("snapshot_results", directory, stdout=out)
+
+            self.assertIn("Unchanged 2023", out.getvalue())
+            self.assertIn("Wrote 2024", out.getvalue())
+            self.assertTrue(
+                os.path.exists(
+                    os.path.join(
+                        directory, "team_results", "season=2024", "data.parquet"
+                    )
+                )
+            )
@@ -0,0 +1,153 @@
+"""
+Tests for the JSON standings API
+"""
+
+
+import gzip
+import json
+from datetime import date
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from core.models import QUAL, SOTY, TOTY, Debater, School
+from core.models.tournament import Tournament
+from core.utils.team import get_or_create_team_for_debaters
+
+
+class StandingsApiTest(TestCase):
+    """Test reading standings as JSON"""
+
+    def setUp(self):
+        cache.clear()
+        self.school = School.objects.create(name="Test School")
+        self.tournament = Tournament.objects.create(
+            name="Test Tournament",
+            host=self.school,
+            date=date(2024, 1, 1),
+            season="2024",
+        )
+        self.debaters = [
+            Debater.objects.create(
+                first_name=f"Debater{i}", last_name="Last", school=self.school
+            )
+            for i in range(5)
+        ]
+        self.sotys = [
+            SOTY.objects.create(
+                season="2024",
+                debater=debater,
+                place=i + 1,
+                points=10 - i,
+                marker_one=10 - i,
+                tournament_one=self.tournament,
+            )
+            for i, debater in enumerate(self.debaters)
+        ]
+
+    def get(self, kind, season="2024", headers=None, **params):
+        return self.client.get(
+            reverse("core:standings_api", kwargs={"season": season, "kind": kind}),
+            params,
+            **(headers or {}),
+        )
+
+    def test_standings(self):
+        """Test a season's standings are listed in place order"""
+        data = self.get("soty").json()
+
+        self.assertEqual(data["count"], 5)
+        self.assertIsNone(data["next"])
+        self.assertEqual(
+            [row["debater_id"] for row in data["results"]],
+            [debater.id for debater in self.debaters],
+        )
+        self.assertEqual(data["results"][0]["school"], "Test School")
+        self.assertEqual(
+            data["results"][0]["markers"],
+            [
+                {
+                    "points": 10,
+                    "tournament_id": self.tournament.id,
+                    "tournament": self.tournament.name,
+                }
+            ],
+        )
+
+    def test_team_and_qual_standings(self):
+        """Test teams list their debaters and quals their type"""
+        team = get_or_create_team_for_debaters(*self.debaters[:2])
+        TOTY.objects.create(season="2024", team=team, place=1, points=5)
+        QUAL.objects.create(
+            season="2024",
+            debater=self.debaters[0],
+            qual_type=QUAL.BRANDEIS,
+            tournament=self.tournament,
+        )
+
+        (toty,) = self.get("toty").json()["results"]
+        (qual,) = self.get("qual").json()["results"]
+
+        self.assertEqual(toty["team"], team.name)
+        self.assertEqual(len(toty["debaters"]), 2)
+        self.assertEqual(qual["qual_type"], "Brandeis IV")
+        self.assertEqual(qual["tournament"], self.tournament.name)
+
+    def test_sparse_fields(self):
+        """Test only the requested fields are returned"""
+        data = self.get("soty", fields="place,debater").json()
+
+        self.assertEqual(
+            data["results"][0], {"place": 1, "debater": self.debaters[0].name}
+        )
+        self.assertEqual(self.get("soty", fields="place,team").status_code, 400)
+
+    def test_cursor_pagination(self):
+        """Test following next links walks every standing once"""
+        response = self.get("soty", limit=2)
+        seen = []
+
+        while True:
+            data = response.json()
+            seen += [row["id"] for row in data["results"]]
+
+            if not data["next"]:
+                break
+            response = self.client.get(data["next"])
+
+        self.assertEqual(seen, [soty.id for soty in self.sotys])
+        self.assertEqual(self.get("soty", cursor="bad").status_code, 400)
+        self.assertEqual(self.get("soty", limit=0).status_code, 400)
+
+    def test_payload_is_cached_until_standings_change(self):
+        """Test the payload is rebuilt only after the season changes"""
+        self.get("soty")
+
+        with CaptureQueriesContext(connection) as queries:
+            self.get("soty", fields="id", limit=1)
+        self.assertEqual(len(queries), 0)
+
+        self.sotys[0].delete()
+
+        self.assertEqual(self.get("soty").json()["count"], 4)
+        self.assertEqual(self.get("soty", season="2023").json()["count"], 0)
+
+    def test_compact_gzip_encoding(self):
+        """Test responses are gzipped and answer conditional requests"""
+        response = self.get("soty", headers={"HTTP_ACCEPT_ENCODING": "gzip"})
+
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        data = gzip.decompress(response.content)
+        self.assertNotIn(b", ", data)
+        self.assertEqual(json.loads(data)["count"], 5)
+
+        cached = self.get("soty", headers={"HTTP_IF_NONE_MATCH": response["ETag"]})
+        self.assertEqual(cached.status_code, 304)
+
+    def test_unknown_standings(self):
+        """Test unknown kinds and seasons are not found"""
+        self.assertEqual(self.get("foty").status_code, 404)
+        self.assertEqual(self.get("soty", season="1900").status_code, 404)
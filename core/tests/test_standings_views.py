@@ -0,0 +1,96 @@
+"""
+Tests for the standings list views
+"""
+
+
+from datetime import date
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from core.models import COTY, NOTY, SOTY, TOTY, Debater, School
+from core.models.tournament import Tournament
+from core.utils.team import get_or_create_team_for_debaters
+
+
+MARKERS = ("one", "two", "three", "four", "five", "six")
+
+
+class StandingsListQueryTest(TestCase):
+    """Test standings pages render with a fixed number of queries"""
+
+    def setUp(self):
+        self.tournaments = [
+            Tournament.objects.create(
+                name=f"Tournament {i}",
+                host=School.objects.create(name=f"Host {i}"),
+                date=date(2024, 1, i + 1),
+                season="2024",
+            )
+            for i in range(6)
+        ]
+        self.count = 0
+
+    def markers(self):
+        return {
+            **{f"marker_{number}": 7.5 for number in MARKERS},
+            **{
+                f"tournament_{number}": tournament
+                for number, tournament in zip(MARKERS, self.tournaments)
+            },
+        }
+
+    def add_rows(self, count):
+        for _ in range(count):
+            self.count += 1
+            school = School.objects.create(name=f"School {self.count}")
+            first = Debater.objects.create(
+                first_name=f"First{self.count}", last_name="Last", school=school
+            )
+            second = Debater.objects.create(
+                first_name=f"Second{self.count}", last_name="Last", school=school
+            )
+            team = get_or_create_team_for_debaters(first, second)
+
+            TOTY.objects.create(
+                season="2024", team=team, place=self.count, **self.markers()
+            )
+            SOTY.objects.create(
+                season="2024", debater=first, place=self.count, **self.markers()
+            )
+            NOTY.objects.create(
+                season="2024", debater=first, place=self.count, **self.markers()
+            )
+            COTY.objects.create(season="2024", school=school, place=self.count)
+
+    def assert_fixed_queries(self, url_name, text):
+        url = reverse(url_name) + "?season=2024"
+
+        self.add_rows(1)
+        with CaptureQueriesContext(connection) as small:
+            self.client.get(url)
+
+        self.add_rows(8)
+        with CaptureQueriesContext(connection) as large:
+            response = self.client.get(url)
+
+        self.assertContains(response, text)
+        self.assertEqual(len(large), len(small))
+
+    def test_toty(self):
+        """Test the TOTY table joins teams, debaters and tournaments"""
+        self.assert_fixed_queries("core:toty", "7.5 (Host 4)")
+
+    def test_soty(self):
+        """Test the SOTY table joins debaters, schools and tournaments"""
+        self.assert_fixed_queries("core:soty", "7.5 (Host 5)")
+
+    def test_noty(self):
+        """Test the NOTY table joins debaters, schools and tournaments"""
+        self.assert_fixed_queries("core:noty", "7.5 (Host 4)")
+
+    def test_coty(self):
+        """Test the COTY table joins schools"""
+        self.assert_fixed_queries("core:coty", "School 9")
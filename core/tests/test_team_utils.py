@@ -0,0 +1,100 @@
+"""
+Tests for team lookup utilities
+"""
+
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from core.models import Debater, School, Team
+from core.utils.team import get_or_create_team_for_debaters, get_or_create_teams
+
+
+class TeamUtilsTest(TestCase):
+    """Test pair key based team lookup"""
+
+    def setUp(self):
+        self.school = School.objects.create(name="Test School")
+        self.other_school = School.objects.create(name="Other School")
+        self.debater1 = Debater.objects.create(
+            first_name="John", last_name="Doe", school=self.school
+        )
+        self.debater2 = Debater.objects.create(
+            first_name="Jane", last_name="Smith", school=self.school
+        )
+        self.debater3 = Debater.objects.create(
+            first_name="Bob", last_name="Jones", school=self.other_school
+        )
+
+    def test_pair_key_is_order_independent(self):
+        """Test the pair key does not depend on debater order"""
+        self.assertEqual(Team.make_pair_key(5, 3), "3-5")
+        self.assertEqual(Team.make_pair_key(3, 5), "3-5")
+
+    def test_pair_key_synced_on_add(self):
+        """Test adding debaters to a team sets its pair key"""
+        team = Team.objects.create(name="Test Team")
+        team.debaters.add(self.debater1, self.debater2)
+
+        team.refresh_from_db()
+        self.assertEqual(
+            team.pair_key, Team.make_pair_key(self.debater1.id, self.debater2.id)
+        )
+
+        team.debaters.remove(self.debater2)
+        team.refresh_from_db()
+        self.assertIsNone(team.pair_key)
+
+    def test_get_or_create_team_for_debaters(self):
+        """Test a team is created once and then found"""
+        team = get_or_create_team_for_debaters(self.debater2, self.debater1)
+
+        self.assertEqual(team.name, "Test School DS")
+        self.assertEqual(
+            set(team.debaters.all()), {self.debater1, self.debater2}
+        )
+        self.assertEqual(
+            get_or_create_team_for_debaters(self.debater1, self.debater2), team
+        )
+        self.assertEqual(Team.objects.count(), 1)
+
+    def test_get_or_create_teams_hybrid_name(self):
+        """Test hybrid teams get both school names"""
+        teams = get_or_create_teams([(self.debater1, self.debater3)])
+        team = teams[Team.make_pair_key(self.debater1.id, self.debater3.id)]
+
+        self.assertEqual(team.name, "Test School / Other School DJ")
+        self.assertTrue(team.hybrid)
+
+    def test_get_or_create_teams_single_lookup(self):
+        """Test existing teams are resolved in a single query"""
+        get_or_create_teams(
+            [(self.debater1, self.debater2), (self.debater1, self.debater3)]
+        )
+
+        with CaptureQueriesContext(connection) as queries:
+            teams = get_or_create_teams(
+                [
+                    (self.debater2.id, self.debater1.id),
+                    (self.debater3.id, self.debater1.id),
+                ]
+            )
+
+        self.assertEqual(len(queries), 1)
+        self.assertEqual(len(teams), 2)
+        self.assertEqual(Team.objects.count(), 2)
+
+    def test_get_or_create_teams_links_legacy_team(self):
+        """Test teams without a pair key are found and backfilled"""
+        team = Team.objects.create(name="Legacy Team")
+        team.debaters.add(self.debater1, self.debater2)
+        Team.objects.filter(id=team.id).update(pair_key=None)
+
+        found = get_or_create_team_for_debaters(self.debater1, self.debater2)
+
+        self.assertEqual(found, team)
+        team.refresh_from_db()
+        self.assertEqual(
+            team.pair_key, Team.make_pair_key(self.debater1.id, self.debater2.id)
+        )
@@ -136,3 +136,90 @@ class TeamViewsTest(TestCase):
             reverse("core:team_detail", kwargs={"pk": self.team.pk})
         )
         self.assertEqual(response.status_code, 200)
+
+
+class TeamDetailQueryTest(TestCase):
+    """Test the team page runs a constant number of queries"""
+
+    def setUp(self):
+        from django.contrib.auth import get_user_model
+
+        self.school = School.objects.create(name="Test School")
+        debaters = [
+            Debater.objects.create(
+                first_name=f"Debater{i}", last_name=f"Last{i}", school=self.school
+            )
+            for i in range(4)
+        ]
+        self.team = Team.objects.create(name="Test Team")
+        self.team.debaters.add(debaters[0], debaters[1])
+        self.opponent = Team.objects.create(name="Opponent Team")
+        self.opponent.debaters.add(debaters[2], debaters[3])
+        self.debaters = debaters
+
+        self.user = get_user_model().objects.create_superuser(
+            username="tester", email="tester@example.com", password="password"
+        )
+
+    def add_tournaments(self, count, start=0):
+        from core.models import Round, RoundStats
+
+        for i in range(start, start + count):
+            tournament = Tournament.objects.create(
+                name=f"Tournament {i}",
+                host=self.school,
+                date=date(2024, 1, 1 + i),
+                season="2024",
+            )
+
+            if i % 2 == 0:
+                TeamResult.objects.create(
+                    tournament=tournament, team=self.team, place=i + 1
+                )
+
+            for round_number in range(1, 6):
+                round_obj = Round.objects.create(
+                    tournament=tournament,
+                    round_number=round_number,
+                    gov=self.team,
+                    opp=self.opponent,
+                    victor=Round.GOV if round_number % 2 else Round.OPP,
+                )
+
+                for debater, role in zip(self.debaters, ("pm", "mg", "lo", "mo")):
+                    RoundStats.objects.create(
+                        round=round_obj,
+                        debater=debater,
+                        debater_role=role,
+                        speaks=26,
+                        ranks=2,
+                    )
+
+    def count_queries(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(
+                reverse("core:team_detail", kwargs={"pk": self.team.pk}), {"all": 1}
+            )
+
+        self.assertEqual(response.status_code, 200)
+
+        return response, len(queries)
+
+    def test_query_count_is_constant(self):
+        """Test query count does not grow with the number of tournaments"""
+        self.client.force_login(self.user)
+
+        self.add_tournaments(2)
+        _, small = self.count_queries()
+
+        self.add_tournaments(10, start=2)
+        response, large = self.count_queries()
+
+        self.assertEqual(small, large)
+        self.assertEqual(len(response.context["team_results"]), 12)
+        self.assertEqual(response.context["team_results"][0]["record"], "3 - 2")
+        self.assertEqual(len(response.context["team_results"][0]["tab_card"]), 5)
+        self.assertContains(response, "Opponent Team")
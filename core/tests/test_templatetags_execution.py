@@ -20,6 +20,8 @@ class TemplateTagExecutionTest(TestCase):
         round_mock = Mock()
         round_mock.gov = team_gov
         round_mock.opp = team_opp
+        round_mock.gov_id = team_gov.id
+        round_mock.opp_id = team_opp.id
 
         # Test all victor values for government team
         test_cases = [
@@ -55,6 +57,8 @@ class TemplateTagExecutionTest(TestCase):
         round_mock = Mock()
         round_mock.gov = team_gov
         round_mock.opp = team_opp
+        round_mock.gov_id = team_gov.id
+        round_mock.opp_id = team_opp.id
 
         # Test both directions
         result = opponent(round_mock, team_gov)
@@ -74,6 +78,8 @@ class TemplateTagExecutionTest(TestCase):
         round_mock = Mock()
         round_mock.gov = team_gov
         round_mock.opp = team_opp
+        round_mock.gov_id = team_gov.id
+        round_mock.opp_id = team_opp.id
 
         result = opponent_url(round_mock, team_gov)
         self.assertEqual(result, "/team/123/")
@@ -88,6 +94,8 @@ class TemplateTagExecutionTest(TestCase):
         round_mock = Mock()
         round_mock.gov = team_gov
         round_mock.opp = team_opp
+        round_mock.gov_id = team_gov.id
+        round_mock.opp_id = team_opp.id
 
         result = opponent_side(round_mock, team_gov)
         self.assertEqual(result, "OPP")
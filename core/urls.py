@@ -2,11 +2,13 @@ from django.urls import path
 
 from core.views import (
     admin_views,
+    api_views,
     coty_views,
     debater_views,
     noty_views,
     round_views,
     school_views,
+    search_views,
     soty_views,
     team_views,
     toty_views,
@@ -183,6 +185,16 @@ urlpatterns = [
     path("core/toty", toty_views.TOTYListView.as_view(), name="toty"),
     path("core/noty", noty_views.NOTYListView.as_view(), name="noty"),
     path("core/coty", coty_views.COTYListView.as_view(), name="coty"),
+    path(
+        "core/search/autocomplete",
+        search_views.search_autocomplete,
+        name="search_autocomplete",
+    ),
+    path(
+        "core/api/standings/<str:season>/<str:kind>",
+        api_views.standings_api,
+        name="standings_api",
+    ),
     path("core/admin-tools/", admin_views.AdminToolsView.as_view(), name="admin_tools"),
     path(
         "core/mittab-dashboard/",
@@ -194,4 +206,9 @@ urlpatterns = [
         admin_views.RankingsRecomputeView.as_view(),
         name="rankings_recompute",
     ),
+    path(
+        "core/exports/<str:name>.<str:fmt>",
+        admin_views.ExportView.as_view(),
+        name="export",
+    ),
 ]
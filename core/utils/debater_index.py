@@ -0,0 +1,110 @@
+import bisect
+import re
+import threading
+import time
+
+from core.models.debater import Debater
+from core.models.school import School
+from core.utils.versions import get_versions, model_scope
+
+CHECK_INTERVAL = 5
+
+
+def tokenize(text):
+    return re.findall(r"\w+", text.casefold())
+
+
+class DebaterPrefixIndex:
+    """
+    In-memory prefix index of every debater's name and school
+
+    Debater autocompletes fire on every keystroke, so rather than asking the
+    search backend and then loading the matching rows, each process keeps a
+    sorted list of (token, debater id) pairs and answers prefix lookups with
+    a binary search. The Debater and School version tokens are checked at
+    most every CHECK_INTERVAL seconds and the index is rebuilt with a single
+    query when either has been bumped.
+
+    Bulk writes send no post_save, so they must bump those scopes
+    themselves. Under DummyCache (the development default) every check gets
+    fresh tokens, so the index is rebuilt every CHECK_INTERVAL seconds.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.version = None
+        self.checked = None
+        # (tokens, labels, schools, ids) swapped in as a whole on rebuild
+        self.data = ([], {}, {}, [])
+
+    def get_version(self):
+        return ":".join(get_versions([model_scope(Debater), model_scope(School)]))
+
+    def refresh(self):
+        now = time.monotonic()
+        if self.checked is not None and now - self.checked < CHECK_INTERVAL:
+            return
+
+        with self.lock:
+            self.checked = now
+            version = self.get_version()
+
+            if version != self.version:
+                self.data = self.build()
+                self.version = version
+
+    def build(self):
+        tokens = []
+        labels = {}
+        schools = {}
+
+        rows = Debater.objects.values_list(
+            "id", "first_name", "last_name", "school_id", "school__name"
+        )
+        for pk, first_name, last_name, school_id, school_name in rows:
+            name = f"{first_name} {last_name}".strip()
+            labels[pk] = (
+                f"<{pk}> {name} ({school_name})" if school_name else f"<{pk}> {name}"
+            )
+            schools[pk] = school_id
+
+            for token in set(tokenize(f"{name} {school_name or ''}")):
+                tokens.append((token, pk))
+
+        tokens.sort()
+        return tokens, labels, schools, sorted(labels, reverse=True)
+
+    def get_matches(self, tokens, term):
+        start = bisect.bisect_left(tokens, (term,))
+        matches = set()
+
+        for token, pk in tokens[start:]:
+            if not token.startswith(term):
+                break
+            matches.add(pk)
+
+        return matches
+
+    def search(self, q, school=None):
+        """
+        Return (id, label) for debaters matching every word of q, newest first
+
+        With school, only that school's debaters are returned.
+        """
+        self.refresh()
+        tokens, labels, schools, ids = self.data
+
+        terms = tokenize(q or "")
+        if terms:
+            matches = self.get_matches(tokens, terms[0])
+            for term in terms[1:]:
+                matches &= self.get_matches(tokens, term)
+            ids = sorted(matches, reverse=True)
+
+        if school:
+            ids = [pk for pk in ids if str(schools[pk]) == str(school)]
+
+        return [(pk, labels[pk]) for pk in ids]
+
+
+debater_prefix_index = DebaterPrefixIndex()
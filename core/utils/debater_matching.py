@@ -0,0 +1,106 @@
+import re
+from collections import defaultdict
+
+from core.models.debater import Debater
+
+MATCH_THRESHOLD = 0.5
+
+
+def normalize_name(name):
+    return " ".join(re.sub(r"[^\w\s]", " ", name.lower()).split())
+
+
+def get_tokens(name):
+    return normalize_name(name).split()
+
+
+def get_trigrams(name):
+    normalized = f"  {normalize_name(name)} "
+
+    return {normalized[i : i + 3] for i in range(len(normalized) - 2)}
+
+
+class DebaterMatcher:
+    def __init__(self, school_ids):
+        school_ids = [school_id for school_id in set(school_ids) if school_id != -1]
+
+        self.debaters = {
+            debater.id: debater
+            for debater in Debater.objects.filter(school__id__in=school_ids)
+            .select_related("school")
+            .order_by("-pk")
+        }
+
+        self.names = {}
+        self.trigrams = {}
+        self.token_index = defaultdict(set)
+        self.trigram_index = defaultdict(set)
+
+        for debater in self.debaters.values():
+            self.names[debater.id] = normalize_name(debater.name)
+            self.trigrams[debater.id] = get_trigrams(debater.name)
+
+            for token in get_tokens(debater.name):
+                self.token_index[token].add(debater.id)
+
+            for trigram in self.trigrams[debater.id]:
+                self.trigram_index[trigram].add(debater.id)
+
+    def score(self, name, debater_id):
+        if normalize_name(name) == self.names[debater_id]:
+            return 1.0
+
+        trigrams = get_trigrams(name)
+        candidate_trigrams = self.trigrams[debater_id]
+
+        union = len(trigrams | candidate_trigrams)
+
+        if union == 0:
+            return 0.0
+
+        similarity = len(trigrams & candidate_trigrams) / union
+
+        tokens = set(get_tokens(name))
+        candidate_tokens = set(self.names[debater_id].split())
+
+        if tokens and tokens <= candidate_tokens:
+            similarity = max(similarity, 0.9)
+        elif tokens & candidate_tokens:
+            similarity = min(1.0, similarity + 0.25)
+
+        return round(similarity, 4)
+
+    def match(self, name, school_ids, limit=5):
+        school_ids = {school_id for school_id in school_ids if school_id != -1}
+
+        candidate_ids = set()
+
+        for token in get_tokens(name):
+            candidate_ids |= self.token_index.get(token, set())
+
+        for trigram in get_trigrams(name):
+            candidate_ids |= self.trigram_index.get(trigram, set())
+
+        candidates = [
+            (self.debaters[debater_id], self.score(name, debater_id))
+            for debater_id in candidate_ids
+            if self.debaters[debater_id].school_id in school_ids
+        ]
+
+        candidates.sort(key=lambda candidate: (-candidate[1], -candidate[0].id))
+
+        return candidates[:limit]
+
+    def match_all(self, entries, limit=5):
+        return {
+            key: self.match(name, school_ids, limit=limit)
+            for key, name, school_ids in entries
+        }
+
+    def best_match(self, name, school_ids, threshold=MATCH_THRESHOLD):
+        candidates = self.match(name, school_ids, limit=1)
+
+        if candidates and candidates[0][1] >= threshold:
+            return candidates[0][0]
+
+        return None
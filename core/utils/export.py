@@ -0,0 +1,89 @@
+import csv
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+from core.models import (
+    COTY,
+    NOTY,
+    QUAL,
+    SOTY,
+    TOTY,
+    OnlineQUAL,
+    Round,
+    RoundStats,
+    SpeakerResult,
+    TeamResult,
+)
+
+CHUNK_SIZE = 2000
+
+EXPORTS = {
+    "team_results": (TeamResult, "tournament__season"),
+    "speaker_results": (SpeakerResult, "tournament__season"),
+    "rounds": (Round, "tournament__season"),
+    "round_stats": (RoundStats, "round__tournament__season"),
+    "toty": (TOTY, "season"),
+    "soty": (SOTY, "season"),
+    "noty": (NOTY, "season"),
+    "coty": (COTY, "season"),
+    "qual": (QUAL, "season"),
+    "online_qual": (OnlineQUAL, "season"),
+}
+
+FORMATS = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+}
+
+
+class Echo:
+    """File-like object that hands back whatever is written to it"""
+
+    def write(self, value):
+        return value
+
+
+def get_export_columns(model):
+    return [field.attname for field in model._meta.concrete_fields]
+
+
+def get_export_rows(name, season=None, chunk_size=CHUNK_SIZE):
+    """
+    Yield the columns of every row of an export as tuples
+
+    Rows are read with values_list through a server-side cursor, so no model
+    instances are built and memory stays flat however large the table is.
+    """
+    model, season_field = EXPORTS[name]
+
+    queryset = model._meta.base_manager.order_by("pk")
+    if season:
+        queryset = queryset.filter(**{season_field: season})
+
+    return queryset.values_list(*get_export_columns(model)).iterator(
+        chunk_size=chunk_size
+    )
+
+
+def stream_csv(name, season=None, chunk_size=CHUNK_SIZE):
+    writer = csv.writer(Echo())
+
+    yield writer.writerow(get_export_columns(EXPORTS[name][0]))
+
+    for row in get_export_rows(name, season, chunk_size):
+        yield writer.writerow(row)
+
+
+def stream_ndjson(name, season=None, chunk_size=CHUNK_SIZE):
+    columns = get_export_columns(EXPORTS[name][0])
+    encoder = DjangoJSONEncoder(separators=(",", ":"))
+
+    for row in get_export_rows(name, season, chunk_size):
+        yield encoder.encode(dict(zip(columns, row))) + "\n"
+
+
+def stream_export(name, fmt, season=None, chunk_size=CHUNK_SIZE):
+    if fmt == "csv":
+        return stream_csv(name, season, chunk_size)
+
+    return stream_ndjson(name, season, chunk_size)
@@ -1,9 +1,18 @@
 import django_tables2 as tables
+from django.conf import settings
 from django.contrib.auth.mixins import PermissionRequiredMixin
 from django.views.generic import CreateView, DeleteView, DetailView, UpdateView
 from django_filters.views import FilterView
 
 from core.templatetags.tags import number
+from core.utils.page_cache import conditional_page
+from core.utils.pagination import (
+    CachedCountPaginator,
+    KeysetPage,
+    get_cached_count,
+    get_count_key,
+)
+from core.utils.versions import get_model_scopes, object_scope, season_scope
 
 
 class CustomTable(tables.Table):
@@ -18,6 +27,26 @@ class CustomMixin(PermissionRequiredMixin):
 
     public_view = False
 
+    cache_by_season = False
+    conditional_get = False
+
+    @classmethod
+    def get_cache_scopes(cls, request, **kwargs):
+        if cls.cache_by_season:
+            return [season_scope(request.GET.get("season") or settings.CURRENT_SEASON)]
+        return get_model_scopes(cls.model)
+
+    def get_view_scopes(self, request, **kwargs):
+        """Scopes for this request's ETag, which a view may share its data with"""
+        return self.get_cache_scopes(request, **kwargs)
+
+    def dispatch(self, request, *args, **kwargs):
+        if self.public_view and (self.conditional_get or self.cache_by_season):
+            return conditional_page(super().dispatch, self.get_view_scopes)(
+                request, *args, **kwargs
+            )
+        return super().dispatch(request, *args, **kwargs)
+
     def has_permission(self, *args, **kwargs):
         if self.public_view:
             return True
@@ -43,6 +72,70 @@ class CustomListView(CustomMixin, tables.SingleTableMixin, FilterView):
     permission_type = "view"
     ordering = ["-pk"]
 
+    select_related = []
+    prefetch_related = []
+
+    paginator_class = CachedCountPaginator
+
+    keyset_pagination = False
+    keyset_page = None
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+
+        if self.select_related:
+            queryset = queryset.select_related(*self.select_related)
+        if self.prefetch_related:
+            queryset = queryset.prefetch_related(*self.prefetch_related)
+
+        return queryset
+
+    def get_count_key(self):
+        return get_count_key(
+            self.model,
+            [
+                (key, value)
+                for key, values in self.request.GET.lists()
+                if key not in ("page", "sort", "cursor")
+                for value in values
+            ],
+        )
+
+    def uses_keyset_pagination(self):
+        return self.keyset_pagination and not self.request.GET.get("sort")
+
+    def get_table_data(self):
+        data = super().get_table_data()
+
+        if not self.uses_keyset_pagination():
+            return data
+
+        self.keyset_page = KeysetPage(
+            data,
+            self.get_table_class()._meta.per_page,
+            cursor=self.request.GET.get("cursor"),
+            count=get_cached_count(self.get_count_key(), data.count),
+        )
+
+        return self.keyset_page.object_list
+
+    def get_table_pagination(self, table):
+        if self.keyset_page is not None:
+            return False
+
+        paginate = super().get_table_pagination(table)
+
+        if isinstance(paginate, dict):
+            paginate["count_key"] = self.get_count_key()
+
+        return paginate
+
+    def get_table(self, **kwargs):
+        table = super().get_table(**kwargs)
+        table.keyset_page = self.keyset_page
+
+        return table
+
 
 class CustomCreateView(CustomMixin, CreateView):
     permission_type = "add"
@@ -50,6 +143,11 @@ class CustomCreateView(CustomMixin, CreateView):
 
 class CustomDetailView(CustomMixin, DetailView):
     permission_type = "view"
+    conditional_get = True
+
+    @classmethod
+    def get_cache_scopes(cls, request, **kwargs):
+        return [object_scope(cls.model, kwargs["pk"])]
 
 
 class CustomUpdateView(CustomMixin, UpdateView):
@@ -72,7 +170,7 @@ class MarkerColumn(tables.Column):
             record, f"tournament_{self.number}"
         ):
             return ""
-        return f"{number(getattr(record, f'marker_{self.number}'), '-2')} ({getattr(record, f'tournament_{self.number}')})"
+        return f"{number(getattr(record, f'marker_{self.number}'))} ({getattr(record, f'tournament_{self.number}')})"
 
 
 class PlaceColumn(tables.Column):
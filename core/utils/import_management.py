@@ -1,5 +1,6 @@
 import json
 import math
+from decimal import Decimal
 
 from django.conf import settings
 
@@ -8,21 +9,11 @@ from core.models.results.speaker import SpeakerResult
 from core.models.results.team import TeamResult
 from core.models.round import Round, RoundStats
 from core.models.school import School, SchoolLookup
-from core.models.standings.coty import COTY
-from core.models.standings.noty import NOTY
-from core.models.standings.online_qual import OnlineQUAL
-from core.models.standings.soty import SOTY
-from core.models.standings.toty import TOTY
 from core.models.team import Team
-from core.utils.rankings import (
-    redo_rankings,
-    update_noty,
-    update_online_quals,
-    update_qual_points,
-    update_soty,
-    update_toty,
-)
-from core.utils.team import get_or_create_team_for_debaters
+from core.utils.debater_matching import DebaterMatcher
+from core.utils.rankings import refresh_standings
+from core.utils.team import get_or_create_teams
+from core.utils.versions import bump_tournament_versions
 
 CREATE = 0
 LINK = 1
@@ -62,6 +53,222 @@ def get_num_novice_debaters(teams_list, num_rounds=5):
     )
 
 
+def validate_tab_export(response):
+    errors = []
+
+    def check(condition, message):
+        if not condition:
+            errors.append(message)
+        return condition
+
+    def is_number(value, upper=100):
+        try:
+            return not isinstance(value, bool) and 0 <= float(value) < upper
+        except (TypeError, ValueError):
+            return False
+
+    def entries(items, name):
+        for item in items:
+            if check(isinstance(item, dict), f"{name} entries must be objects"):
+                yield item
+
+    if not check(isinstance(response, dict), "Export must be a JSON object"):
+        return errors
+
+    for key in (
+        "num_rounds",
+        "schools",
+        "teams",
+        "rounds",
+        "stats",
+        "speaker_results",
+        "novice_speaker_results",
+        "team_results",
+        "novice_team_results",
+    ):
+        if not check(key in response, f"Missing key {key}"):
+            return errors
+
+        if key != "num_rounds":
+            check(isinstance(response[key], list), f"{key} must be a list")
+
+    if errors:
+        return errors
+
+    num_rounds = response["num_rounds"]
+
+    if not check(
+        isinstance(num_rounds, int) and num_rounds > 0,
+        "num_rounds must be a positive integer",
+    ):
+        return errors
+
+    school_ids = {-1}
+
+    for school in entries(response["schools"], "schools"):
+        if not check(
+            isinstance(school.get("id"), int) and isinstance(school.get("name"), str),
+            f"School {school.get('id')} must have an integer id and a name",
+        ):
+            continue
+
+        check(school["id"] not in school_ids, f"Duplicate school {school['id']}")
+        school_ids.add(school["id"])
+
+    team_debaters = {}
+    debater_ids = set()
+
+    for team in entries(response["teams"], "teams"):
+        team_id = team.get("id")
+
+        if not check(
+            isinstance(team_id, int) and team_id not in team_debaters,
+            f"Team {team_id} must have a unique integer id",
+        ):
+            continue
+
+        check(
+            team.get("school_id") in school_ids and team["school_id"] != -1,
+            f"Team {team_id} references unknown school {team.get('school_id')}",
+        )
+        check(
+            team.get("hybrid_school_id") in school_ids,
+            f"Team {team_id} references unknown hybrid school "
+            f"{team.get('hybrid_school_id')}",
+        )
+        check(
+            isinstance(team.get("num_rounds"), int)
+            and 0 <= team["num_rounds"] <= num_rounds,
+            f"Team {team_id} has an invalid number of rounds",
+        )
+
+        team_debaters[team_id] = set()
+
+        if not check(
+            isinstance(team.get("debaters"), list) and len(team["debaters"]) == 2,
+            f"Team {team_id} must have 2 debaters",
+        ):
+            continue
+
+        for debater in entries(team["debaters"], "debaters"):
+            debater_id = debater.get("id")
+
+            if not check(
+                isinstance(debater_id, int) and debater_id not in debater_ids,
+                f"Debater {debater_id} on team {team_id} must have a unique "
+                "integer id",
+            ):
+                continue
+
+            check(
+                isinstance(debater.get("name"), str) and debater["name"].strip(),
+                f"Debater {debater_id} must have a name",
+            )
+            check(
+                debater.get("status") in (0, 1),
+                f"Debater {debater_id} has an invalid status",
+            )
+
+            debater_ids.add(debater_id)
+            team_debaters[team_id].add(debater_id)
+
+    round_ids = set()
+    round_debaters = {}
+    victors = dict(Round.VICTOR_CHOICES)
+
+    for round_obj in entries(response["rounds"], "rounds"):
+        round_id = round_obj.get("id")
+
+        if not check(
+            isinstance(round_id, int) and round_id not in round_ids,
+            f"Round {round_id} must have a unique integer id",
+        ):
+            continue
+
+        round_ids.add(round_id)
+
+        check(
+            isinstance(round_obj.get("round_number"), int),
+            f"Round {round_id} must have a round number",
+        )
+        check(
+            round_obj.get("victor") in victors,
+            f"Round {round_id} has an invalid victor",
+        )
+
+        teams_found = [
+            check(
+                round_obj.get(side) in team_debaters,
+                f"Round {round_id} references unknown {side} team "
+                f"{round_obj.get(side)}",
+            )
+            for side in ("gov", "opp")
+        ]
+
+        if all(teams_found) and check(
+            round_obj["gov"] != round_obj["opp"],
+            f"Round {round_id} has the same team on both sides",
+        ):
+            round_debaters[round_id] = (
+                team_debaters[round_obj["gov"]] | team_debaters[round_obj["opp"]]
+            )
+
+    for stat in entries(response["stats"], "stats"):
+        round_id = stat.get("round")
+        debater_id = stat.get("debater")
+
+        if not check(
+            round_id in round_ids,
+            f"Speaks reference unknown round {round_id}",
+        ) or not check(
+            debater_id in debater_ids,
+            f"Speaks in round {round_id} reference unknown debater {debater_id}",
+        ):
+            continue
+
+        check(
+            debater_id in round_debaters.get(round_id, {debater_id}),
+            f"Debater {debater_id} did not debate in round {round_id}",
+        )
+        check(
+            is_number(stat.get("speaks")),
+            f"Debater {debater_id} has invalid speaks in round {round_id}",
+        )
+        check(
+            is_number(stat.get("ranks")),
+            f"Debater {debater_id} has invalid ranks in round {round_id}",
+        )
+        check(
+            isinstance(stat.get("role"), str) and len(stat["role"]) <= 4,
+            f"Debater {debater_id} has an invalid role in round {round_id}",
+        )
+
+    for key, field, known in (
+        ("speaker_results", "debater", debater_ids),
+        ("novice_speaker_results", "debater", debater_ids),
+        ("team_results", "team", team_debaters),
+        ("novice_team_results", "team", team_debaters),
+    ):
+        for award in entries(response[key], key):
+            check(
+                award.get(field) in known,
+                f"{key} references unknown {field} {award.get(field)}",
+            )
+            check(
+                isinstance(award.get("place"), int)
+                and 0 < award["place"] <= len(known),
+                f"{key} has an invalid place {award.get('place')}",
+            )
+
+            if field == "debater":
+                check(
+                    isinstance(award.get("tie"), bool),
+                    f"{key} place {award.get('place')} is missing its tie flag",
+                )
+
+    return errors
+
+
 def clean_keys(d):
     new_dict = {}
 
@@ -119,18 +326,17 @@ def create_schools(school_actions):
 def create_teams(debater_completed_actions, teams):
     completed_actions = {}
 
-    for team in teams:
-        debaters = []
-
-        for debater in team["debaters"]:
-            found_debater = Debater.objects.get(
-                id=debater_completed_actions[debater["id"]]
-            )
+    pairs = {
+        team["id"]: [
+            debater_completed_actions[debater["id"]] for debater in team["debaters"]
+        ]
+        for team in teams
+    }
 
-            debaters += [found_debater]
+    found_teams = get_or_create_teams(pairs.values())
 
-        found_team = get_or_create_team_for_debaters(debaters[0], debaters[1])
-        completed_actions[team["id"]] = found_team.id
+    for team_id, pair in pairs.items():
+        completed_actions[team_id] = found_teams[Team.make_pair_key(*pair)].id
 
     return completed_actions
 
@@ -183,18 +389,59 @@ def create_debaters(school_completed_actions, debater_actions):
 def create_rounds(team_completed_actions, tournament, rounds):
     completed_actions = {}
 
-    Round.objects.filter(tournament=tournament).delete()
+    existing = {
+        (round.round_number, round.gov_id, round.opp_id): round
+        for round in Round.objects.filter(tournament=tournament)
+    }
+
+    incoming = {}
 
     for round in rounds:
-        new_round = Round.objects.create(
-            round_number=int(round["round_number"]),
-            gov=Team.objects.get(id=team_completed_actions[round["gov"]]),
-            opp=Team.objects.get(id=team_completed_actions[round["opp"]]),
-            victor=round["victor"],
-            tournament=tournament,
+        key = (
+            int(round["round_number"]),
+            team_completed_actions[round["gov"]],
+            team_completed_actions[round["opp"]],
         )
+        incoming[key] = round
+
+    to_update = []
+
+    for key, round in incoming.items():
+        if key in existing and existing[key].victor != round["victor"]:
+            existing[key].victor = round["victor"]
+            to_update += [existing[key]]
 
-        completed_actions[round["id"]] = new_round.id
+    Round.objects.filter(
+        id__in=[round.id for key, round in existing.items() if key not in incoming]
+    ).delete()
+    Round.objects.bulk_update(to_update, ["victor"])
+    Round.objects.bulk_create(
+        [
+            Round(
+                round_number=key[0],
+                gov_id=key[1],
+                opp_id=key[2],
+                victor=round["victor"],
+                tournament=tournament,
+            )
+            for key, round in incoming.items()
+            if key not in existing
+        ]
+    )
+
+    if any(key not in existing for key in incoming):
+        existing = {
+            (round.round_number, round.gov_id, round.opp_id): round
+            for round in Round.objects.filter(tournament=tournament)
+        }
+
+    for round in rounds:
+        key = (
+            int(round["round_number"]),
+            team_completed_actions[round["gov"]],
+            team_completed_actions[round["opp"]],
+        )
+        completed_actions[round["id"]] = existing[key].id
 
     return completed_actions
 
@@ -202,102 +449,317 @@ def create_rounds(team_completed_actions, tournament, rounds):
 def create_round_stats(
     debater_completed_actions, round_completed_actions, tournament, round_stats
 ):
-    RoundStats.objects.filter(round__tournament=tournament).all().delete()
+    existing = {
+        (stat.round_id, stat.debater_id, stat.debater_role): stat
+        for stat in RoundStats.objects.filter(round__tournament=tournament)
+    }
+
+    incoming = {}
 
     for round_stat in round_stats:
-        round_stat = RoundStats.objects.create(
-            round=Round.objects.get(id=round_completed_actions[round_stat["round"]]),
-            debater=Debater.objects.get(
-                id=debater_completed_actions[round_stat["debater"]]
-            ),
-            speaks=round_stat["speaks"],
-            ranks=round_stat["ranks"],
-            debater_role=round_stat["role"],
+        key = (
+            round_completed_actions[round_stat["round"]],
+            debater_completed_actions[round_stat["debater"]],
+            round_stat["role"],
         )
+        incoming[key] = round_stat
+
+    to_update = []
+
+    for key, round_stat in incoming.items():
+        if key not in existing:
+            continue
+
+        stat = existing[key]
+
+        if stat.speaks != Decimal(str(round_stat["speaks"])) or stat.ranks != Decimal(
+            str(round_stat["ranks"])
+        ):
+            stat.speaks = round_stat["speaks"]
+            stat.ranks = round_stat["ranks"]
+            to_update += [stat]
+
+    RoundStats.objects.filter(
+        id__in=[stat.id for key, stat in existing.items() if key not in incoming]
+    ).delete()
+    RoundStats.objects.bulk_update(to_update, ["speaks", "ranks"])
+    RoundStats.objects.bulk_create(
+        [
+            RoundStats(
+                round_id=key[0],
+                debater_id=key[1],
+                debater_role=key[2],
+                speaks=round_stat["speaks"],
+                ranks=round_stat["ranks"],
+            )
+            for key, round_stat in incoming.items()
+            if key not in existing
+        ]
+    )
 
 
 def create_speaker_awards(
-    debater_completed_actions, speaker_awards, type_of_result, tournament
+    debater_completed_actions,
+    speaker_awards,
+    type_of_result,
+    tournament,
+    update_standings=True,
 ):
-    debaters_changed = []
+    debaters_changed = set()
 
-    to_delete = SpeakerResult.objects.filter(
-        tournament=tournament, type_of_place=type_of_result
-    )
+    existing = {
+        result.place: result
+        for result in SpeakerResult.objects.filter(
+            tournament=tournament, type_of_place=type_of_result
+        )
+    }
 
-    for speaker in to_delete:
-        debaters_changed += [speaker.debater]
-        speaker.delete()
+    incoming = {}
 
     for award in speaker_awards[:10]:
-        debater = Debater.objects.get(id=debater_completed_actions[award["debater"]])
-        SpeakerResult.objects.create(
-            tournament=tournament,
-            debater=debater,
-            type_of_place=type_of_result,
-            place=award["place"],
-            tie=award["tie"],
+        incoming[award["place"]] = (
+            debater_completed_actions[award["debater"]],
+            award["tie"],
         )
 
-        debaters_changed += [debater]
+    to_update = []
+
+    for place, (debater_id, tie) in incoming.items():
+        if place not in existing:
+            debaters_changed.add(debater_id)
+            continue
 
-    for debater in debaters_changed:
-        update_soty(debater)
-        update_noty(debater)
+        result = existing[place]
 
-    redo_rankings(
-        SOTY.objects.filter(season=settings.CURRENT_SEASON),
-        season=settings.CURRENT_SEASON,
-        cache_type="soty",
-    )
-    redo_rankings(
-        NOTY.objects.filter(season=settings.CURRENT_SEASON),
-        season=settings.CURRENT_SEASON,
-        cache_type="noty",
+        if result.debater_id != debater_id or result.tie != tie:
+            debaters_changed.update([result.debater_id, debater_id])
+            result.debater_id = debater_id
+            result.tie = tie
+            to_update += [result]
+
+    to_delete = [result for place, result in existing.items() if place not in incoming]
+    debaters_changed.update([result.debater_id for result in to_delete])
+
+    SpeakerResult.objects.filter(id__in=[result.id for result in to_delete]).delete()
+    SpeakerResult.objects.bulk_update(to_update, ["debater", "tie"])
+    SpeakerResult.objects.bulk_create(
+        [
+            SpeakerResult(
+                tournament=tournament,
+                debater_id=debater_id,
+                type_of_place=type_of_result,
+                place=place,
+                tie=tie,
+            )
+            for place, (debater_id, tie) in incoming.items()
+            if place not in existing
+        ]
     )
 
+    if update_standings:
+        refresh_standings(debater_ids=debaters_changed)
+
+    return debaters_changed
+
+
+def create_team_awards(
+    team_completed_actions,
+    team_awards,
+    type_of_result,
+    tournament,
+    update_standings=True,
+):
+    teams_changed = set()
 
-def create_team_awards(team_completed_actions, team_awards, type_of_result, tournament):
-    teams_changed = []
+    existing = {}
+    unplaced = []
 
-    to_delete = TeamResult.objects.filter(
+    for result in TeamResult.objects.filter(
         tournament=tournament, type_of_place=type_of_result
-    )
+    ):
+        if result.place == -1:
+            unplaced += [result]
+        else:
+            existing[result.place] = result
 
-    for team in to_delete:
-        teams_changed += [team.team]
-        team.delete()
+    incoming = {}
 
     for award in team_awards[:16]:
-        team = Team.objects.get(id=team_completed_actions[award["team"]])
-        TeamResult.objects.create(
-            tournament=tournament,
-            team=team,
-            type_of_place=type_of_result,
-            place=award["place"],
-        )
+        incoming[award["place"]] = team_completed_actions[award["team"]]
 
-        teams_changed += [team]
+    to_update = []
+
+    for place, team_id in incoming.items():
+        if place not in existing:
+            teams_changed.add(team_id)
+            continue
 
-    for team in teams_changed:
-        update_toty(team)
-        update_qual_points(team)
+        result = existing[place]
 
-        if tournament.season in settings.ONLINE_SEASONS:
-            update_online_quals(team)
+        if result.team_id != team_id:
+            teams_changed.update([result.team_id, team_id])
+            result.team_id = team_id
+            to_update += [result]
 
-    redo_rankings(
-        TOTY.objects.filter(season=settings.CURRENT_SEASON),
-        season=settings.CURRENT_SEASON,
-        cache_type="toty",
+    to_delete = unplaced + [
+        result for place, result in existing.items() if place not in incoming
+    ]
+    teams_changed.update([result.team_id for result in to_delete])
+
+    TeamResult.objects.filter(id__in=[result.id for result in to_delete]).delete()
+    TeamResult.objects.bulk_update(to_update, ["team"])
+    TeamResult.objects.bulk_create(
+        [
+            TeamResult(
+                tournament=tournament,
+                team_id=team_id,
+                type_of_place=type_of_result,
+                place=place,
+            )
+            for place, team_id in incoming.items()
+            if place not in existing
+        ]
     )
-    redo_rankings(
-        COTY.objects.filter(season=settings.CURRENT_SEASON),
-        season=settings.CURRENT_SEASON,
-        cache_type="coty",
+
+    if update_standings:
+        refresh_standings(
+            team_ids=teams_changed,
+            online_quals=tournament.season in settings.ONLINE_SEASONS,
+        )
+
+    return teams_changed
+
+
+def import_tournament(tournament, response, schools, debaters, update_standings=True):
+    debater_actions, team_actions = create_entities(response, schools, debaters)
+
+    return import_results(
+        tournament,
+        response,
+        debater_actions,
+        team_actions,
+        update_standings=update_standings,
     )
-    redo_rankings(
-        OnlineQUAL.objects.filter(season=settings.CURRENT_SEASON),
-        season=settings.CURRENT_SEASON,
-        cache_type="online_quals",
+
+
+def create_entities(response, schools, debaters):
+    """
+    Create or link the schools, debaters and teams of an export
+
+    These rows are shared between tournaments, so callers importing several
+    exports at once should create them one export at a time.
+    """
+    school_actions = create_schools(schools)
+    debater_actions = create_debaters(school_actions, debaters)
+    team_actions = create_teams(debater_actions, response["teams"])
+
+    return debater_actions, team_actions
+
+
+def import_results(
+    tournament, response, debater_actions, team_actions, update_standings=True
+):
+    round_actions = create_rounds(team_actions, tournament, response["rounds"])
+    create_round_stats(debater_actions, round_actions, tournament, response["stats"])
+
+    debaters_changed = set()
+    teams_changed = set()
+
+    for key, type_of_result in (
+        ("speaker_results", Debater.VARSITY),
+        ("novice_speaker_results", Debater.NOVICE),
+    ):
+        debaters_changed |= create_speaker_awards(
+            debater_actions,
+            response[key],
+            type_of_result,
+            tournament,
+            update_standings=False,
+        )
+
+    for key, type_of_result in (
+        ("team_results", Debater.VARSITY),
+        ("novice_team_results", Debater.NOVICE),
+    ):
+        teams_changed |= create_team_awards(
+            team_actions,
+            response[key],
+            type_of_result,
+            tournament,
+            update_standings=False,
+        )
+
+    bump_tournament_versions(
+        tournament,
+        team_ids=set(team_actions.values()) | teams_changed,
+        debater_ids=debaters_changed,
     )
+
+    if update_standings:
+        refresh_standings(
+            team_ids=teams_changed,
+            debater_ids=debaters_changed,
+            online_quals=tournament.season in settings.ONLINE_SEASONS,
+        )
+
+    return teams_changed, debaters_changed
+
+
+def reconcile_schools(response, school_mapping=None):
+    school_mapping = school_mapping or {}
+
+    school_actions = {-1: {"school": -1, "name": ""}}
+
+    for school in response["schools"]:
+        name = school["name"].strip()
+
+        if name in school_mapping:
+            school_id = school_mapping[name]
+        else:
+            found_school = lookup_school(name)
+            school_id = found_school.id if found_school else None
+
+        school_actions[school["id"]] = {
+            "action": LINK if school_id else CREATE,
+            "id": school["id"],
+            "name": school["name"],
+            "school": school_id if school_id else -1,
+        }
+
+    return school_actions
+
+
+def reconcile_debaters(response, school_actions, debater_mapping=None):
+    debater_mapping = debater_mapping or {}
+
+    matcher = DebaterMatcher([action["school"] for action in school_actions.values()])
+
+    debater_actions = {-1: {"debater": -1, "name": ""}}
+
+    for team in response["teams"]:
+        school_ids = [
+            school_actions[team["school_id"]]["school"],
+            school_actions[team["hybrid_school_id"]]["school"],
+        ]
+        school_mapping = debater_mapping.get(
+            school_actions[team["school_id"]]["name"].strip(), {}
+        )
+
+        for debater in team["debaters"]:
+            if debater["name"] in school_mapping:
+                debater_id = school_mapping[debater["name"]]
+            else:
+                found_debater = matcher.best_match(debater["name"], school_ids)
+                debater_id = found_debater.id if found_debater else None
+
+            debater_actions[debater["id"]] = {
+                "action": LINK if debater_id else CREATE,
+                "id": debater["id"],
+                "name": debater["name"],
+                "debater": debater_id if debater_id else -1,
+                "school": -1,
+                "school_id": team["school_id"],
+                "status": 0 if debater["status"] else 1,
+            }
+
+    return debater_actions
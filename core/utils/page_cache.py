@@ -0,0 +1,93 @@
+import hashlib
+from datetime import datetime, timezone
+
+from django.utils.http import parse_http_date_safe
+from django.views.decorators.http import condition
+
+from core.utils.versions import get_token_timestamp, get_versions
+
+PAGE_CACHE_TIMEOUT = 60 * 60
+
+
+def get_request_scopes(request, get_cache_scopes, **kwargs):
+    """Return the page's scopes, looking them up at most once per request"""
+    if not hasattr(request, "page_cache_scopes"):
+        request.page_cache_scopes = get_cache_scopes(request, **kwargs)
+
+    return request.page_cache_scopes
+
+
+def get_page_etag(request, scopes):
+    return hashlib.md5(
+        ":".join(
+            [request.get_full_path(), str(request.user.pk), *get_versions(scopes)]
+        ).encode()
+    ).hexdigest()
+
+
+def get_page_last_modified(scopes):
+    return datetime.fromtimestamp(
+        max(get_token_timestamp(token) for token in get_versions(scopes)),
+        tz=timezone.utc,
+    )
+
+
+def conditional_page(view, get_cache_scopes):
+    """
+    Wrap view so unchanged pages get a 304 Not Modified without rendering
+
+    The ETag and Last-Modified headers come from the version tokens of the
+    page's scopes, which are bumped whenever the underlying rows change.
+    """
+    return condition(
+        etag_func=lambda request, *args, **kwargs: get_page_etag(
+            request, get_request_scopes(request, get_cache_scopes, **kwargs)
+        ),
+        last_modified_func=lambda request, *args, **kwargs: get_page_last_modified(
+            get_request_scopes(request, get_cache_scopes, **kwargs)
+        ),
+    )(view)
+
+
+def get_cached_last_modified(response):
+    return parse_http_date_safe(response.get("Last-Modified", ""))
+
+
+def public_page(get_cache_scopes, conditional=False):
+    """Mark a function view as public and cacheable under the given scopes"""
+
+    def decorator(view):
+        if conditional:
+            view = conditional_page(view, get_cache_scopes)
+
+        view.public_view = True
+        view.get_cache_scopes = get_cache_scopes
+        return view
+
+    return decorator
+
+
+def get_page_cache_key(request, view_func, view_kwargs):
+    """
+    Return the cache key for an anonymous GET of a public view
+
+    Returns None when the response should not come from the cache. The key
+    embeds a hash of the version token of every scope the page depends on,
+    so bumping any of them makes older copies unreachable.
+    """
+    view = getattr(view_func, "view_class", view_func)
+
+    if not getattr(view, "public_view", False):
+        return None
+    if request.method != "GET" or request.user.is_authenticated:
+        return None
+    if "messages" in request.COOKIES:
+        return None
+
+    scopes = get_request_scopes(request, view.get_cache_scopes, **view_kwargs)
+    path = hashlib.md5(request.get_full_path().encode()).hexdigest()
+    # Pages can depend on any number of scopes, so the tokens are hashed to
+    # keep the key within memcached's 250 character limit
+    versions = hashlib.md5(":".join(get_versions(scopes)).encode()).hexdigest()
+
+    return f"page:{path}:{versions}"
@@ -0,0 +1,155 @@
+import hashlib
+import math
+
+from django.core import signing
+from django.core.cache import cache
+from django.core.paginator import EmptyPage, PageNotAnInteger, Paginator
+from django.utils.functional import cached_property
+
+from core.utils.versions import get_model_scopes, get_versions
+
+COUNT_TIMEOUT = 60 * 5
+
+CURSOR_SALT = "core.pagination.cursor"
+
+
+def get_count_key(model, params):
+    signature = hashlib.md5(
+        "&".join(
+            f"{key}={value}" for key, value in sorted(params) if value != ""
+        ).encode()
+    ).hexdigest()
+
+    version = hashlib.md5(
+        ":".join(get_versions(get_model_scopes(model))).encode()
+    ).hexdigest()
+
+    return f"count:{version}:{model._meta.label_lower}:{signature}"
+
+
+def get_cached_count(key, count):
+    """Return the count stored under key, calling count() on a miss"""
+    cached = cache.get(key)
+
+    if cached is None:
+        cached = count()
+        cache.set(key, cached, COUNT_TIMEOUT)
+
+    return cached
+
+
+def encode_cursor(pk, direction, number):
+    return signing.dumps([pk, direction, number], salt=CURSOR_SALT, compress=True)
+
+
+def decode_cursor(cursor):
+    try:
+        pk, direction, number = signing.loads(cursor, salt=CURSOR_SALT)
+    except (signing.BadSignature, TypeError, ValueError):
+        return None
+
+    if direction not in ("next", "prev") or not isinstance(number, int):
+        return None
+
+    return pk, direction, number
+
+
+class CachedCountPaginator(Paginator):
+    """Paginator that shares its row count between requests with the same filters"""
+
+    def __init__(self, object_list, per_page, count_key=None, **kwargs):
+        self.count_key = count_key
+        super().__init__(object_list, per_page, **kwargs)
+
+    @cached_property
+    def count(self):
+        if not self.count_key:
+            return super().count
+
+        return get_cached_count(self.count_key, lambda: len(self.object_list))
+
+    def validate_number(self, number):
+        """
+        Validate number without checking it against the page count
+
+        A cached count can trail recent inserts, so pages past the cached
+        last page are only rejected once they turn out to be empty.
+        """
+        try:
+            if isinstance(number, float) and not number.is_integer():
+                raise ValueError
+            number = int(number)
+        except (TypeError, ValueError) as e:
+            raise PageNotAnInteger("That page number is not an integer") from e
+
+        if number < 1:
+            raise EmptyPage("That page number is less than 1")
+
+        return number
+
+    def page(self, number):
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        object_list = list(self.object_list[bottom : bottom + self.per_page])
+
+        if not object_list and number > 1:
+            raise EmptyPage("That page contains no results")
+
+        return self._get_page(object_list, number, self)
+
+
+class KeysetPage:
+    """
+    A page of rows ordered by descending primary key
+
+    Pages are addressed by opaque cursors holding the primary key on the
+    edge of the neighbouring page, so every page is a single indexed range
+    scan regardless of how deep it is.
+    """
+
+    def __init__(self, queryset, per_page, cursor=None, count=None):
+        self.per_page = per_page
+        self.num_pages = (
+            max(1, math.ceil(count / per_page)) if count is not None else None
+        )
+
+        position = decode_cursor(cursor) if cursor else None
+
+        if position is not None:
+            self.seek(queryset, *position)
+
+        if position is None or not self.object_list:
+            self.seek(queryset, None, "next", 1)
+
+    def seek(self, queryset, pk, direction, number):
+        limit = self.per_page + 1
+
+        if direction == "next":
+            if pk is not None:
+                queryset = queryset.filter(pk__lt=pk)
+            rows = list(queryset.order_by("-pk")[:limit])
+            self.has_next = len(rows) > self.per_page
+            self.has_previous = pk is not None
+        else:
+            rows = list(queryset.filter(pk__gt=pk).order_by("pk")[:limit])
+            self.has_previous = len(rows) > self.per_page
+            self.has_next = True
+
+        self.object_list = rows[: self.per_page]
+
+        if direction != "next":
+            self.object_list.reverse()
+
+        self.number = number if self.has_previous else 1
+
+    @property
+    def next_cursor(self):
+        if not self.has_next:
+            return None
+        return encode_cursor(self.object_list[-1].pk, "next", self.number + 1)
+
+    @property
+    def previous_cursor(self):
+        if not self.has_previous:
+            return None
+        return encode_cursor(self.object_list[0].pk, "prev", self.number - 1)
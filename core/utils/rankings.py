@@ -4,6 +4,7 @@ from django.conf import settings
 from django.core.cache import cache
 from django.core.cache.utils import make_template_fragment_key
 from django.shortcuts import reverse
+from django.test import Client
 
 from core.models.debater import Debater, QualPoints, Reaff
 from core.models.results.team import TeamResult
@@ -13,12 +14,15 @@ from core.models.standings.online_qual import OnlineQUAL
 from core.models.standings.qual import QUAL
 from core.models.standings.soty import SOTY
 from core.models.standings.toty import TOTY, TOTYReaff
-from django.test import Client
+from core.models.team import Team
 
 
 def get_relevant_debaters(school, season):
     qualled_debaters = [
-        q.debater for q in QUAL.objects.filter(debater__school=school, season=season)
+        q.debater
+        for q in QUAL.objects.filter(debater__school=school, season=season)
+        .select_related("debater")
+        .prefetch_related("debater__quals")
     ]
 
     qualled_debaters = list(set(qualled_debaters))
@@ -26,6 +30,8 @@ def get_relevant_debaters(school, season):
     qual_points = (
         QualPoints.objects.filter(debater__school=school)
         .filter(season=season)
+        .select_related("debater")
+        .prefetch_related("debater__quals")
         .order_by("-points")
     )
 
@@ -287,7 +293,9 @@ def update_qual_points(team, season=settings.CURRENT_SEASON):
 
         if not debater.school.included_in_oty:
             if season == settings.CURRENT_SEASON:
-                QUAL.objects.filter(season=season, debater__school=debater.school).delete()
+                QUAL.objects.filter(
+                    season=season, debater__school=debater.school
+                ).delete()
                 QualPoints.objects.filter(
                     season=season, debater__school=debater.school
                 ).delete()
@@ -525,3 +533,41 @@ def update_online_quals(team, season=settings.CURRENT_SEASON):
         coty.save()
 
     return True
+
+
+def refresh_standings(
+    team_ids=(), debater_ids=(), online_quals=False, season=settings.CURRENT_SEASON
+):
+    if debater_ids:
+        for debater in Debater.objects.filter(id__in=debater_ids).select_related(
+            "school"
+        ):
+            update_soty(debater, season)
+            update_noty(debater, season)
+
+        redo_rankings(
+            SOTY.objects.filter(season=season), season=season, cache_type="soty"
+        )
+        redo_rankings(
+            NOTY.objects.filter(season=season), season=season, cache_type="noty"
+        )
+
+    if team_ids:
+        for team in Team.objects.filter(id__in=team_ids):
+            update_toty(team, season)
+            update_qual_points(team, season)
+
+            if online_quals:
+                update_online_quals(team, season)
+
+        redo_rankings(
+            TOTY.objects.filter(season=season), season=season, cache_type="toty"
+        )
+        redo_rankings(
+            COTY.objects.filter(season=season), season=season, cache_type="coty"
+        )
+        redo_rankings(
+            OnlineQUAL.objects.filter(season=season),
+            season=season,
+            cache_type="online_quals",
+        )
@@ -1,53 +1,127 @@
+from collections import defaultdict
+
 from django.db.models import Q
 
-from core.models.round import Round
+from core.models.round import Round, RoundStats
+from core.models.team import Team
 
 
-def get_record(tournament, team):
-    gov_wins = [1, 3, 6]
-    opp_wins = [2, 4, 6]
+GOV_WINS = [Round.GOV, Round.GOV_VIA_FORFEIT, Round.ALL_WIN]
+OPP_WINS = [Round.OPP, Round.OPP_VIA_FORFEIT, Round.ALL_WIN]
 
-    num_wins = 0
 
-    rounds = tournament.rounds.filter(Q(gov=team) | Q(opp=team))
+def get_records(tournament=None, season=None, teams=None, by_tournament=False):
+    rounds = Round.objects.all()
+
+    if tournament:
+        rounds = rounds.filter(tournament=tournament)
+
+    if season:
+        rounds = rounds.filter(tournament__season=season)
+
+    team_ids = None
+
+    if teams is not None:
+        team_ids = {getattr(team, "id", team) for team in teams}
+        rounds = rounds.filter(Q(gov__in=team_ids) | Q(opp__in=team_ids))
+
+    wins = defaultdict(int)
+    num_rounds = {}
+
+    for tournament_id, tournament_rounds, gov_id, opp_id, victor in rounds.values_list(
+        "tournament_id", "tournament__num_rounds", "gov_id", "opp_id", "victor"
+    ):
+        for team_id, team_wins in ((gov_id, GOV_WINS), (opp_id, OPP_WINS)):
+            if team_ids is not None and team_id not in team_ids:
+                continue
+
+            num_rounds[(team_id, tournament_id)] = tournament_rounds
+
+            if victor in team_wins:
+                wins[(team_id, tournament_id)] += 1
+
+    records = defaultdict(lambda: [0, 0])
+
+    for key, tournament_rounds in num_rounds.items():
+        record = records[key if by_tournament else key[0]]
+
+        record[0] += wins[key]
+        record[1] += tournament_rounds - wins[key]
+
+    return {key: tuple(record) for key, record in records.items()}
+
 
-    if not rounds.exists():
+def format_record(record):
+    if not record:
         return ""
 
-    for round in rounds:
-        if round.gov == team and round.victor in gov_wins:
-            num_wins += 1
-        if round.opp == team and round.victor in opp_wins:
-            num_wins += 1
+    return f"{record[0]} - {record[1]}"
 
-    return f"{num_wins} - {tournament.num_rounds - num_wins}"
 
+def get_record(tournament, team):
+    return format_record(get_records(tournament=tournament, teams=[team]).get(team.id))
 
-def get_tab_card_data(team, tournament):
-    if not team:
-        return None
 
-    speaker_one = team.debaters.first()
-    speaker_two = team.debaters.last()
+def build_tab_cards(rounds, team_debaters=None):
+    if not rounds:
+        return {}
+
+    stats = {
+        (stat.round_id, stat.debater_id): stat
+        for stat in RoundStats.objects.filter(
+            round__in=[round.id for round in rounds]
+        ).select_related("debater")
+    }
+
+    if team_debaters is None:
+        team_debaters = defaultdict(list)
+
+        for team_id, debater_id in (
+            Team.debaters.through.objects.filter(
+                team_id__in={round.gov_id for round in rounds}
+                | {round.opp_id for round in rounds}
+            )
+            .order_by("debater_id")
+            .values_list("team_id", "debater_id")
+        ):
+            team_debaters[team_id] += [debater_id]
 
-    rounds = Round.objects.filter(Q(gov=team) | Q(opp=team))
+    tab_cards = defaultdict(list)
 
-    if not rounds.exists():
+    for round in rounds:
+        for team_id in (round.gov_id, round.opp_id):
+            debaters = team_debaters.get(team_id, [])
+
+            tab_cards[(team_id, round.tournament_id)] += [
+                {
+                    "round": round,
+                    "stats": [
+                        stats.get((round.id, debaters[0])) if debaters else None,
+                        stats.get((round.id, debaters[-1])) if debaters else None,
+                    ],
+                }
+            ]
+
+    return dict(tab_cards)
+
+
+def get_tab_card_data(team, tournament):
+    if not team:
         return None
 
-    to_return = []
+    rounds = tournament.rounds.filter(Q(gov=team) | Q(opp=team))
 
-    print(rounds)
+    return build_tab_cards(
+        list(rounds.select_related("gov", "opp").order_by("round_number", "id"))
+    ).get((team.id, tournament.id))
 
-    for round in rounds.order_by("round_number").all():
-        to_add = {
-            "round": round,
-            "stats": [
-                round.stats.filter(debater=speaker_one).first(),
-                round.stats.filter(debater=speaker_two).first(),
-            ],
-        }
 
-        to_return += [to_add]
+def get_tab_cards(tournament):
+    rounds = tournament.rounds.select_related("gov", "opp").order_by(
+        "round_number", "id"
+    )
 
-    return to_return
+    return {
+        team_id: tab_card
+        for (team_id, _), tab_card in build_tab_cards(list(rounds)).items()
+    }
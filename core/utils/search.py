@@ -0,0 +1,55 @@
+from django.db.models import Case, IntegerField, When
+from haystack.query import SearchQuerySet
+
+AUTOCOMPLETE_LIMIT = 50
+
+
+def autocomplete(models, q, limit=AUTOCOMPLETE_LIMIT):
+    """Return the index results whose names start with each word of q"""
+    return SearchQuerySet().models(*models).autocomplete(name_auto=q)[:limit]
+
+
+def autocomplete_pks(model, q, limit=AUTOCOMPLETE_LIMIT):
+    return [result.pk for result in autocomplete([model], q, limit)]
+
+
+def filter_pks(queryset, pks):
+    """Filter queryset to pks, keeping their order"""
+    if not pks:
+        return queryset.none()
+
+    return queryset.filter(pk__in=pks).order_by(
+        Case(
+            *[When(pk=pk, then=position) for position, pk in enumerate(pks)],
+            output_field=IntegerField(),
+        )
+    )
+
+
+class SearchAutocompleteMixin:
+    """Select2 view matching q against the search index"""
+
+    def search(self, queryset):
+        if not self.q:
+            return queryset
+
+        try:
+            page = max(int(self.request.GET.get(self.page_kwarg, 1)), 1)
+        except ValueError:
+            page = 1
+
+        # Every hit up to the requested page plus one, so Select2 can still
+        # tell whether another page follows
+        needed = page * self.paginate_by + 1
+        limit = needed
+
+        while True:
+            pks = autocomplete_pks(queryset.model, self.q, limit)
+            matches = filter_pks(queryset, pks)
+
+            # Hits the queryset filters out don't fill the page, so keep
+            # fetching until it is full or the index runs out
+            if len(pks) < limit or matches.count() >= needed:
+                return matches
+
+            limit *= 2
@@ -0,0 +1,219 @@
+import hashlib
+import json
+import os
+import shutil
+from decimal import Decimal
+
+import pyarrow
+import pyarrow.parquet
+from django.db.models import Count, Max
+
+from core.models import (
+    Debater,
+    Round,
+    RoundStats,
+    School,
+    SpeakerResult,
+    Team,
+    TeamResult,
+    Tournament,
+)
+from core.utils.versions import get_versions, model_scope, object_scope, season_scope
+
+CHUNK_SIZE = 2000
+
+MANIFEST = "_manifest.json"
+
+SNAPSHOT_TABLES = {
+    "tournaments": (
+        Tournament,
+        "season",
+        [
+            ("id", "id"),
+            ("name", "name"),
+            ("date", "date"),
+            ("host_id", "host_id"),
+            ("host", "host__name"),
+            ("num_rounds", "num_rounds"),
+            ("num_teams", "num_teams"),
+            ("num_novice_teams", "num_novice_teams"),
+            ("num_debaters", "num_debaters"),
+            ("num_novice_debaters", "num_novice_debaters"),
+            ("qual", "qual"),
+            ("noty", "noty"),
+            ("soty", "soty"),
+            ("toty", "toty"),
+        ],
+    ),
+    "team_results": (
+        TeamResult,
+        "tournament__season",
+        [
+            ("id", "id"),
+            ("tournament_id", "tournament_id"),
+            ("tournament", "tournament__name"),
+            ("date", "tournament__date"),
+            ("team_id", "team_id"),
+            ("team", "team__name"),
+            ("type_of_place", "type_of_place"),
+            ("place", "place"),
+            ("ghost_points", "ghost_points"),
+        ],
+    ),
+    "speaker_results": (
+        SpeakerResult,
+        "tournament__season",
+        [
+            ("id", "id"),
+            ("tournament_id", "tournament_id"),
+            ("tournament", "tournament__name"),
+            ("date", "tournament__date"),
+            ("debater_id", "debater_id"),
+            ("first_name", "debater__first_name"),
+            ("last_name", "debater__last_name"),
+            ("school_id", "debater__school_id"),
+            ("school", "debater__school__name"),
+            ("type_of_place", "type_of_place"),
+            ("place", "place"),
+            ("tie", "tie"),
+        ],
+    ),
+    "rounds": (
+        Round,
+        "tournament__season",
+        [
+            ("id", "id"),
+            ("tournament_id", "tournament_id"),
+            ("tournament", "tournament__name"),
+            ("round_number", "round_number"),
+            ("gov_id", "gov_id"),
+            ("gov", "gov__name"),
+            ("opp_id", "opp_id"),
+            ("opp", "opp__name"),
+            ("victor", "victor"),
+        ],
+    ),
+    "round_stats": (
+        RoundStats,
+        "round__tournament__season",
+        [
+            ("id", "id"),
+            ("tournament_id", "round__tournament_id"),
+            ("round_id", "round_id"),
+            ("round_number", "round__round_number"),
+            ("debater_id", "debater_id"),
+            ("first_name", "debater__first_name"),
+            ("last_name", "debater__last_name"),
+            ("debater_role", "debater_role"),
+            ("speaks", "speaks"),
+            ("ranks", "ranks"),
+        ],
+    ),
+}
+
+# Models copied into the snapshot whose saves don't bump a tournament scope
+SNAPSHOT_SOURCES = [School, Team, Debater, RoundStats]
+
+
+def get_snapshot_seasons():
+    return sorted(
+        Tournament.objects.order_by().values_list("season", flat=True).distinct()
+    )
+
+
+def get_season_state(season):
+    """
+    Return a cheap fingerprint of a season's snapshot tables
+
+    It combines the row count and largest id of each table with the version
+    tokens bumped when the season's tournaments or results change, so an
+    unchanged season is detected without reading its rows. Edits to the
+    names copied into the snapshot bump every season.
+    """
+    state = hashlib.md5()
+
+    for name, (model, season_field, _) in SNAPSHOT_TABLES.items():
+        aggregate = model._meta.base_manager.filter(**{season_field: season}).aggregate(
+            count=Count("pk"), last=Max("pk")
+        )
+        state.update(f"{name}:{aggregate['count']}:{aggregate['last']}:".encode())
+
+    tournament_ids = Tournament.objects.filter(season=season).values_list(
+        "id", flat=True
+    )
+    scopes = (
+        [season_scope(season)]
+        + [object_scope(Tournament, pk) for pk in tournament_ids]
+        + [model_scope(model) for model in SNAPSHOT_SOURCES]
+    )
+    state.update(":".join(get_versions(scopes)).encode())
+
+    return state.hexdigest()
+
+
+def get_season_columns(season, chunk_size=CHUNK_SIZE):
+    """Read every snapshot table for a season as columns"""
+    tables = {}
+
+    for name, (model, season_field, columns) in SNAPSHOT_TABLES.items():
+        names = [column for column, _ in columns]
+        values = {column: [] for column in names}
+
+        rows = (
+            model._meta.base_manager.filter(**{season_field: season})
+            .order_by("pk")
+            .values_list(*[lookup for _, lookup in columns])
+            .iterator(chunk_size=chunk_size)
+        )
+
+        for row in rows:
+            for column, value in zip(names, row):
+                values[column].append(
+                    float(value) if isinstance(value, Decimal) else value
+                )
+
+        tables[name] = values
+
+    return tables
+
+
+def read_manifest(directory):
+    try:
+        with open(os.path.join(directory, MANIFEST), encoding="utf-8") as manifest:
+            return json.load(manifest)
+    except FileNotFoundError:
+        return {"seasons": {}}
+
+
+def write_manifest(directory, manifest):
+    path = os.path.join(directory, MANIFEST)
+
+    with open(f"{path}.tmp", "w", encoding="utf-8") as output:
+        json.dump(manifest, output, indent=2, sort_keys=True)
+
+    os.replace(f"{path}.tmp", path)
+
+
+def get_partition(directory, table, season):
+    return os.path.join(directory, table, f"season={season}")
+
+
+def write_season(directory, season, tables):
+    """Replace a season's partition of every table with Parquet files"""
+    for table, columns in tables.items():
+        partition = get_partition(directory, table, season)
+        shutil.rmtree(partition, ignore_errors=True)
+
+        if not columns["id"]:
+            continue
+
+        os.makedirs(partition)
+        pyarrow.parquet.write_table(
+            pyarrow.Table.from_pydict(columns),
+            os.path.join(partition, "data.parquet"),
+        )
+
+
+def remove_season(directory, season):
+    for table in SNAPSHOT_TABLES:
+        shutil.rmtree(get_partition(directory, table, season), ignore_errors=True)
@@ -0,0 +1,218 @@
+from django.core import signing
+from django.core.cache import cache
+
+from core.models import COTY, NOTY, QUAL, SOTY, TOTY, OnlineQUAL
+from core.utils.versions import get_versions, season_scope
+
+PAYLOAD_TIMEOUT = 60 * 60 * 24
+
+CURSOR_SALT = "core.standings_api.cursor"
+
+MARKERS = ["one", "two", "three", "four", "five", "six"]
+
+
+def serialize_markers(standing):
+    markers = []
+
+    for marker in MARKERS:
+        tournament = getattr(standing, f"tournament_{marker}")
+        if tournament is None:
+            continue
+
+        markers.append(
+            {
+                "points": getattr(standing, f"marker_{marker}"),
+                "tournament_id": tournament.id,
+                "tournament": tournament.name,
+            }
+        )
+
+    return markers
+
+
+def serialize_base(standing):
+    return {
+        "id": standing.id,
+        "place": standing.place,
+        "tied": standing.tied,
+        "points": standing.points,
+    }
+
+
+def serialize_team_standing(standing):
+    return {
+        **serialize_base(standing),
+        "team_id": standing.team_id,
+        "team": standing.team.name,
+        "debaters": [
+            {"id": debater.id, "name": debater.name}
+            for debater in standing.team.debaters.all()
+        ],
+        "markers": serialize_markers(standing),
+    }
+
+
+def serialize_debater_standing(standing):
+    debater = standing.debater
+
+    return {
+        **serialize_base(standing),
+        "debater_id": debater.id,
+        "debater": debater.name,
+        "school_id": debater.school_id,
+        "school": debater.school.name if debater.school else None,
+        "markers": serialize_markers(standing),
+    }
+
+
+def serialize_school_standing(standing):
+    return {
+        **serialize_base(standing),
+        "school_id": standing.school_id,
+        "school": standing.school.name,
+    }
+
+
+def serialize_qual(standing):
+    debater = standing.debater
+    tournament = standing.tournament
+
+    return {
+        **serialize_base(standing),
+        "debater_id": debater.id,
+        "debater": debater.name,
+        "school_id": debater.school_id,
+        "school": debater.school.name if debater.school else None,
+        "qual_type": standing.get_qual_type_display(),
+        "tournament_id": standing.tournament_id,
+        "tournament": tournament.name if tournament else None,
+    }
+
+
+DEBATER_FIELDS = [
+    "debater_id",
+    "debater",
+    "school_id",
+    "school",
+    "markers",
+]
+
+BASE_FIELDS = ["id", "place", "tied", "points"]
+
+TOURNAMENT_MARKERS = [f"tournament_{marker}" for marker in MARKERS]
+
+STANDINGS = {
+    "toty": {
+        "model": TOTY,
+        "select_related": ["team", *TOURNAMENT_MARKERS],
+        "prefetch_related": ["team__debaters"],
+        "serialize": serialize_team_standing,
+        "fields": BASE_FIELDS + ["team_id", "team", "debaters", "markers"],
+    },
+    "soty": {
+        "model": SOTY,
+        "select_related": ["debater", "debater__school", *TOURNAMENT_MARKERS],
+        "serialize": serialize_debater_standing,
+        "fields": BASE_FIELDS + DEBATER_FIELDS,
+    },
+    "noty": {
+        "model": NOTY,
+        "select_related": ["debater", "debater__school", *TOURNAMENT_MARKERS],
+        "serialize": serialize_debater_standing,
+        "fields": BASE_FIELDS + DEBATER_FIELDS,
+    },
+    "online_qual": {
+        "model": OnlineQUAL,
+        "select_related": ["debater", "debater__school", *TOURNAMENT_MARKERS],
+        "serialize": serialize_debater_standing,
+        "fields": BASE_FIELDS + DEBATER_FIELDS,
+    },
+    "coty": {
+        "model": COTY,
+        "select_related": ["school"],
+        "serialize": serialize_school_standing,
+        "fields": BASE_FIELDS + ["school_id", "school"],
+    },
+    "qual": {
+        "model": QUAL,
+        "select_related": ["debater", "debater__school", "tournament"],
+        "serialize": serialize_qual,
+        "fields": BASE_FIELDS
+        + [
+            "debater_id",
+            "debater",
+            "school_id",
+            "school",
+            "qual_type",
+            "tournament_id",
+            "tournament",
+        ],
+    },
+}
+
+
+def build_standings_rows(kind, season):
+    spec = STANDINGS[kind]
+
+    standings = (
+        spec["model"]
+        .objects.filter(season=season)
+        .select_related(*spec["select_related"])
+        .prefetch_related(*spec.get("prefetch_related", []))
+        .order_by("place", "id")
+    )
+
+    return [spec["serialize"](standing) for standing in standings]
+
+
+def get_standings_version(season):
+    (version,) = get_versions([season_scope(season)])
+    return version
+
+
+def get_standings_payload(kind, season):
+    """
+    Return the serialized standings for a season, building them on a miss
+
+    The payload is keyed by the season's version token, so any write to the
+    season's standings makes the next request rebuild it.
+    """
+    key = f"standings-api:{kind}:{season}:{get_standings_version(season)}"
+    rows = cache.get(key)
+
+    if rows is None:
+        rows = build_standings_rows(kind, season)
+        cache.set(key, rows, PAYLOAD_TIMEOUT)
+
+    return rows
+
+
+def encode_cursor(row_id):
+    return signing.dumps(row_id, salt=CURSOR_SALT)
+
+
+def decode_cursor(cursor):
+    try:
+        row_id = signing.loads(cursor, salt=CURSOR_SALT)
+    except signing.BadSignature:
+        return None
+
+    return row_id if isinstance(row_id, int) else None
+
+
+def get_rows_after(rows, cursor):
+    """
+    Return the rows following the one the cursor points at
+
+    Cursors hold the id of the last row served rather than an offset, so a
+    client paging through a season that is re-ranked mid-walk resumes from
+    the same standing instead of skipping or repeating rows. Returns None
+    for a cursor that doesn't match any row.
+    """
+    row_id = decode_cursor(cursor)
+
+    for index, row in enumerate(rows):
+        if row["id"] == row_id:
+            return rows[index + 1 :]
+
+    return None
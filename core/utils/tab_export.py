@@ -0,0 +1,245 @@
+import random
+from collections import defaultdict
+
+FIRST_NAMES = [
+    "Alex",
+    "Jordan",
+    "Taylor",
+    "Casey",
+    "Riley",
+    "Quinn",
+    "Avery",
+    "Cameron",
+    "Drew",
+    "Sage",
+    "River",
+    "Phoenix",
+    "Rowan",
+    "Skylar",
+    "Emery",
+    "Finley",
+    "Morgan",
+    "Parker",
+    "Reese",
+    "Hayden",
+    "Dakota",
+    "Elliot",
+    "Harper",
+    "Jamie",
+    "Kendall",
+    "Logan",
+    "Micah",
+    "Noel",
+    "Oakley",
+    "Peyton",
+    "Remy",
+    "Shay",
+]
+
+LAST_NAMES = [
+    "Adams",
+    "Baker",
+    "Chen",
+    "Diaz",
+    "Evans",
+    "Foster",
+    "Garcia",
+    "Hughes",
+    "Ito",
+    "Jensen",
+    "Khan",
+    "Lopez",
+    "Moreno",
+    "Nguyen",
+    "Okafor",
+    "Patel",
+    "Quinn",
+    "Rossi",
+    "Singh",
+    "Tanaka",
+    "Usman",
+    "Vargas",
+    "Walsh",
+    "Xu",
+    "Young",
+    "Zimmer",
+    "Abbott",
+    "Brooks",
+    "Cole",
+    "Dunn",
+    "Ellis",
+    "Ford",
+]
+
+SCHOOL_NAMES = [
+    "Brandeis",
+    "Brown",
+    "Columbia",
+    "Cornell",
+    "Fordham",
+    "Georgetown",
+    "Harvard",
+    "Johns Hopkins",
+    "MIT",
+    "NYU",
+    "Princeton",
+    "Rutgers",
+    "Smith",
+    "Stanford",
+    "Swarthmore",
+    "Tufts",
+    "UChicago",
+    "UPenn",
+    "Vassar",
+    "Wellesley",
+    "Williams",
+    "Yale",
+    "Amherst",
+    "Boston University",
+]
+
+NOVICE_RATIO = 0.25
+
+
+def generate_tab_export(
+    num_teams=30,
+    num_rounds=5,
+    num_schools=10,
+    hybrid_ratio=0.1,
+    seed=0,
+):
+    rng = random.Random(seed)
+
+    schools = []
+
+    for i in range(num_schools):
+        name = SCHOOL_NAMES[i % len(SCHOOL_NAMES)]
+
+        if i >= len(SCHOOL_NAMES):
+            name = f"{name} {i // len(SCHOOL_NAMES) + 1}"
+
+        schools += [{"id": i + 1, "name": name}]
+
+    names = [f"{first} {last}" for last in LAST_NAMES for first in FIRST_NAMES]
+    rng.shuffle(names)
+
+    teams = []
+    debaters = []
+
+    for i in range(num_teams):
+        school_id = rng.randint(1, num_schools)
+        hybrid_school_id = -1
+
+        if num_schools > 1 and rng.random() < hybrid_ratio:
+            hybrid_school_id = rng.choice(
+                [school["id"] for school in schools if school["id"] != school_id]
+            )
+
+        team_debaters = []
+
+        for j in range(2):
+            index = 2 * i + j
+            name = names[index % len(names)]
+
+            if index >= len(names):
+                name = f"{name}{index // len(names) + 1}"
+
+            debater = {
+                "id": index + 1,
+                "name": name,
+                "status": 1 if rng.random() < NOVICE_RATIO else 0,
+            }
+            team_debaters += [debater]
+            debaters += [debater]
+
+        teams += [
+            {
+                "id": i + 1,
+                "school_id": school_id,
+                "hybrid_school_id": hybrid_school_id,
+                "num_rounds": num_rounds,
+                "debaters": team_debaters,
+            }
+        ]
+
+    rounds = []
+    stats = []
+    wins = defaultdict(int)
+    speaks = defaultdict(float)
+
+    for round_number in range(1, num_rounds + 1):
+        order = list(teams)
+        rng.shuffle(order)
+
+        for gov, opp in zip(order[::2], order[1::2]):
+            victor = rng.choice([1, 2])
+            round_id = len(rounds) + 1
+
+            rounds += [
+                {
+                    "id": round_id,
+                    "round_number": round_number,
+                    "gov": gov["id"],
+                    "opp": opp["id"],
+                    "victor": victor,
+                }
+            ]
+
+            wins[gov["id"] if victor == 1 else opp["id"]] += 1
+
+            for team, roles in ((gov, ("pm", "mg")), (opp, ("lo", "mo"))):
+                for debater, role in zip(team["debaters"], roles):
+                    speak = round(rng.uniform(23, 28) * 4) / 4
+                    speaks[debater["id"]] += speak
+
+                    stats += [
+                        {
+                            "round": round_id,
+                            "debater": debater["id"],
+                            "speaks": speak,
+                            "ranks": rng.randint(1, 4),
+                            "role": role,
+                        }
+                    ]
+
+    def team_key(team):
+        return (
+            -wins[team["id"]],
+            -sum(speaks[debater["id"]] for debater in team["debaters"]),
+        )
+
+    def speaker_results(candidates):
+        candidates = sorted(candidates, key=lambda debater: -speaks[debater["id"]])
+
+        return [
+            {"debater": debater["id"], "place": place, "tie": False}
+            for place, debater in enumerate(candidates[:10], start=1)
+        ]
+
+    novice_teams = [
+        team
+        for team in teams
+        if all(debater["status"] == 1 for debater in team["debaters"])
+    ]
+
+    return {
+        "num_rounds": num_rounds,
+        "schools": schools,
+        "teams": teams,
+        "rounds": rounds,
+        "stats": stats,
+        "speaker_results": speaker_results(debaters),
+        "novice_speaker_results": speaker_results(
+            [debater for debater in debaters if debater["status"] == 1]
+        ),
+        "team_results": [
+            {"team": team["id"], "place": place}
+            for place, team in enumerate(sorted(teams, key=team_key)[:16], start=1)
+        ],
+        "novice_team_results": [
+            {"team": team["id"], "place": place}
+            for place, team in enumerate(
+                sorted(novice_teams, key=team_key)[:8], start=1
+            )
+        ],
+    }
@@ -1,24 +1,81 @@
+from core.models.debater import Debater
 from core.models.team import Team
+from core.search_signals import queue_index_updates
 
 
-def get_or_create_team_for_debaters(debater_one, debater_two):
-    print(debater_one)
-    print(debater_two)
+def get_team_name(debaters):
+    debaters = sorted(debaters, key=lambda debater: debater.id)
+
+    if debaters[0].school == debaters[-1].school:
+        school_name = debaters[0].school.name
+    else:
+        school_name = f"{debaters[0].school.name} / {debaters[-1].school.name}"
+
+    return f"{school_name} {''.join([debater.last_name[0] for debater in debaters])}"
+
+
+def get_or_create_teams(pairs):
+    pairs = [[getattr(debater, "id", debater) for debater in pair] for pair in pairs]
+
+    debater_ids = {debater_id for pair in pairs for debater_id in pair}
+    keys = {Team.make_pair_key(*pair) for pair in pairs}
+
+    teams = {team.pair_key: team for team in Team.objects.filter(pair_key__in=keys)}
+
+    missing = [key for key in keys if key not in teams]
+
+    if missing:
+        legacy_teams = Team.objects.filter(
+            pair_key__isnull=True, debaters__in=debater_ids
+        ).prefetch_related("debaters")
 
-    team = (
-        Team.objects.filter(debaters=debater_one).filter(debaters=debater_two).first()
-    )
+        for team in legacy_teams.distinct():
+            team_debater_ids = [debater.id for debater in team.debaters.all()]
 
-    if team:
-        return team
+            if len(team_debater_ids) != 2:
+                continue
 
-    team = Team.objects.create()
-    team.debaters.add(debater_one)
-    team.debaters.add(debater_two)
+            key = Team.make_pair_key(*team_debater_ids)
 
-    team.save()
+            if key in missing and key not in teams:
+                team.pair_key = key
+                Team.objects.filter(id=team.id).update(pair_key=key)
+                teams[key] = team
 
-    team.update_name()
-    team.save()
+        missing = [key for key in missing if key not in teams]
 
-    return team
+    if missing:
+        debaters = Debater.objects.select_related("school").in_bulk(debater_ids)
+
+        Team.objects.bulk_create(
+            [
+                Team(
+                    name=get_team_name([debaters[int(i)] for i in set(key.split("-"))]),
+                    pair_key=key,
+                )
+                for key in missing
+            ]
+        )
+
+        created = list(Team.objects.filter(pair_key__in=missing))
+
+        Team.debaters.through.objects.bulk_create(
+            [
+                Team.debaters.through(team_id=team.id, debater_id=int(i))
+                for team in created
+                for i in set(team.pair_key.split("-"))
+            ]
+        )
+
+        # bulk_create sends no post_save, so the index has to be told
+        queue_index_updates(Team, created)
+
+        teams.update({team.pair_key: team for team in created})
+
+    return teams
+
+
+def get_or_create_team_for_debaters(debater_one, debater_two):
+    return get_or_create_teams([(debater_one, debater_two)])[
+        Team.make_pair_key(debater_one.id, debater_two.id)
+    ]
@@ -0,0 +1,158 @@
+import time
+import uuid
+
+from django.core.cache import cache
+from django.db.models import Q
+
+from core.models.debater import Debater
+from core.models.results.speaker import SpeakerResult
+from core.models.results.team import TeamResult
+from core.models.round import Round, RoundStats
+from core.models.team import Team
+from core.models.tournament import Tournament
+
+
+def season_scope(season):
+    return f"season:{season}"
+
+
+def model_scope(model):
+    return model._meta.label_lower
+
+
+def get_model_scopes(model):
+    """
+    Scopes of model and the core models it references directly
+
+    A list of model only shows and filters on those, so it depends on
+    these rather than on every table.
+    """
+    models = {model} | {
+        field.related_model
+        for field in model._meta.get_fields()
+        if field.is_relation
+        and not field.auto_created
+        and field.related_model is not None
+        and field.related_model._meta.app_label == "core"
+    }
+
+    return sorted(model_scope(related) for related in models)
+
+
+def object_scope(model, pk):
+    return f"{model._meta.label_lower}:{pk}"
+
+
+def new_token():
+    return f"{time.time():.6f}-{uuid.uuid4().hex[:8]}"
+
+
+def get_token_timestamp(token):
+    return float(token.split("-")[0])
+
+
+def get_versions(scopes):
+    """
+    Return the current version token for each scope
+
+    Scopes that have never been bumped (or were evicted) get a fresh token,
+    which invalidates anything cached under an older one.
+    """
+    keys = [f"version:{scope}" for scope in scopes]
+    tokens = cache.get_many(keys)
+
+    missing = {key: new_token() for key in keys if key not in tokens}
+
+    if missing:
+        cache.set_many(missing, None)
+        tokens.update(missing)
+
+    return [tokens[key] for key in keys]
+
+
+def bump_versions(scopes):
+    token = new_token()
+    cache.set_many({f"version:{scope}": token for scope in set(scopes)}, None)
+
+
+def get_changed_scopes(instance):
+    """
+    Scopes invalidated by saving or deleting instance
+
+    This only reads the instance's own fields so it is safe to call for
+    every row written during an import.
+    """
+    scopes = {
+        model_scope(type(instance)),
+        object_scope(type(instance), instance.pk),
+    }
+
+    season = getattr(instance, "season", None)
+    if isinstance(season, str) and season:
+        scopes.add(season_scope(season))
+
+    for field in instance._meta.concrete_fields:
+        if not field.many_to_one or field.related_model._meta.app_label != "core":
+            continue
+
+        value = getattr(instance, field.attname)
+        if value is not None:
+            scopes.add(object_scope(field.related_model, value))
+
+    return scopes
+
+
+def get_dependent_scopes(instance, created=False):
+    """
+    Scopes of pages that show instance through rows it doesn't reference
+
+    Speaks change team and tournament tab cards, and renamed teams and
+    debaters show up on the tournaments they competed at. Unlike
+    get_changed_scopes this queries, so it is only used for single writes.
+    New teams and debaters have no results yet, so they are skipped.
+    """
+    tournament_ids = []
+    team_ids = []
+
+    if isinstance(instance, RoundStats):
+        round_obj = (
+            Round.objects.filter(id=instance.round_id)
+            .values("tournament_id", "gov_id", "opp_id")
+            .first()
+        )
+
+        if round_obj:
+            tournament_ids = [round_obj["tournament_id"]]
+            team_ids = [round_obj["gov_id"], round_obj["opp_id"]]
+
+    elif isinstance(instance, Team) and not created:
+        tournament_ids = list(
+            TeamResult.objects.filter(team=instance).values_list(
+                "tournament_id", flat=True
+            )
+        ) + list(
+            Round.objects.filter(Q(gov=instance) | Q(opp=instance)).values_list(
+                "tournament_id", flat=True
+            )
+        )
+
+    elif isinstance(instance, Debater) and not created:
+        tournament_ids = SpeakerResult.objects.filter(debater=instance).values_list(
+            "tournament_id", flat=True
+        )
+
+    return {object_scope(Tournament, pk) for pk in tournament_ids} | {
+        object_scope(Team, pk) for pk in team_ids
+    }
+
+
+def bump_tournament_versions(tournament, team_ids=(), debater_ids=()):
+    """Bump the scopes touched by results written in bulk, bypassing signals"""
+    bump_versions(
+        [
+            season_scope(tournament.season),
+            object_scope(type(tournament), tournament.id),
+        ]
+        + [object_scope(Team, team_id) for team_id in team_ids]
+        + [object_scope(Debater, debater_id) for debater_id in debater_ids]
+    )
@@ -4,12 +4,13 @@ import re
 import requests
 from bs4 import BeautifulSoup
 from django.contrib.auth.mixins import UserPassesTestMixin
-from django.http import JsonResponse
-from django.views.generic import TemplateView
+from django.http import Http404, JsonResponse, StreamingHttpResponse
+from django.views.generic import TemplateView, View
 
 from django.conf import settings
 
 from core.models import SOTY, TOTY, Debater, Team
+from core.utils.export import EXPORTS, FORMATS, stream_export
 from core.utils.rankings import redo_rankings, update_noty, update_soty, update_toty
 
 
@@ -137,3 +138,24 @@ class RankingsRecomputeView(UserPassesTestMixin, TemplateView):
     def _update_noty_rankings(self, season):
         for debater in Debater.objects.all():
             update_noty(debater, season=season)
+
+
+class ExportView(UserPassesTestMixin, View):
+    def test_func(self):
+        return self.request.user.is_superuser
+
+    def get(self, request, name, fmt):
+        season = request.GET.get("season")
+
+        if name not in EXPORTS or fmt not in FORMATS:
+            raise Http404
+        if season and season not in dict(settings.SEASONS):
+            raise Http404
+
+        filename = f"{name}-{season}" if season else name
+
+        response = StreamingHttpResponse(
+            stream_export(name, fmt, season=season), content_type=FORMATS[fmt]
+        )
+        response["Content-Disposition"] = f'attachment; filename="{filename}.{fmt}"'
+        return response
@@ -0,0 +1,85 @@
+from django.conf import settings
+from django.http import Http404, JsonResponse
+from django.views.decorators.gzip import gzip_page
+from django.views.decorators.http import require_GET
+
+from core.utils.page_cache import conditional_page
+from core.utils.standings_api import (
+    STANDINGS,
+    encode_cursor,
+    get_rows_after,
+    get_standings_payload,
+)
+from core.utils.versions import season_scope
+
+DEFAULT_LIMIT = 100
+MAX_LIMIT = 500
+
+
+def api_error(message):
+    return JsonResponse({"error": message}, status=400)
+
+
+def get_standings_api_scopes(request, season, **kwargs):
+    return [season_scope(season)]
+
+
+def get_limit(request):
+    try:
+        limit = int(request.GET.get("limit", DEFAULT_LIMIT))
+    except ValueError:
+        return None
+
+    return limit if 0 < limit <= MAX_LIMIT else None
+
+
+@require_GET
+def standings_api_view(request, season, kind):
+    if kind not in STANDINGS or season not in dict(settings.SEASONS):
+        raise Http404
+
+    fields = STANDINGS[kind]["fields"]
+
+    if request.GET.get("fields"):
+        fields = request.GET["fields"].split(",")
+        unknown = set(fields) - set(STANDINGS[kind]["fields"])
+
+        if unknown:
+            return api_error(f"Unknown fields: {', '.join(sorted(unknown))}")
+
+    limit = get_limit(request)
+    if limit is None:
+        return api_error(f"limit must be between 1 and {MAX_LIMIT}")
+
+    rows = get_standings_payload(kind, season)
+    count = len(rows)
+
+    if request.GET.get("cursor"):
+        rows = get_rows_after(rows, request.GET["cursor"])
+
+        if rows is None:
+            return api_error("Invalid cursor")
+
+    page = rows[:limit]
+    next_url = None
+
+    if len(rows) > limit:
+        params = request.GET.copy()
+        params["cursor"] = encode_cursor(page[-1]["id"])
+        next_url = f"{request.path}?{params.urlencode()}"
+
+    return JsonResponse(
+        {
+            "season": season,
+            "kind": kind,
+            "count": count,
+            "next": next_url,
+            "results": [{field: row[field] for field in fields} for row in page],
+        },
+        json_dumps_params={"separators": (",", ":")},
+    )
+
+
+standings_api = gzip_page(
+    conditional_page(standings_api_view, get_standings_api_scopes)
+)
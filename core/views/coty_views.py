@@ -46,6 +46,10 @@ class COTYListView(CustomListView):
 
     filterset_class = COTYFilter
 
+    cache_by_season = True
+
+    select_related = ["school"]
+
     def get(self, request, *args, **kwargs):
         if not self.request.GET.get("season"):
             return redirect(reverse("core:coty") + "?season=" + settings.CURRENT_SEASON)
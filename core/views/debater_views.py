@@ -1,16 +1,21 @@
+from collections import defaultdict
+
 from dal import autocomplete
 from django.conf import settings
-from django.http import HttpResponse
+from django.db.models import Prefetch, Q, prefetch_related_objects
+from django.http import HttpResponse, JsonResponse
 from django.urls import reverse_lazy
 from django_filters import FilterSet
 from django_tables2 import Column
-from haystack.query import SearchQuerySet
 
 from core.forms import DebaterForm
 from core.models.debater import Debater
 from core.models.results.team import TeamResult
 from core.models.round import Round
 from core.models.standings.toty import TOTY
+from core.models.team import Team
+from core.models.video import Video
+from core.utils.debater_index import debater_prefix_index
 from core.utils.generics import (
     CustomCreateView,
     CustomDeleteView,
@@ -20,7 +25,8 @@ from core.utils.generics import (
     CustomUpdateView,
 )
 from core.utils.perms import has_perm
-from core.utils.rounds import get_tab_card_data
+from core.utils.rounds import build_tab_cards
+from core.utils.versions import object_scope
 
 
 class DebaterFilter(FilterSet):
@@ -57,6 +63,10 @@ class DebaterListView(CustomListView):
 
     filterset_class = DebaterFilter
 
+    select_related = ["school"]
+
+    keyset_pagination = True
+
     buttons = [
         {
             "name": "Create",
@@ -67,8 +77,43 @@ class DebaterListView(CustomListView):
     ]
 
 
-def num_distinct_tournaments(team):
-    return len(list({result.tournament.id for result in team.team_results.all()}))
+def get_debater_teams(debater_id):
+    return list(Team.objects.filter(debaters=debater_id))
+
+
+def get_partner_teams(debater, teams=None, team_results=None):
+    if teams is None:
+        teams = get_debater_teams(debater.id)
+
+    if team_results is None:
+        team_results = TeamResult.objects.filter(team__in=teams).only(
+            "team_id", "tournament_id"
+        )
+
+    tournaments = defaultdict(set)
+    for result in team_results:
+        tournaments[result.team_id].add(result.tournament_id)
+
+    for team in teams:
+        team.num_tournaments = len(tournaments[team.id])
+
+    prefetch_related_objects(
+        teams,
+        "toty",
+        Prefetch("debaters", queryset=Debater.objects.select_related("school")),
+    )
+    teams.sort(
+        key=lambda team: (team.num_tournaments, team.toty_points),
+        reverse=True,
+    )
+
+    return teams
+
+
+def get_debater_scopes(debater_id, team_ids):
+    return [object_scope(Debater, debater_id)] + [
+        object_scope(Team, team_id) for team_id in team_ids
+    ]
 
 
 class DebaterDetailView(CustomDetailView):
@@ -93,23 +138,54 @@ class DebaterDetailView(CustomDetailView):
         },
     ]
 
+    # The debater's teams, when loaded for the ETag
+    teams = None
+
+    @classmethod
+    def get_cache_scopes(cls, request, **kwargs):
+        return get_debater_scopes(
+            kwargs["pk"],
+            Team.debaters.through.objects.filter(debater_id=kwargs["pk"]).values_list(
+                "team_id", flat=True
+            ),
+        )
+
+    def get_view_scopes(self, request, **kwargs):
+        # The page renders these teams too, so load them once for both
+        self.teams = get_debater_teams(kwargs["pk"])
+
+        return get_debater_scopes(kwargs["pk"], [team.id for team in self.teams])
+
+    def get_queryset(self):
+        return super().get_queryset().select_related("school")
+
     def get_context_data(self, *args, **kwargs):
         context = super().get_context_data(*args, **kwargs)
 
-        tournaments = []
+        team_results = list(
+            TeamResult.objects.filter(team__debaters=self.object)
+            .select_related("tournament", "team")
+            .order_by("-type_of_place")
+        )
+        speaker_results = list(
+            self.object.speaker_results.select_related("tournament").order_by(
+                "-type_of_place"
+            )
+        )
+        rounds = list(
+            Round.objects.filter(
+                Q(gov__debaters=self.object) | Q(opp__debaters=self.object)
+            )
+            .select_related("tournament", "gov", "opp")
+            .order_by("id")
+            .distinct()
+        )
 
-        tournaments = [
-            result.tournament
-            for result in TeamResult.objects.filter(team__debaters=self.object).all()
-        ]
-        tournaments += [
-            result.tournament for result in self.object.speaker_results.all()
-        ]
+        tournaments = [result.tournament for result in team_results]
+        tournaments += [result.tournament for result in speaker_results]
 
         if "all" in self.request.GET:
-            for team in self.object.teams.all():
-                tournaments += [round.tournament for round in team.govs.all()]
-                tournaments += [round.tournament for round in team.opps.all()]
+            tournaments += [round.tournament for round in rounds]
 
         tournaments = list(set(tournaments))
 
@@ -141,82 +217,88 @@ class DebaterDetailView(CustomDetailView):
 
         tournaments.sort(key=lambda tournament: tournament.date)
 
-        tournament_render = []
-
-        for tournament in tournaments:
-            to_add = {}
-            to_add["tournament"] = tournament
-            to_append = []
+        partner_teams = {
+            team.id: team
+            for team in get_partner_teams(self.object, self.teams, team_results)
+        }
 
-            to_append += [
-                ("team", result)
-                for result in TeamResult.objects.filter(team__debaters=self.object)
-                .filter(tournament=tournament)
-                .order_by("-type_of_place")
-                .all()
-            ]
-            to_append += [
-                ("speaker", result)
-                for result in self.object.speaker_results.filter(tournament=tournament)
-                .order_by("-type_of_place")
-                .all()
-            ]
+        tournament_teams = {}
 
-            team_result = (
-                TeamResult.objects.filter(team__debaters=self.object)
-                .filter(tournament=tournament)
-                .first()
+        for result in sorted(team_results, key=lambda result: result.id):
+            tournament_teams.setdefault(
+                result.tournament_id, partner_teams.get(result.team_id, result.team)
             )
 
-            gov_round = Round.objects.filter(gov__debaters=self.object).filter(
-                tournament=tournament
+        for round in rounds:
+            tournament_teams.setdefault(
+                round.tournament_id,
+                partner_teams.get(round.gov_id) or partner_teams.get(round.opp_id),
             )
 
-            opp_round = Round.objects.filter(opp__debaters=self.object).filter(
-                tournament=tournament
-            )
+        tab_cards = build_tab_cards(
+            sorted(
+                [
+                    round
+                    for round in rounds
+                    if round.tournament.season == current_season
+                ],
+                key=lambda round: (round.round_number, round.id),
+            ),
+            team_debaters={
+                team.id: sorted(debater.id for debater in team.debaters.all())
+                for team in partner_teams.values()
+            },
+        )
 
-            # THIS IS WHERE YOU HAVE TO CHANGE THINGS #
-            team = None if not team_result else team_result.team
+        tournament_render = []
 
-            if not team and (gov_round.exists() or opp_round.exists()):
-                if gov_round.exists():
-                    team = gov_round.first().gov
-                else:
-                    team = opp_round.first().opp
+        for tournament in tournaments:
+            team = tournament_teams.get(tournament.id)
 
+            to_add = {}
+            to_add["tournament"] = tournament
             to_add["team"] = team
-            to_add["data"] = to_append
-            to_add["tab_card"] = get_tab_card_data(team, tournament)
+            to_add["data"] = [
+                ("team", result)
+                for result in team_results
+                if result.tournament_id == tournament.id
+            ] + [
+                ("speaker", result)
+                for result in speaker_results
+                if result.tournament_id == tournament.id
+            ]
+            to_add["tab_card"] = (
+                tab_cards.get((team.id, tournament.id)) if team else None
+            )
 
             tournament_render.append(to_add)
 
         context["results"] = tournament_render
 
-        context["totys"] = TOTY.objects.filter(team__debaters=self.object).order_by(
-            "place", "season"
+        context["totys"] = sorted(
+            [toty for team in partner_teams.values() for toty in team.toty.all()],
+            key=lambda toty: (toty.place, toty.season),
         )
 
-        context["sotys"] = self.object.soty.order_by("place", "season")
+        context["sotys"] = list(self.object.soty.order_by("place", "season"))
 
-        context["notys"] = self.object.noty.order_by("place", "season")
+        context["notys"] = list(self.object.noty.order_by("place", "season"))
 
-        teams = list(self.object.teams.all())
-        teams.sort(
-            key=lambda team: (num_distinct_tournaments(team), team.toty_points),
-            reverse=True,
-        )
+        context["teams"] = list(partner_teams.values())
 
-        context["teams"] = teams
-
-        context["videos"] = []
-        context["videos"] += list(self.object.pm_videos.all())
-        context["videos"] += list(self.object.lo_videos.all())
-        context["videos"] += list(self.object.mg_videos.all())
-        context["videos"] += list(self.object.mo_videos.all())
+        videos = (
+            Video.objects.filter(
+                Q(pm=self.object)
+                | Q(lo=self.object)
+                | Q(mg=self.object)
+                | Q(mo=self.object)
+            )
+            .select_related("tournament", "pm", "mg", "lo", "mo")
+            .prefetch_related("tags")
+        )
 
         context["videos"] = [
-            video for video in context["videos"] if has_perm(self.request.user, video)
+            video for video in videos if has_perm(self.request.user, video)
         ]
 
         return context
@@ -239,13 +321,7 @@ class DebaterUpdateView(CustomUpdateView):
 
         context["notys"] = self.object.noty.order_by("place", "season")
 
-        teams = list(self.object.teams.all())
-        teams.sort(
-            key=lambda team: (num_distinct_tournaments(team), team.toty_points),
-            reverse=True,
-        )
-
-        context["teams"] = teams
+        context["teams"] = get_partner_teams(self.object)
 
         return context
 
@@ -272,25 +348,26 @@ class DebaterDeleteView(CustomDeleteView):
 
 
 class DebaterAutocomplete(autocomplete.Select2QuerySetView):
-    def get_result_label(self, record):
-        return f"<{record.id}> {record.name} ({record.school.name})"
-
-    def get_queryset(self):
-        qs = None
-        if not self.q:
-            qs = Debater.objects
-        if self.q:
-            qs = SearchQuerySet().models(Debater).filter(content=self.q)
-
-            qs = [q.pk for q in qs.all()]
-
-            qs = Debater.objects.filter(id__in=qs)
-
-        qs = qs.order_by("-pk")
-
-        school = self.forwarded.get("school", None)
-
-        if school:
-            qs = qs.filter(school__id=school)
+    def get(self, request, *args, **kwargs):
+        # Answered from the in-memory index, without the search backend or DB
+        results = debater_prefix_index.search(
+            self.q, school=self.forwarded.get("school", None)
+        )
 
-        return qs
+        try:
+            page = max(int(request.GET.get("page", 1)), 1)
+        except ValueError:
+            page = 1
+
+        start = (page - 1) * self.paginate_by
+        end = start + self.paginate_by
+
+        return JsonResponse(
+            {
+                "results": [
+                    {"id": str(pk), "text": label, "selected_text": label}
+                    for pk, label in results[start:end]
+                ],
+                "pagination": {"more": len(results) > end},
+            }
+        )
@@ -70,6 +70,18 @@ class NOTYListView(CustomListView):
 
     filterset_class = NOTYFilter
 
+    cache_by_season = True
+
+    select_related = [
+        "debater",
+        "debater__school",
+        "tournament_one",
+        "tournament_two",
+        "tournament_three",
+        "tournament_four",
+        "tournament_five",
+    ]
+
     def get(self, request, *args, **kwargs):
         if not self.request.GET.get("season"):
             return redirect(reverse("core:noty") + "?season=" + settings.CURRENT_SEASON)
@@ -15,6 +15,8 @@ from core.utils.generics import (
     CustomUpdateView,
 )
 from core.utils.rankings import get_relevant_debaters
+from core.utils.search import SearchAutocompleteMixin
+from core.utils.versions import season_scope
 
 
 class SchoolFilter(FilterSet):
@@ -77,6 +79,12 @@ class SchoolDetailView(CustomDetailView):
         },
     ]
 
+    @classmethod
+    def get_cache_scopes(cls, request, **kwargs):
+        return super().get_cache_scopes(request, **kwargs) + [
+            season_scope(request.GET.get("season"))
+        ]
+
     def get(self, request, *args, **kwargs):
         season = self.request.GET.get("season", "")
         if season == "":
@@ -133,14 +141,9 @@ class SchoolDeleteView(CustomDeleteView):
     template_name = "schools/delete.html"
 
 
-class SchoolAutocomplete(autocomplete.Select2QuerySetView):
+class SchoolAutocomplete(SearchAutocompleteMixin, autocomplete.Select2QuerySetView):
     def get_result_label(self, record):
         return f"<{record.id}> {record.name}"
 
     def get_queryset(self):
-        qs = School.objects.all()
-
-        if self.q:
-            qs = qs.filter(name__icontains=self.q)
-
-        return qs
+        return self.search(School.objects.all())
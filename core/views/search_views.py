@@ -0,0 +1,35 @@
+from django.http import JsonResponse
+
+from core.models import Debater, School, Team, Tournament
+from core.utils.search import autocomplete
+
+AUTOCOMPLETE_MODELS = {
+    "debater": Debater,
+    "team": Team,
+    "school": School,
+    "tournament": Tournament,
+}
+
+
+def search_autocomplete(request):
+    q = request.GET.get("q", "").strip()
+    types = [
+        name
+        for name in request.GET.get("types", "").split(",")
+        if name in AUTOCOMPLETE_MODELS
+    ] or list(AUTOCOMPLETE_MODELS)
+
+    results = []
+
+    if q:
+        results = [
+            {
+                "id": int(result.pk),
+                "type": result.model_name,
+                "text": result.label,
+                "url": result.url,
+            }
+            for result in autocomplete([AUTOCOMPLETE_MODELS[name] for name in types], q)
+        ]
+
+    return JsonResponse({"results": results})
@@ -72,6 +72,19 @@ class SOTYListView(CustomListView):
 
     filterset_class = SOTYFilter
 
+    cache_by_season = True
+
+    select_related = [
+        "debater",
+        "debater__school",
+        "tournament_one",
+        "tournament_two",
+        "tournament_three",
+        "tournament_four",
+        "tournament_five",
+        "tournament_six",
+    ]
+
     def get(self, request, *args, **kwargs):
         if not self.request.GET.get("season"):
             return redirect(reverse("core:soty") + "?season=" + settings.CURRENT_SEASON)
@@ -1,10 +1,11 @@
 from dal import autocomplete
-from django.db.models import Q
+from django.db.models import Prefetch, Q
 from django.urls import reverse_lazy
 from django_filters import FilterSet
 from django_tables2 import Column
 
 from core.forms import TeamForm
+from core.models.debater import Debater
 from core.models.round import Round
 from core.models.team import Team
 from core.utils.generics import (
@@ -14,7 +15,9 @@ from core.utils.generics import (
     CustomTable,
     CustomUpdateView,
 )
-from core.utils.rounds import get_record, get_tab_card_data
+from core.utils.rounds import build_tab_cards, format_record, get_records
+from core.utils.search import SearchAutocompleteMixin
+from core.utils.versions import object_scope
 
 
 class TeamFilter(FilterSet):
@@ -43,6 +46,10 @@ class TeamListView(CustomListView):
 
     filterset_class = TeamFilter
 
+    prefetch_related = ["debaters"]
+
+    keyset_pagination = True
+
 
 class TeamDetailView(CustomDetailView):
     public_view = True
@@ -66,10 +73,47 @@ class TeamDetailView(CustomDetailView):
         },
     ]
 
+    @classmethod
+    def get_cache_scopes(cls, request, **kwargs):
+        debater_ids = Team.debaters.through.objects.filter(
+            team_id=kwargs["pk"]
+        ).values_list("debater_id", flat=True)
+
+        return super().get_cache_scopes(request, **kwargs) + [
+            object_scope(Debater, debater_id) for debater_id in debater_ids
+        ]
+
+    def get_queryset(self):
+        return (
+            super()
+            .get_queryset()
+            .prefetch_related(
+                Prefetch("debaters", queryset=Debater.objects.select_related("school"))
+            )
+        )
+
     def get_context_data(self, *args, **kwargs):
         context = super().get_context_data(*args, **kwargs)
 
-        results = self.object.team_results.order_by("tournament__date")
+        results = self.object.team_results.select_related("tournament").order_by(
+            "tournament__date"
+        )
+
+        rounds = list(
+            Round.objects.filter(Q(gov=self.object) | Q(opp=self.object))
+            .select_related("tournament", "gov", "opp")
+            .order_by("round_number", "id")
+        )
+
+        records = get_records(teams=[self.object], by_tournament=True)
+        tab_cards = build_tab_cards(
+            rounds,
+            team_debaters={
+                self.object.id: sorted(
+                    debater.id for debater in self.object.debaters.all()
+                )
+            },
+        )
 
         to_return = []
         tournaments_handled = []
@@ -79,15 +123,15 @@ class TeamDetailView(CustomDetailView):
                 {
                     "type": "award",
                     "result": result,
-                    "record": get_record(result.tournament, self.object),
-                    "tab_card": get_tab_card_data(self.object, result.tournament),
+                    "record": format_record(
+                        records.get((self.object.id, result.tournament_id))
+                    ),
+                    "tab_card": tab_cards.get((self.object.id, result.tournament_id)),
                     "tournament": result.tournament,
                 }
             ]
             tournaments_handled += [result.tournament]
 
-        rounds = Round.objects.filter(Q(gov=self.object) | Q(opp=self.object))
-
         tournaments = []
 
         if "all" in self.request.GET:
@@ -100,8 +144,10 @@ class TeamDetailView(CustomDetailView):
             to_return += [
                 {
                     "type": "",
-                    "record": get_record(tournament, self.object),
-                    "tab_card": get_tab_card_data(self.object, tournament),
+                    "record": format_record(
+                        records.get((self.object.id, tournament.id))
+                    ),
+                    "tab_card": tab_cards.get((self.object.id, tournament.id)),
                     "tournament": tournament,
                 }
             ]
@@ -144,22 +190,9 @@ class TeamDeleteView(CustomDeleteView):
     template_name = "teams/delete.html"
 
 
-class TeamAutocomplete(autocomplete.Select2QuerySetView):
+class TeamAutocomplete(SearchAutocompleteMixin, autocomplete.Select2QuerySetView):
     def get_result_label(self, record):
         return f"<{record.id}> {record.name} ({', '.join([d.name for d in record.debaters.all()])})"
 
     def get_queryset(self):
-        qs = Team.objects.all()
-
-        if self.q:
-            query = Q()
-            for term in self.q.split():
-                query = (
-                    query
-                    | Q(name__icontains=term)
-                    | Q(debaters__first_name__icontains=term)
-                    | Q(debaters__last_name__icontains=term)
-                )
-            qs = qs.filter(query).distinct()
-
-        return qs
+        return self.search(Team.objects.prefetch_related("debaters"))
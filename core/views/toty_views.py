@@ -63,6 +63,18 @@ class TOTYListView(CustomListView):
 
     filterset_class = TOTYFilter
 
+    cache_by_season = True
+
+    select_related = [
+        "team",
+        "tournament_one",
+        "tournament_two",
+        "tournament_three",
+        "tournament_four",
+        "tournament_five",
+    ]
+    prefetch_related = ["team__debaters"]
+
     def get(self, request, *args, **kwargs):
         if not self.request.GET.get("season"):
             return redirect(reverse("core:toty") + "?season=" + settings.CURRENT_SEASON)
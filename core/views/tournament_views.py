@@ -1,9 +1,9 @@
 from datetime import timedelta
 
-import requests
 from dal import autocomplete
 from django.conf import settings
-from django.db.models import Q
+from django.db import transaction
+from django.db.models import Exists, OuterRef
 from django.http import QueryDict
 from django.shortcuts import redirect
 from django.urls import reverse_lazy
@@ -11,7 +11,6 @@ from django.views.generic import TemplateView
 from django_filters import ChoiceFilter, FilterSet
 from django_tables2 import Column
 from formtools.wizard.views import SessionWizardView
-from haystack.query import SearchQuerySet
 
 from core.forms import (
     DebaterForm,
@@ -30,16 +29,11 @@ from core.forms import (
 from core.models.debater import Debater
 from core.models.results.speaker import SpeakerResult
 from core.models.results.team import TeamResult
-from core.models.round import Round
 from core.models.school import School
-from core.models.standings.coty import COTY
-from core.models.standings.noty import NOTY
-from core.models.standings.online_qual import OnlineQUAL
 from core.models.standings.qual import QUAL
-from core.models.standings.soty import SOTY
-from core.models.standings.toty import TOTY
 from core.models.team import Team
 from core.models.tournament import Tournament
+from core.utils.debater_matching import MATCH_THRESHOLD, DebaterMatcher
 from core.utils.generics import (
     CustomCreateView,
     CustomDeleteView,
@@ -54,28 +48,17 @@ from core.utils.import_management import (
     CREATE,
     LINK,
     clean_keys,
-    create_debaters,
-    create_round_stats,
-    create_rounds,
-    create_schools,
-    create_speaker_awards,
-    create_team_awards,
-    create_teams,
     get_dict,
     get_num_novice_debaters,
     get_num_teams,
+    import_tournament,
     lookup_school,
 )
-from core.utils.rankings import (
-    redo_rankings,
-    update_noty,
-    update_online_quals,
-    update_qual_points,
-    update_soty,
-    update_toty,
-)
-from core.utils.rounds import get_tab_card_data
-from core.utils.team import get_or_create_team_for_debaters
+from core.utils.rankings import refresh_standings
+from core.utils.rounds import get_tab_cards
+from core.utils.search import SearchAutocompleteMixin
+from core.utils.team import get_or_create_teams
+from core.utils.versions import bump_tournament_versions
 
 
 class TournamentFilter(FilterSet):
@@ -149,18 +132,15 @@ class TournamentListView(CustomListView):
         },
     ]
 
+    keyset_pagination = True
+
     def get_queryset(self, *args, **kwargs):
         qs = super().get_queryset(*args, **kwargs)
 
-        ids = []
-
-        for q in qs:
-            if q.team_results.count() > 0 or q.speaker_results.count() > 0:
-                ids += [q.id]
-
-        qs = qs.filter(id__in=ids)
-
-        return qs
+        return qs.filter(
+            Exists(TeamResult.objects.filter(tournament=OuterRef("pk")))
+            | Exists(SpeakerResult.objects.filter(tournament=OuterRef("pk")))
+        )
 
 
 class TournamentDetailView(CustomDetailView):
@@ -230,21 +210,17 @@ class TournamentDetailView(CustomDetailView):
 
         context["novice_speaker_results"] = nspeakers
 
-        context["tab_cards_available"] = Round.objects.filter(
-            tournament=self.object
-        ).exists()
+        tab_cards = get_tab_cards(self.object)
 
-        teams = (
-            Team.objects.filter(
-                Q(govs__tournament=self.object) | Q(opps__tournament=self.object)
-            )
-            .distinct()
-            .all()
-        )
+        context["tab_cards_available"] = bool(tab_cards)
+
+        context["teams"] = []
+
+        for team_id, tab_card in sorted(tab_cards.items()):
+            round = tab_card[0]["round"]
+            team = round.gov if round.gov_id == team_id else round.opp
 
-        context["teams"] = [
-            (team, get_tab_card_data(team, self.object)) for team in teams
-        ]
+            context["teams"] += [(team, tab_card)]
 
         return context
 
@@ -270,38 +246,26 @@ class TournamentDeleteView(CustomDeleteView):
     template_name = "tournaments/delete.html"
 
 
-class AllTournamentAutocomplete(autocomplete.Select2QuerySetView):
+class AllTournamentAutocomplete(
+    SearchAutocompleteMixin, autocomplete.Select2QuerySetView
+):
     def get_result_label(self, record):
         return f"<{record.id}> {record.name} ({record.get_season_display()})"
 
     def get_queryset(self):
-        qs = Tournament.objects.all()
+        return self.search(Tournament.objects.all())
 
-        if self.q:
-            qs = qs.filter(name__icontains=self.q)
 
-        return qs
-
-
-class TournamentAutocomplete(autocomplete.Select2QuerySetView):
+class TournamentAutocomplete(SearchAutocompleteMixin, autocomplete.Select2QuerySetView):
     def get_result_label(self, record):
         return f"<{record.id}> {record.name} ({record.get_season_display()})"
 
     def get_queryset(self):
-        qs = Tournament.objects.all()
-
-        ids = []
-
-        for item in qs:
-            if item.team_results.count() == 0 and item.speaker_results.count() == 0:
-                ids += [item.id]
-
-        qs = qs.filter(id__in=ids)
+        qs = Tournament.objects.exclude(
+            Exists(TeamResult.objects.filter(tournament=OuterRef("pk")))
+        ).exclude(Exists(SpeakerResult.objects.filter(tournament=OuterRef("pk"))))
 
-        if self.q:
-            qs = qs.filter(name__icontains=self.q)
-
-        return qs
+        return self.search(qs)
 
 
 class ScheduleView(TemplateView):
@@ -470,28 +434,40 @@ class TournamentImportWizardView(CustomMixin, SessionWizardView):
 
             initial = []
 
+            school_ids = [school["school"] for school in schools.values()]
+
+            found_schools = School.objects.in_bulk(
+                [school_id for school_id in school_ids if school_id != -1]
+            )
+            matcher = DebaterMatcher(school_ids)
+
+            matches = matcher.match_all(
+                [
+                    (
+                        debater["id"],
+                        debater["name"],
+                        [
+                            schools[team["school_id"]]["school"],
+                            schools[team["hybrid_school_id"]]["school"],
+                        ],
+                    )
+                    for team in response["teams"]
+                    for debater in team["debaters"]
+                ],
+                limit=1,
+            )
+
             for team in response["teams"]:
                 for debater in team["debaters"]:
+                    school = found_schools.get(schools[team["school_id"]]["school"])
+
+                    match = matches[debater["id"]]
                     found_debater = (
-                        SearchQuerySet().models(Debater).filter(content=debater["name"])
+                        match[0][0]
+                        if match and match[0][1] >= MATCH_THRESHOLD
+                        else None
                     )
 
-                    school = School.objects.filter(
-                        id=schools[team["school_id"]]["school"]
-                    ).first()
-
-                    found_debater = [
-                        result.object for result in found_debater.all() if result.object
-                    ]
-                    found_debater = [
-                        obj
-                        for obj in found_debater
-                        if obj.school.id == schools[team["school_id"]]["school"]
-                        or obj.school.id == schools[team["hybrid_school_id"]]["school"]
-                    ]
-
-                    found_debater = found_debater[0] if len(found_debater) > 0 else None
-
                     hybrid_name = ""
 
                     names = schools[team["school_id"]]["name"]
@@ -514,20 +490,21 @@ class TournamentImportWizardView(CustomMixin, SessionWizardView):
 
         return initial
 
-    def get_response(self, url):
-        url = url + "/json"
+    def get_form(self, step=None, data=None, files=None):
+        form = super().get_form(step, data, files)
 
-        request = requests.get(url, timeout=30)
+        # render_done re-validates every step from storage, so reuse the tab
+        # export fetched when the URL was submitted rather than fetching again
+        if step == "1" and data is not None and data is not self.request.POST:
+            form.response = data.get("response")
 
-        return request.content
+        return form
 
     def get_form_step_data(self, form):
         to_return = form.data.copy()
 
         if self.steps.current == "1":
-            response = self.get_response(form.cleaned_data["url"])
-
-            to_return["response"] = response
+            to_return["response"] = form.cleaned_data["response"]
 
         if self.steps.current == "3":
             storage_data = self.storage.get_step_data("1")
@@ -582,10 +559,6 @@ class TournamentImportWizardView(CustomMixin, SessionWizardView):
         storage_data = self.storage.get_step_data("4")
         debaters = clean_keys(storage_data.get("debaters"))
 
-        school_actions = create_schools(schools)
-        debater_actions = create_debaters(school_actions, debaters)
-        team_actions = create_teams(debater_actions, response["teams"])
-
         storage_data = self.storage.get_step_data("0")
         tournament = Tournament.objects.get(id=int(storage_data.get("0-tournament")))
 
@@ -594,29 +567,7 @@ class TournamentImportWizardView(CustomMixin, SessionWizardView):
         tournament.num_novice_debaters = int(storage_data.get("2-num_novices"))
         tournament.save()
 
-        round_actions = create_rounds(team_actions, tournament, response["rounds"])
-        create_round_stats(
-            debater_actions, round_actions, tournament, response["stats"]
-        )
-
-        create_speaker_awards(
-            debater_actions, response["speaker_results"], Debater.VARSITY, tournament
-        )
-
-        create_speaker_awards(
-            debater_actions,
-            response["novice_speaker_results"],
-            Debater.NOVICE,
-            tournament,
-        )
-
-        create_team_awards(
-            team_actions, response["team_results"], Debater.VARSITY, tournament
-        )
-
-        create_team_awards(
-            team_actions, response["novice_team_results"], Debater.NOVICE, tournament
-        )
+        import_tournament(tournament, response, schools, debaters)
 
         return redirect(tournament.get_absolute_url())
 
@@ -788,213 +739,82 @@ class TournamentDataEntryWizardView(CustomMixin, SessionWizardView):
 
         tournament.save()
 
-        update_otys = settings.CURRENT_SEASON == tournament.season
-
-        teams_to_update = []
-        speakers_to_update = []
-        novices_to_update = []
-
-        ## THIS DOESN'T DO INITIAL
+        team_rows = []
+        speaker_results = []
 
-        for result in TeamResult.objects.filter(tournament=tournament).all():
-            teams_to_update += [result.team]
-
-            result.delete()
-
-        for result in SpeakerResult.objects.filter(tournament=tournament).all():
-            if result.type_of_place == Debater.VARSITY:
-                speakers_to_update += [result.debater]
-            else:
-                novices_to_update += [result.debater]
-            result.delete()
-
-        QUAL.objects.filter(tournament=tournament).delete()
-
-        ## VARSITY TEAM AWARDS ##
-        for i in range(len(form_dict["2"].cleaned_data)):
-            if (
-                "debater_one" not in form_dict["2"].cleaned_data[i]
-                or "debater_two" not in form_dict["2"].cleaned_data[i]
-            ):
-                continue
-
-            if (
-                not form_dict["2"].cleaned_data[i]["debater_one"]
-                or not form_dict["2"].cleaned_data[i]["debater_two"]
-            ):
-                continue
-
-            team = get_or_create_team_for_debaters(
-                form_dict["2"].cleaned_data[i]["debater_one"],
-                form_dict["2"].cleaned_data[i]["debater_two"],
-            )
-
-            if not team:
-                continue
-
-            place = i + 1
-            type_of_place = Debater.VARSITY
-            ghost_points = form_dict["2"].cleaned_data[i]["ghost_points"]
-
-            TeamResult.objects.create(
-                tournament=tournament,
-                team=team,
-                type_of_place=type_of_place,
-                place=place,
-                ghost_points=ghost_points,
-            )
-
-            teams_to_update += [team]
-
-        for i in range(len(form_dict["3"].cleaned_data)):
-            if "speaker" not in form_dict["3"].cleaned_data[i]:
-                continue
-
-            place = i + 1
-            type_of_place = Debater.VARSITY
-            speaker = form_dict["3"].cleaned_data[i]["speaker"]
-            tie = form_dict["3"].cleaned_data[i]["tie"]
-
-            if not speaker:
-                continue
-
-            SpeakerResult.objects.create(
-                tournament=tournament,
-                debater=speaker,
-                type_of_place=type_of_place,
-                place=place,
-                tie=tie,
-            )
-
-            speakers_to_update += [speaker]
-
-        for i in range(len(form_dict["4"].cleaned_data)):
-            if (
-                "debater_one" not in form_dict["4"].cleaned_data[i]
-                or "debater_two" not in form_dict["4"].cleaned_data[i]
-            ):
-                continue
-
-            if (
-                not form_dict["4"].cleaned_data[i]["debater_one"]
-                or not form_dict["4"].cleaned_data[i]["debater_two"]
-            ):
-                continue
-
-            team = get_or_create_team_for_debaters(
-                form_dict["4"].cleaned_data[i]["debater_one"],
-                form_dict["4"].cleaned_data[i]["debater_two"],
-            )
+        for step, type_of_place in (
+            ("2", Debater.VARSITY),
+            ("4", Debater.NOVICE),
+            ("6", Debater.VARSITY),
+        ):
+            for i, data in enumerate(form_dict[step].cleaned_data):
+                if not data.get("debater_one") or not data.get("debater_two"):
+                    continue
 
-            if not team:
-                continue
+                team_rows += [
+                    (
+                        data["debater_one"],
+                        data["debater_two"],
+                        TeamResult(
+                            tournament=tournament,
+                            type_of_place=type_of_place,
+                            place=-1 if step == "6" else i + 1,
+                            ghost_points=step == "2" and data["ghost_points"],
+                        ),
+                    )
+                ]
 
-            place = i + 1
-            type_of_place = Debater.NOVICE
+        for step, type_of_place in (("3", Debater.VARSITY), ("5", Debater.NOVICE)):
+            for i, data in enumerate(form_dict[step].cleaned_data):
+                if not data.get("speaker"):
+                    continue
 
-            TeamResult.objects.create(
-                tournament=tournament,
-                team=team,
-                type_of_place=type_of_place,
-                place=place,
-            )
+                speaker_results += [
+                    SpeakerResult(
+                        tournament=tournament,
+                        debater=data["speaker"],
+                        type_of_place=type_of_place,
+                        place=i + 1,
+                        tie=data["tie"],
+                    )
+                ]
 
-            teams_to_update += [team]
+        teams = get_or_create_teams(
+            [(debater_one, debater_two) for debater_one, debater_two, _ in team_rows]
+        )
 
-        for i in range(len(form_dict["5"].cleaned_data)):
-            if "speaker" not in form_dict["5"].cleaned_data[i]:
-                continue
+        team_results = []
 
-            place = i + 1
-            type_of_place = Debater.NOVICE
-            speaker = form_dict["5"].cleaned_data[i]["speaker"]
-            tie = form_dict["5"].cleaned_data[i]["tie"]
+        for debater_one, debater_two, result in team_rows:
+            result.team = teams[Team.make_pair_key(debater_one.id, debater_two.id)]
+            team_results += [result]
 
-            if not speaker:
-                continue
+        old_team_results = TeamResult.objects.filter(tournament=tournament)
+        old_speaker_results = SpeakerResult.objects.filter(tournament=tournament)
 
-            SpeakerResult.objects.create(
-                tournament=tournament,
-                debater=speaker,
-                type_of_place=type_of_place,
-                place=place,
-                tie=tie,
-            )
+        teams_changed = set(old_team_results.values_list("team_id", flat=True))
+        debaters_changed = set(old_speaker_results.values_list("debater_id", flat=True))
 
-            novices_to_update += [speaker]
-
-        ## NON-PLACING TEAMS ##
-        for i in range(len(form_dict["6"].cleaned_data)):
-            if (
-                "debater_one" not in form_dict["6"].cleaned_data[i]
-                or "debater_two" not in form_dict["6"].cleaned_data[i]
-            ):
-                continue
-
-            if (
-                not form_dict["6"].cleaned_data[i]["debater_one"]
-                or not form_dict["6"].cleaned_data[i]["debater_two"]
-            ):
-                continue
-
-            team = get_or_create_team_for_debaters(
-                form_dict["6"].cleaned_data[i]["debater_one"],
-                form_dict["6"].cleaned_data[i]["debater_two"],
-            )
+        with transaction.atomic():
+            old_team_results.delete()
+            old_speaker_results.delete()
+            QUAL.objects.filter(tournament=tournament).delete()
 
-            if not team:
-                continue
+            TeamResult.objects.bulk_create(team_results)
+            SpeakerResult.objects.bulk_create(speaker_results)
 
-            place = -1
-            type_of_place = Debater.VARSITY
+        teams_changed.update(result.team.id for result in team_results)
+        debaters_changed.update(result.debater.id for result in speaker_results)
 
-            TeamResult.objects.create(
-                tournament=tournament,
-                team=team,
-                type_of_place=type_of_place,
-                place=place,
-            )
+        bump_tournament_versions(
+            tournament, team_ids=teams_changed, debater_ids=debaters_changed
+        )
 
-            teams_to_update += [team]
-
-        teams_to_update = list(set(teams_to_update))
-        speakers_to_update = list(set(speakers_to_update))
-        novices_to_update = list(set(novices_to_update))
-
-        if update_otys:
-            for team in teams_to_update:
-                update_toty(team)
-                update_qual_points(team)
-                update_online_quals(team)
-            for debater in speakers_to_update:
-                update_soty(debater)
-            for debater in novices_to_update:
-                update_noty(debater)
-
-            redo_rankings(
-                TOTY.objects.filter(season=settings.CURRENT_SEASON),
-                season=settings.CURRENT_SEASON,
-                cache_type="toty",
-            )
-            redo_rankings(
-                SOTY.objects.filter(season=settings.CURRENT_SEASON),
-                season=settings.CURRENT_SEASON,
-                cache_type="soty",
-            )
-            redo_rankings(
-                NOTY.objects.filter(season=settings.CURRENT_SEASON),
-                season=settings.CURRENT_SEASON,
-                cache_type="noty",
-            )
-            redo_rankings(
-                COTY.objects.filter(season=settings.CURRENT_SEASON),
-                season=settings.CURRENT_SEASON,
-                cache_type="coty",
-            )
-            redo_rankings(
-                OnlineQUAL.objects.filter(season=settings.CURRENT_SEASON),
-                season=settings.CURRENT_SEASON,
-                cache_type="online_quals",
+        if settings.CURRENT_SEASON == tournament.season:
+            refresh_standings(
+                team_ids=teams_changed,
+                debater_ids=debaters_changed,
+                online_quals=True,
             )
 
         return redirect("core:tournament_detail", pk=tournament.id)
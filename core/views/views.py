@@ -2,17 +2,46 @@ from django.conf import settings
 from django.shortcuts import render
 
 from core.models import COTY, NOTY, SOTY, TOTY, OnlineQUAL
+from core.utils.page_cache import public_page
+from core.utils.versions import season_scope
 
 
+def get_index_cache_scopes(request, **kwargs):
+    return [season_scope(request.GET.get("season", settings.CURRENT_SEASON))]
+
+
+@public_page(get_index_cache_scopes, conditional=True)
 def index(request):
     seasons = settings.SEASONS
     current_season = request.GET.get("season", settings.CURRENT_SEASON)
     default = request.GET.get("default", "toty")
 
-    toty = TOTY.objects.filter(season=current_season).order_by("-points")
-    coty = COTY.objects.filter(season=current_season).order_by("-points")
-    soty = SOTY.objects.filter(season=current_season).order_by("-points")
-    noty = NOTY.objects.filter(season=current_season).order_by("-points")
+    markers = [
+        f"tournament_{number}"
+        for number in ("one", "two", "three", "four", "five", "six")
+    ]
+
+    toty = (
+        TOTY.objects.filter(season=current_season)
+        .select_related("team", *markers)
+        .prefetch_related("team__debaters")
+        .order_by("-points")
+    )
+    coty = (
+        COTY.objects.filter(season=current_season)
+        .select_related("school")
+        .order_by("-points")
+    )
+    soty = (
+        SOTY.objects.filter(season=current_season)
+        .select_related("debater", "debater__school", *markers)
+        .order_by("-points")
+    )
+    noty = (
+        NOTY.objects.filter(season=current_season)
+        .select_related("debater", "debater__school", *markers)
+        .order_by("-points")
+    )
 
     using_online_quals = False
     online_quals = None